@@ -3,9 +3,12 @@ import os
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon
 from timeflow.utils import resource_path
+from timeflow.clock import configure_clock
 from timeflow.styles import get_stylesheet
 
 def main() -> int:
+    # Zeitquelle: --clock=real|scaled:60|step:0.5 oder TIMEFLOW_CLOCK
+    clock = configure_clock(sys.argv)
     app = QApplication(sys.argv)
     
     # Style laden
@@ -20,6 +23,10 @@ def main() -> int:
     from timeflow.main_window import MainWindow
     w = MainWindow()
     w.show()
+
+    from timeflow.virtual_timer import ClockStepper
+    stepper = ClockStepper(clock, app)
+    stepper.start()
     return app.exec()
 
 if __name__ == "__main__":
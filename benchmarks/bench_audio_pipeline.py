@@ -0,0 +1,96 @@
+"""
+Durchsatz und Pufferlatenz der Pegelanalyse für alle Sampleformate.
+
+Die Daten laufen wie im Betrieb über PcmSourceDevice -> readyRead ->
+AudioWorker._process_data -> HopWindowBuffer; nur das Mikrofon ist durch
+ein Testsignal (oder eine WAV-Datei) ersetzt. Ohne Event-Loop feuert der
+Takt-Timer nicht, das Gerät wird hier von Hand gepumpt und jeder Puffer
+einzeln gemessen.
+
+    python -m benchmarks.bench_audio_pipeline [--seconds 10] [--rate 48000]
+        [--channels 1 2] [--chunk 1024] [--wav datei.wav] [--profile low_power]
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication
+
+from timeflow.audio_processor import AudioWorker, _SAMPLE_CODES
+from timeflow.audio_profiles import DEFAULT_PROFILE, PROFILES
+from timeflow.audio_sources import SignalSource, WavFileSource
+
+
+def run(source, chunk: int, weighting: bool, profile: str = DEFAULT_PROFILE) -> dict:
+    worker = AudioWorker()
+    worker.set_profile(profile)
+    worker.weighting = weighting
+    worker.set_source(source, realtime=False)
+    worker.start()
+    device = worker.io_device
+    device.chunk_frames = chunk
+    readings = []
+    worker.readingReady.connect(readings.append)
+
+    latencies = []
+    total_bytes = 0
+    t_start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        n = device.pump()
+        if n == 0:
+            break
+        latencies.append(time.perf_counter() - t0)
+        total_bytes += n
+    elapsed = time.perf_counter() - t_start
+    worker.stop()
+
+    samples = total_bytes // (source.frame_size // source.channels)
+    latencies.sort()
+    return {
+        "samples_per_s": samples / elapsed if elapsed > 0 else 0.0,
+        "realtime_x": samples / source.channels / source.sample_rate / elapsed if elapsed > 0 else 0.0,
+        "buffer_mean_us": statistics.fmean(latencies) * 1e6 if latencies else 0.0,
+        "buffer_p99_us": latencies[int(0.99 * (len(latencies) - 1))] * 1e6 if latencies else 0.0,
+        "readings": len(readings),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=int, default=48000)
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--chunk", type=int, default=1024, help="Frames pro Puffer")
+    parser.add_argument("--wav", help="WAV-Datei statt Testsignal")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help="low_power dezimiert vor der Analyse")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])  # noqa: F841
+
+    print(f"{'Format':<8} {'Kan.':>4} {'A-bew.':>6} {'Samples/s':>12} {'x Echtzeit':>10} "
+          f"{'Puffer Ø µs':>11} {'p99 µs':>8} {'Pegel':>6}")
+    cases = []
+    if args.wav:
+        cases.append(("wav", lambda: WavFileSource(args.wav)))
+    else:
+        for fmt, code in _SAMPLE_CODES.items():
+            for ch in args.channels:
+                cases.append((fmt.name, lambda code=code, ch=ch: SignalSource(
+                    "noise", sample_rate=args.rate, channels=ch, code=code, duration_s=args.seconds)))
+    for name, make in cases:
+        for weighting in (False, True):
+            source = make()
+            r = run(source, args.chunk, weighting, args.profile)
+            source.close()
+            print(f"{name:<8} {source.channels:>4} {'ja' if weighting else 'nein':>6} "
+                  f"{r['samples_per_s']:>12,.0f} {r['realtime_x']:>10.0f} "
+                  f"{r['buffer_mean_us']:>11.1f} {r['buffer_p99_us']:>8.1f} {r['readings']:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,7 +47,9 @@ def qapp():
     
     yield app
     
-    # Don't quit - let pytest handle cleanup
+    # Don't quit - let pytest handle cleanup. Wie beim echten Beenden
+    # aboutToQuit senden, damit Hintergrund-Threads (Audio) sauber enden
+    app.aboutToQuit.emit()
 
 
 @pytest.fixture
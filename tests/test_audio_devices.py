@@ -0,0 +1,153 @@
+import pytest
+from PySide6.QtCore import QByteArray
+from PySide6.QtMultimedia import QAudioFormat
+from timeflow.audio_devices import AudioDeviceManager, device_key, set_device_manager
+
+
+class FakeDevice:
+    """Verhält sich für den Manager wie ein QAudioDevice."""
+
+    def __init__(self, ident, name, rate=48000, float_ok=True):
+        self._id, self._name, self._rate, self._float = ident, name, rate, float_ok
+
+    def id(self):
+        return QByteArray(self._id)
+
+    def description(self):
+        return self._name
+
+    def isNull(self):
+        return not self._id
+
+    def preferredFormat(self):
+        fmt = QAudioFormat()
+        fmt.setSampleRate(self._rate)
+        fmt.setChannelCount(1)
+        return fmt
+
+    def supportedSampleFormats(self):
+        formats = [QAudioFormat.SampleFormat.Int16]
+        if self._float:
+            formats.append(QAudioFormat.SampleFormat.Float)
+        return formats
+
+    def minimumSampleRate(self):
+        return 16000 if self._float else 8000
+
+    def maximumSampleRate(self):
+        return self._rate
+
+    def isFormatSupported(self, fmt):
+        # USB-Mikrofon nimmt nur sein bevorzugtes Float-Format
+        return not self._float
+
+
+class Backend:
+    def __init__(self, *devices):
+        self.devices = list(devices)
+        self.default = devices[0] if devices else FakeDevice(b"", "")
+
+    def manager(self):
+        return AudioDeviceManager(list_inputs=lambda: self.devices, default_input=lambda: self.default)
+
+
+@pytest.fixture
+def backend():
+    builtin = FakeDevice(b"builtin", "Built-in", 44100, float_ok=False)
+    usb = FakeDevice(b"usb", "USB Mic")
+    b = Backend(builtin)
+    b.builtin, b.usb = builtin, usb
+    return b
+
+
+@pytest.mark.qt
+class TestAudioDeviceManager:
+    def test_low_power_format_falls_back_to_preferred(self, qapp, backend):
+        manager = backend.manager()
+        low = manager.format_for(backend.builtin, 8000)
+        assert (low.sampleRate(), low.channelCount()) == (8000, 1)
+        assert low.sampleFormat() == QAudioFormat.SampleFormat.Int16
+        # Gerät lehnt ab -> bevorzugtes Format, dezimiert wird dann im Worker
+        assert manager.format_for(backend.usb, 8000).sampleRate() == 48000
+        assert manager.format_for(backend.builtin).sampleRate() == 44100
+        assert manager.negotiations == 3
+
+    def test_formats_are_negotiated_once(self, qapp, backend):
+        manager = backend.manager()
+        fmt = manager.format_for(backend.builtin)
+        again = manager.format_for(backend.builtin)
+        assert manager.negotiations == 1
+        assert fmt == again
+        assert fmt.sampleRate() == 44100
+        assert fmt.sampleFormat() == QAudioFormat.SampleFormat.Int16
+        assert manager.format_for(backend.usb).sampleFormat() == QAudioFormat.SampleFormat.Float
+
+    def test_hot_plug_updates_list_and_default(self, qapp, backend):
+        manager = backend.manager()
+        events = []
+        manager.inputsChanged.connect(lambda: events.append("inputs"))
+        manager.defaultInputChanged.connect(lambda d: events.append(d.description()))
+        manager.format_for(backend.builtin)
+
+        backend.devices.append(backend.usb)
+        backend.default = backend.usb
+        manager.refresh()
+        assert events == ["inputs", "USB Mic"]
+        assert manager.find(device_key(backend.usb)) is backend.usb
+
+        backend.devices.remove(backend.builtin)
+        manager.refresh()
+        assert manager.find(device_key(backend.builtin)) is None
+        manager.format_for(backend.builtin)
+        assert manager.negotiations == 2   # Cache des abgezogenen Geräts verworfen
+
+
+@pytest.mark.qt
+class TestProcessorFollowsDevices:
+    def test_switches_stream_when_default_changes(self, qapp, backend):
+        from timeflow.audio_processor import AudioProcessor
+        set_device_manager(backend.manager())
+        try:
+            proc = AudioProcessor()
+            requested = []
+            proc._deviceRequested.connect(lambda d, f: requested.append(d.description()))
+            assert proc._resolve_device()[0] is backend.builtin
+
+            backend.devices.append(backend.usb)
+            backend.default = backend.usb
+            proc._devices.refresh()
+            assert requested == ["USB Mic"]
+
+            # gewähltes Gerät wird abgezogen -> zurück zum Standard
+            proc.set_device(backend.builtin)
+            backend.devices.remove(backend.builtin)
+            proc._devices.refresh()
+            assert proc.current_device() is None
+            assert requested[-1] == "USB Mic"
+        finally:
+            set_device_manager(None)
+
+    def test_window_picker_lists_cached_devices(self, qapp, qtbot, backend):
+        from timeflow.audio_hub import set_audio_hub
+        from timeflow.noise_meter_window import NoiseMeterWindow
+        backend.devices.append(backend.usb)
+        set_device_manager(backend.manager())
+        # Der Hub hält den gemeinsamen Prozessor – neu anlegen, damit er den Testmanager nutzt
+        set_audio_hub(None)
+        try:
+            window = NoiseMeterWindow(lang_code="de")
+            qtbot.addWidget(window)
+            combo = window.device_combo
+            assert [combo.itemText(i) for i in range(combo.count())] == [
+                "Standard (Built-in)", "Built-in", "USB Mic"]
+            combo.setCurrentIndex(combo.findData(device_key(backend.usb)))
+            assert window.processor.current_device() is backend.usb
+
+            backend.devices.remove(backend.usb)
+            window.processor._devices.refresh()
+            assert combo.count() == 2
+            assert combo.currentIndex() == 0
+        finally:
+            window.presets_manager.save_device("")
+            set_device_manager(None)
+            set_audio_hub(None)
@@ -0,0 +1,87 @@
+import pytest
+from PySide6.QtCore import QObject, Signal
+from timeflow.audio_hub import AudioHub, KEEP_MAX, Subscription
+from timeflow.audio_processor import LevelReading
+
+
+def reading(level, ts):
+    return LevelReading(level, 0.1, timestamp=ts, analysis_s=0.0)
+
+
+class TestSubscription:
+    def test_unlimited_delivers_every_reading(self):
+        got = []
+        sub = Subscription(got.append)
+        for i in range(10):
+            sub.offer(reading(i, i * 0.025))
+        assert [r.level for r in got] == list(range(10))
+
+    def test_rate_limit_keeps_steady_cadence(self):
+        got = []
+        sub = Subscription(got.append, max_rate_hz=10)
+        # 40 Messwerte pro Sekunde, 2 s lang
+        for i in range(80):
+            sub.offer(reading(float(i), i * 0.025))
+        assert len(got) == 20
+        assert [r.level for r in got[:3]] == [0.0, 4.0, 8.0]
+
+    def test_keep_max_reports_loudest_of_interval(self):
+        got = []
+        sub = Subscription(got.append, max_rate_hz=2, keep=KEEP_MAX)
+        levels = [10, 90, 20, 30, 40, 50, 60, 70, 15, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5, 5]
+        for i, level in enumerate(levels):
+            sub.offer(reading(level, i * 0.05))
+        # Auslieferung bei 0.0, 0.5, 1.0 s – jeweils der lauteste Wert seit der letzten
+        assert [r.level for r in got] == [10, 90, 5]
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            Subscription(print, keep="median")
+        with pytest.raises(ValueError):
+            Subscription(print, max_rate_hz=0)
+
+
+class FakeProcessor(QObject):
+    readingUpdated = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def start(self):
+        self.calls.append("start")
+
+    def suspend(self):
+        self.calls.append("suspend")
+
+
+@pytest.mark.qt
+class TestAudioHub:
+    def test_one_capture_fans_out_to_all_subscribers(self, qapp):
+        proc = FakeProcessor()
+        hub = AudioHub(processor=proc)
+        fast, slow = [], []
+        a = hub.subscribe(fast.append)
+        b = hub.subscribe(slow.append, max_rate_hz=4)
+        assert proc.calls == ["start"]
+        for i in range(40):
+            proc.readingUpdated.emit(reading(1.0, i * 0.025))
+        assert len(fast) == 40
+        assert len(slow) == 4
+
+        hub.unsubscribe(a)
+        assert proc.calls == ["start"]
+        hub.unsubscribe(b)
+        hub.unsubscribe(b)
+        assert proc.calls == ["start", "suspend"]
+        assert hub.subscriber_count() == 0
+
+    def test_owner_destruction_ends_subscription(self, qapp):
+        proc = FakeProcessor()
+        hub = AudioHub(processor=proc)
+        owner = QObject()
+        hub.subscribe(lambda r: None, owner=owner)
+        assert hub.subscriber_count() == 1
+        owner.destroyed.emit()
+        assert hub.subscriber_count() == 0
+        assert proc.calls == ["start", "suspend"]
@@ -0,0 +1,142 @@
+import array
+import math
+import subprocess
+import sys
+import pytest
+from timeflow.audio_kernels import (
+    HAS_NUMPY, Decimator, HopWindowBuffer,
+    MIX_MAX, MIX_MEAN, MIX_CHANNEL,
+)
+
+BACKENDS = [False] + ([True] if HAS_NUMPY else [])
+
+
+def reference_rms(values, full_scale, offset=0.0):
+    return math.sqrt(sum((v - offset) ** 2 for v in values) / len(values)) / full_scale
+
+
+class TestHopWindowBuffer:
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    @pytest.mark.parametrize("code,values,full_scale,offset", [
+        ("f", [0.5, -0.5, 0.25, -1.0], 1.0, 0.0),
+        ("h", [16384, -16384, 32767, -32768], 32768.0, 0.0),
+        ("i", [2 ** 30, -2 ** 30, 7, -2 ** 31], 2147483648.0, 0.0),
+        ("B", [128, 255, 0, 64], 128.0, 128.0),
+    ])
+    def test_sample_formats_match_reference(self, use_numpy, code, values, full_scale, offset):
+        buf = HopWindowBuffer(40, 1, window_s=0.1, hop_s=0.1, use_numpy=use_numpy)
+        out = []
+        buf.push(array.array(code, values).tobytes(), code, lambda rms, peak: out.append(rms))
+        assert out == [pytest.approx(reference_rms(values, full_scale, offset), rel=1e-6)]
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_windows_match_reference_for_any_split(self, use_numpy):
+        values = [((i * 7919) % 65536) - 32768 for i in range(3000)]
+        raw = array.array("h", values).tobytes()
+        buf = HopWindowBuffer(1000, 1, window_s=0.2, hop_s=0.05, use_numpy=use_numpy)
+        out = []
+        # Stücke mit ungerader Byte-Länge: Samples werden über Puffergrenzen geteilt
+        for i in range(0, len(raw), 333):
+            buf.push(raw[i:i + 333], "h", lambda rms, peak: out.append((rms, peak)))
+
+        ends = range(200, 3001, 50)
+        assert len(out) == len(ends)
+        for (rms, peak), end in zip(out, ends):
+            window = values[end - 200:end]
+            assert rms == pytest.approx(reference_rms(window, 32768.0), rel=1e-5)
+            assert peak == pytest.approx(max(abs(v) for v in window) / 32768.0)
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_split_sample_completing_a_window_is_counted(self, use_numpy):
+        raw = array.array("h", [1000] * 10).tobytes()
+        buf = HopWindowBuffer(100, 1, window_s=0.1, hop_s=0.1, use_numpy=use_numpy)
+        out = []
+        # 9 1/2 Samples, dann das fehlende Byte: erst es schließt das Fenster ab
+        assert buf.push(raw[:19], "h", lambda r, p: out.append(r)) == 0
+        assert buf.push(raw[19:], "h", lambda r, p: out.append(r)) == 1
+        assert out == [pytest.approx(1000 / 32768)]
+
+    def test_interleaved_channels_count_frames(self):
+        buf = HopWindowBuffer(100, channels=2, window_s=0.1, hop_s=0.1)
+        assert (buf.window, buf.hop) == (20, 20)
+        out = []
+        buf.push(array.array("f", [0.5, -0.5] * 30).tobytes(), "f", lambda r, p: out.append(r))
+        assert out == [pytest.approx(0.5)] * 3
+
+    def test_reads_qbytearray(self):
+        from PySide6.QtCore import QByteArray
+        data = QByteArray(array.array("f", [0.5, -0.5] * 32).tobytes())
+        out = []
+        HopWindowBuffer(640, 1, window_s=0.1, hop_s=0.1).push(data, "f", lambda r, p: out.append(r))
+        assert out == [pytest.approx(0.5)]
+
+    def test_fallback_without_numpy(self):
+        code = (
+            "import sys; sys.modules['numpy'] = None; "
+            "import array; from timeflow import audio_kernels as k; "
+            "assert not k.HAS_NUMPY; out = []; "
+            "k.HopWindowBuffer(20, 1, window_s=0.1, hop_s=0.1).push("
+            "array.array('f', [0.5, -0.5]).tobytes(), 'f', lambda r, p: out.append(r)); "
+            "assert abs(out[0] - 0.5) < 1e-9"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            HopWindowBuffer(48000, window_s=0.0)
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_per_channel_levels_and_mixing(self, use_numpy):
+        # Kanal 0 laut, Kanal 1 leise, Kanal 2 stumm
+        frames = [0.8, -0.2, 0.0] * 10
+        raw = array.array("f", frames).tobytes()
+        buf = HopWindowBuffer(100, channels=3, window_s=0.1, hop_s=0.1, use_numpy=use_numpy)
+        results = {}
+        for mode, channel in ((MIX_MEAN, 0), (MIX_MAX, 0), (MIX_CHANNEL, 1), (MIX_CHANNEL, 9)):
+            buf.set_mix(mode, channel)
+            buf.push(raw, "f", lambda rms, peak: results.__setitem__((mode, channel), (rms, peak)))
+
+        assert buf.channel_rms == [pytest.approx(0.8), pytest.approx(0.2), 0.0]
+        assert buf.channel_peak == [pytest.approx(0.8), pytest.approx(0.2), 0.0]
+        assert results[(MIX_MEAN, 0)][0] == pytest.approx(reference_rms(frames, 1.0), rel=1e-6)
+        assert results[(MIX_MAX, 0)] == (pytest.approx(0.8), pytest.approx(0.8))
+        assert results[(MIX_CHANNEL, 1)] == (pytest.approx(0.2), pytest.approx(0.2))
+        # Kanalindex wird auf vorhandene Kanäle begrenzt
+        assert results[(MIX_CHANNEL, 9)] == (0.0, 0.0)
+        with pytest.raises(ValueError):
+            buf.set_mix("loudest")
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="Dezimierung nur mit NumPy")
+class TestDecimator:
+    def tone(self, freq, rate=48000, channels=1, code="h"):
+        full = 32767 if code == "h" else 1.0
+        values = [0.5 * full * math.sin(2 * math.pi * freq * i / rate) for i in range(rate)]
+        frames = [v for v in values for _ in range(channels)]
+        if code == "h":
+            frames = [int(round(v)) for v in frames]
+        return array.array(code, frames).tobytes()
+
+    def rms(self, samples, skip=200):
+        tail = samples[skip:]
+        return math.sqrt(float((tail * tail).mean()))
+
+    def test_passband_kept_and_alias_rejected(self):
+        kept = Decimator(6).process(self.tone(1000), "h")
+        assert len(kept) == 8000
+        assert self.rms(kept) == pytest.approx(0.5 / math.sqrt(2), rel=0.01)
+        # 6 kHz läge nach dem Abtasten ohne Filter als 2 kHz im Band
+        aliased = Decimator(6).process(self.tone(6000), "h")
+        assert self.rms(aliased) < 0.01 * 0.5
+
+    def test_result_independent_of_chunking(self):
+        raw = self.tone(440, channels=2, code="f")
+        whole = Decimator(6, channels=2).process(raw, "f")
+        dec = Decimator(6, channels=2)
+        parts = [dec.process(raw[i:i + 999], "f") for i in range(0, len(raw), 999)]
+        joined = [v for p in parts for v in p.tolist()]
+        assert joined == pytest.approx(whole.tolist(), abs=1e-6)
+
+    def test_invalid_factor(self):
+        with pytest.raises(ValueError):
+            Decimator(1)
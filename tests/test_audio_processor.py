@@ -0,0 +1,310 @@
+import array
+import math
+import threading
+import pytest
+from PySide6.QtCore import QByteArray, QTimer
+from timeflow.audio_kernels import HAS_NUMPY
+from timeflow.audio_processor import AudioProcessor, AudioWorker, AudioStats, LevelReading
+
+
+def int16_buffer(value, n=200):
+    return QByteArray(array.array("h", [value, -value] * (n // 2)).tobytes())
+
+
+@pytest.mark.qt
+class TestAudioProcessorThread:
+    def test_analysis_runs_on_worker_thread(self, qtbot):
+        proc = AudioProcessor()
+        readings, threads = [], []
+        proc.readingUpdated.connect(lambda r: readings.append((r, threading.get_ident())))
+        proc.start()
+        try:
+            worker = proc.worker()
+            QTimer.singleShot(0, worker, lambda: (
+                threads.append(threading.get_ident()),
+                worker.configure(4000, 1),
+                worker.process_buffer(int16_buffer(3277), "h"),
+            ))
+            for _ in range(100):
+                if readings:
+                    break
+                qtbot.wait(20)
+        finally:
+            proc.stop()
+
+        reading, delivered_on = readings[0]
+        gui = threading.get_ident()
+        assert threads[0] != gui
+        assert delivered_on == gui
+        assert isinstance(reading, LevelReading)
+        assert reading.level == pytest.approx(0.1 * 150.0, rel=1e-3)
+        assert reading.peak == pytest.approx(3277 / 32768)
+        assert proc.stats.readings == 1
+
+    def test_start_stop_is_idempotent(self, qtbot):
+        proc = AudioProcessor()
+        proc.stop()
+        proc.start()
+        proc.start()
+        assert proc.is_running()
+        proc.set_sensitivity(2.0)
+        proc.stop()
+        proc.stop()
+        assert not proc.is_running()
+        assert proc.worker() is None
+
+    def test_stats_split_analysis_and_latency(self):
+        stats = AudioStats()
+        stats.record(LevelReading(10.0, 0.1, timestamp=5.0, analysis_s=0.002), received_at=5.010)
+        stats.record(LevelReading(10.0, 0.1, timestamp=6.0, analysis_s=0.004), received_at=6.030)
+        assert stats.mean_analysis_s() == pytest.approx(0.003)
+        assert stats.mean_latency_s() == pytest.approx(0.020)
+        assert stats.latency_max_s == pytest.approx(0.030)
+
+    def test_bad_buffer_is_counted_in_stats(self, qtbot):
+        proc = AudioProcessor()
+        proc.start()
+        try:
+            worker = proc.worker()
+            QTimer.singleShot(0, worker, lambda: (
+                worker.configure(4000, 1),
+                worker.process_buffer(int16_buffer(3277), "?"),
+            ))
+            for _ in range(100):
+                if proc.stats.buffer_errors:
+                    break
+                qtbot.wait(20)
+        finally:
+            proc.stop()
+        assert proc.stats.buffer_errors == 1
+        assert "KeyError" in proc.stats.last_error
+
+    def test_unexpected_analysis_error_is_logged(self, qtbot, caplog):
+        worker = AudioWorker()
+        worker.configure(4000, 1)
+        failed = []
+        worker.bufferFailed.connect(failed.append)
+
+        def broken(*_):
+            raise RuntimeError("kaputt")
+        worker._windows.push = broken
+        with caplog.at_level("ERROR", logger="timeflow.audio_processor"):
+            assert worker.process_buffer(int16_buffer(3277), "h") == 0
+        assert failed == ["RuntimeError('kaputt')"]
+        assert "Pegelanalyse" in caplog.text
+
+    def test_fixed_rate_independent_of_chunk_size(self, qtbot):
+        """Readings follow the hop, not the size of the backend buffers."""
+        counts = []
+        for chunk in (64, 1000, 4800):
+            worker = AudioWorker()
+            worker.set_analysis_window(0.05, 0.025)
+            worker.configure(48000, 1)
+            readings = []
+            worker.readingReady.connect(readings.append)
+            data = int16_buffer(1000, 48000)
+            for i in range(0, data.size(), chunk * 2):
+                worker.process_buffer(data.mid(i, chunk * 2), "h")
+            counts.append(len(readings))
+        # 1 s Audio: erstes Fenster nach 50 ms, danach alle 25 ms
+        assert counts == [39, 39, 39]
+
+    def test_stereo_reading_uses_channel_mix(self, qtbot):
+        worker = AudioWorker()
+        worker.set_analysis_window(0.1, 0.1)
+        worker.set_channel_mix("max")
+        worker.configure(1000, 2)
+        readings = []
+        worker.readingReady.connect(readings.append)
+        # links 0.2 Vollaussteuerung, rechts stumm
+        worker.process_buffer(QByteArray(array.array("h", [6554, 0] * 100).tobytes()), "h")
+        assert len(readings) == 1
+        left, right = readings[0].channel_rms
+        assert left == pytest.approx(0.2, rel=1e-3)
+        assert right == 0.0
+        assert readings[0].level == pytest.approx(0.2 * 150.0, rel=1e-3)
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="A-Bewertung per Default nur mit NumPy")
+    def test_reading_carries_dbfs_and_calibrated_dba(self, qtbot):
+        worker = AudioWorker()
+        worker.set_analysis_window(0.1, 0.1)
+        worker.set_weighting(True, 100.0)
+        worker.configure(16000, 1)
+        readings = []
+        worker.readingReady.connect(readings.append)
+        # 1 kHz Sinus mit halber Vollaussteuerung: -9 dBFS, A-Bewertung bei 1 kHz = 0 dB
+        tone = [int(16384 * math.sin(2 * math.pi * 1000 * i / 16000)) for i in range(8000)]
+        worker.process_buffer(QByteArray(array.array("h", tone).tobytes()), "h")
+        reading = readings[-1]
+        assert reading.dbfs == pytest.approx(-9.03, abs=0.05)
+        assert reading.dba == pytest.approx(100.0 - 9.03, abs=0.1)
+        linear_level = reading.level
+
+        worker.set_level_scale("dba")
+        worker.set_sensitivity(1.0)
+        worker.process_buffer(QByteArray(array.array("h", tone).tobytes()), "h")
+        assert readings[-1].level == pytest.approx(readings[-1].dba)
+        assert linear_level != readings[-1].level
+
+    def test_signal_source_runs_through_process_data(self, qtbot):
+        from timeflow.audio_sources import SignalSource
+        worker = AudioWorker()
+        readings = []
+        worker.readingReady.connect(readings.append)
+        worker.set_source(SignalSource("sine", 1000, 0.5, sample_rate=8000, code="h", duration_s=1.0),
+                          realtime=False)
+        worker.start()
+        finished = []
+        worker.io_device.finished.connect(lambda: finished.append(True))
+        for _ in range(100):
+            if finished:
+                break
+            qtbot.wait(10)
+        worker.stop()
+        # 1 s Signal: erstes Fenster nach 50 ms, danach alle 25 ms
+        assert len(readings) == 39
+        assert readings[-1].channel_rms[0] == pytest.approx(0.5 / 2 ** 0.5, rel=1e-3)
+
+    def test_profile_sets_analysis_rate_and_capture_timestamps(self, qtbot):
+        from timeflow.audio_sources import SignalSource
+        worker = AudioWorker()
+        worker.set_profile("low_power")
+        assert (worker.window_s, worker.hop_s) == (0.2, 0.1)
+        readings = []
+        worker.readingReady.connect(readings.append)
+        worker.set_source(SignalSource("noise", sample_rate=8000, code="h", duration_s=1.0), realtime=False)
+        worker.start()
+        assert worker.buffer_plan.buffer_s == pytest.approx(0.4, abs=0.01)
+        worker.io_device.start(autorun=False)
+        while worker.io_device.pump():
+            pass
+        worker.stop()
+        # 1 s: erstes Fenster nach 200 ms, danach alle 100 ms
+        assert len(readings) == 9
+        assert all(0 < r.capture_ts <= r.timestamp for r in readings)
+        assert readings[-1].capture_ts > readings[0].capture_ts
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="Dezimierung nur mit NumPy")
+    @pytest.mark.parametrize("freq,a_db", [(1000, 0.0), (3000, 1.2)])
+    def test_low_power_decimates_high_rate_input(self, qtbot, freq, a_db):
+        from timeflow.audio_processor import DEFAULT_CALIBRATION_DB
+        from timeflow.audio_sources import SignalSource
+        worker = AudioWorker()
+        worker.set_weighting(True)
+        worker.set_profile("low_power")
+        readings = []
+        worker.readingReady.connect(readings.append)
+        worker.set_source(SignalSource("sine", freq, 0.5, sample_rate=48000, channels=2, duration_s=1.0),
+                          realtime=False)
+        worker.start()
+        # 48 kHz Stereo-Float -> Analyse mit 16 kHz, A-Bewertung bleibt an
+        assert worker._windows.sample_rate == 16000
+        assert worker._windows.weighting
+        assert worker._windows.channels == 2
+        worker.io_device.start(autorun=False)
+        while worker.io_device.pump():
+            pass
+        worker.stop()
+        assert len(readings) == 9
+        assert readings[-1].channel_rms[0] == pytest.approx(0.5 / 2 ** 0.5, rel=0.01)
+        # -9.03 dBFS + A-Kurve (IEC 61672) + Kalibrierung, auf 0.5 dB genau
+        assert readings[-1].dba == pytest.approx(-9.03 + a_db + DEFAULT_CALIBRATION_DB, abs=0.5)
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="Spektrum nur mit NumPy")
+    def test_spectrum_is_rate_limited_and_optional(self, qtbot):
+        from timeflow.audio_sources import SignalSource
+        tone = SignalSource("sine", 1000, 0.5, sample_rate=8000, code="h").read(8000)
+        worker = AudioWorker()
+        spectra = []
+        worker.spectrumReady.connect(spectra.append)
+        worker.configure(8000, 1)
+        worker.process_buffer(QByteArray(tone), "h")
+        assert worker._spectrum is None and spectra == []
+
+        worker.set_spectrum(15.0)
+        readings = []
+        worker.readingReady.connect(readings.append)
+        worker.process_buffer(QByteArray(tone), "h")
+        # 40 Fenster in einem Rutsch, aber höchstens ein Bild pro 1/15 s
+        assert len(readings) == 40
+        assert len(spectra) == 1
+        assert spectra[0][1] == pytest.approx(-9.03, abs=0.2)   # 0.5 Amplitude im Sprachband
+        worker.set_spectrum(0.0)
+        assert worker._spectrum is None
+
+    def test_facade_profile_validation(self, qtbot):
+        proc = AudioProcessor()
+        with pytest.raises(ValueError):
+            proc.set_profile("turbo")
+        proc.set_profile("low_latency")
+        assert proc.hop_s == 0.0125
+        proc.stats.record(LevelReading(1.0, 0.1, timestamp=5.0, analysis_s=0.0, capture_ts=4.9), 5.02)
+        assert proc.stats.capture.last_s == pytest.approx(0.12)
+
+    def test_suspend_keeps_worker_until_idle_release(self, qtbot):
+        from timeflow.audio_sources import SignalSource
+        proc = AudioProcessor()
+        proc.set_source(SignalSource("sine", sample_rate=8000, code="h"))
+        proc.set_idle_release(0.1)
+        proc.start()
+        worker = proc.worker()
+        proc.suspend()
+        assert proc.is_running() and not proc.is_capturing()
+        # Wiederöffnen innerhalb der Wartezeit: derselbe Worker, Quelle läuft wieder
+        proc.start()
+        assert proc.worker() is worker and proc.is_capturing()
+        qtbot.wait(200)
+        assert proc.worker() is worker
+        proc.suspend()
+        for _ in range(100):
+            if not proc.is_running():
+                break
+            qtbot.wait(20)
+        assert not proc.is_running()
+        assert worker.session is None and worker.io_device is None
+        # Einstellungen der Fassade gehen an den neuen Worker
+        proc.set_sensitivity(3.0)
+        proc.start()
+        try:
+            assert proc.worker() is not worker
+            assert proc.worker().sensitivity == 3.0
+        finally:
+            proc.stop()
+
+    def test_thread_stop_wait_is_bounded(self, qtbot, caplog):
+        from timeflow.audio_processor import _AudioThread
+        thread = _AudioThread(AudioWorker())
+        finished = []
+        thread.finished.connect(lambda: finished.append(True))
+        thread.start()
+        # Loop läuft weiter (kein stop): nach der Frist zurück statt zu blockieren
+        with caplog.at_level("WARNING", logger="timeflow.audio_processor"):
+            assert thread.finish(timeout_ms=20) is False
+        assert "nicht beendet" in caplog.text
+        thread.shutdown()
+        for _ in range(100):
+            if finished:
+                break
+            qtbot.wait(20)
+        assert finished == [True]
+
+    def test_destroyed_facade_stops_its_thread(self, qtbot):
+        proc = AudioProcessor()
+        proc.start()
+        thread = proc._thread
+        finished = []
+        thread.finished.connect(lambda: finished.append(True))
+        proc.deleteLater()
+        for _ in range(100):
+            if finished:
+                break
+            qtbot.wait(20)
+        assert finished == [True]
+
+    def test_worker_stop_releases_session(self):
+        worker = AudioWorker()
+        worker._ensure_session()
+        worker.suspend()
+        assert worker.session is not None
+        worker.stop()
+        assert worker.session is None and worker.audio_input is None
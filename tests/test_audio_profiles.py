@@ -0,0 +1,49 @@
+import pytest
+from timeflow.audio_profiles import (
+    MIN_BUFFER_FRAMES, PROFILES, PROFILE_BALANCED, PROFILE_LOW_LATENCY, PROFILE_LOW_POWER,
+    CaptureClock, LatencyStats, plan_buffers,
+)
+
+
+class TestPlanBuffers:
+    def test_buffer_follows_format_and_target_latency(self):
+        # früher fest 16384 Bytes = 186 ms bei 44.1 kHz Int16 mono
+        plan = plan_buffers(44100, 1, 2, PROFILES[PROFILE_BALANCED])
+        assert plan.buffer_s == pytest.approx(0.08, abs=0.001)
+        assert plan.buffer_bytes == plan.period_bytes * PROFILES[PROFILE_BALANCED].periods
+        assert plan.period_bytes % plan.frame_bytes == 0
+
+        stereo_float = plan_buffers(48000, 2, 4, PROFILES[PROFILE_BALANCED])
+        assert stereo_float.frame_bytes == 8
+        assert stereo_float.buffer_s == pytest.approx(0.08, abs=0.001)
+
+    def test_profiles_are_ordered_by_latency(self):
+        lat = [plan_buffers(48000, 1, 2, PROFILES[p]).buffer_s
+               for p in (PROFILE_LOW_LATENCY, PROFILE_BALANCED, PROFILE_LOW_POWER)]
+        assert lat == sorted(lat)
+        assert PROFILES[PROFILE_LOW_POWER].poll
+
+    def test_limits(self):
+        tiny = plan_buffers(8000, 1, 2, PROFILES[PROFILE_LOW_LATENCY])
+        assert tiny.buffer_bytes >= MIN_BUFFER_FRAMES * 2
+        assert plan_buffers(0, 0, 0, PROFILES[PROFILE_BALANCED]).frame_bytes == 1
+
+
+class TestCaptureClock:
+    def test_anchor_uses_least_delayed_buffer(self):
+        clock = CaptureClock(1000)
+        assert clock.capture_time(10) == 0.0
+        clock.on_buffer(10.150, 100)   # 50 ms Verzögerung
+        clock.on_buffer(10.210, 100)   # 10 ms Verzögerung -> neue Zeitbasis
+        clock.on_buffer(10.330, 100)
+        assert clock.capture_time(300) == pytest.approx(10.310)
+        assert clock.frames == 300
+
+    def test_latency_stats(self):
+        stats = LatencyStats()
+        for v in (0.01, 0.03, -1.0):
+            stats.record(v)
+        assert stats.count == 3
+        assert stats.mean_s() == pytest.approx(0.04 / 3)
+        assert stats.max_s == 0.03
+        assert stats.last_s == 0.0
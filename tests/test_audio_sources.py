@@ -0,0 +1,101 @@
+import array
+import math
+import pytest
+from timeflow.audio_kernels import SAMPLE_SCALES
+from timeflow.audio_sources import (
+    PcmSourceDevice, SignalSource, WavFileSource, encode_samples, parse_source_spec, write_wav,
+)
+from timeflow.clock import MODE_STEP, VirtualClock, set_clock
+
+
+def rms(data, code):
+    full_scale, offset = SAMPLE_SCALES[code]
+    values = array.array(code, data)
+    return math.sqrt(sum((v - offset) ** 2 for v in values) / len(values)) / full_scale
+
+
+class TestWavFileSource:
+    @pytest.mark.parametrize("code", ["f", "h", "i", "B"])
+    def test_round_trip_all_formats(self, tmp_path, code):
+        values = [0.5, -0.5, 0.25, -0.25] * 50
+        data = encode_samples(values, code)
+        path = str(tmp_path / f"tone_{code}.wav")
+        write_wav(path, data, 8000, 2, code)
+
+        src = WavFileSource(path)
+        assert (src.sample_rate, src.channels, src.code) == (8000, 2, code)
+        chunks = [src.read(30) for _ in range(5)]
+        src.close()
+        assert b"".join(chunks) == data
+        assert chunks[-1] == b""
+        assert rms(data, code) == pytest.approx(rms(array.array("f", values).tobytes(), "f"), rel=1e-2)
+
+    def test_loop_and_bad_file(self, tmp_path):
+        path = str(tmp_path / "short.wav")
+        write_wav(path, encode_samples([0.1, 0.2], "h"), 8000, 1, "h")
+        src = WavFileSource(path, loop=True)
+        assert len(src.read(5)) == 10
+        src.close()
+
+        bad = tmp_path / "bad.wav"
+        bad.write_bytes(b"RIFF\x00\x00\x00\x00JUNK")
+        with pytest.raises(ValueError):
+            WavFileSource(str(bad))
+
+
+class TestSignalSource:
+    def test_duration_and_level(self):
+        src = SignalSource("sine", 1000, 0.5, sample_rate=8000, channels=2, code="h", duration_s=0.5)
+        data = b"".join(iter(lambda: src.read(700), b""))
+        assert len(data) == 4000 * 2 * 2
+        assert rms(data, "h") == pytest.approx(0.5 / 2 ** 0.5, rel=1e-3)
+
+    def test_read_wraps_the_cycle(self):
+        src = SignalSource("noise", sample_rate=100, code="h")
+        cycle = src.read(100)
+        assert src.read(150) == cycle + cycle[:100]
+        assert src.read(0) == b""
+
+    def test_source_needs_read(self):
+        from timeflow.audio_sources import PcmSource
+        with pytest.raises(TypeError):
+            PcmSource()
+
+    def test_parse_spec(self):
+        assert parse_source_spec("") is None
+        assert parse_source_spec("sine:1000").kind == "sine"
+        assert parse_source_spec("noise").kind == "noise"
+        with pytest.raises(ValueError):
+            parse_source_spec("mp3:x")
+
+
+@pytest.mark.qt
+class TestPcmSourceDevice:
+    def test_realtime_pacing_follows_clock(self, qapp):
+        clock = VirtualClock(MODE_STEP)
+        set_clock(clock)
+        try:
+            dev = PcmSourceDevice(SignalSource("noise", sample_rate=8000, code="h"), realtime=True)
+            sizes = []
+            dev.readyRead.connect(lambda: sizes.append(dev.readAll().size()))
+            dev.start(autorun=False)   # Takt hier von Hand
+            assert dev.pump() == 0
+            clock.advance(0.1)
+            dev.pump()
+            clock.advance(0.05)
+            dev.pump()
+            assert sizes == [800 * 2, 400 * 2]
+        finally:
+            set_clock(None)
+
+    def test_fast_mode_delivers_chunks_until_finished(self, qapp):
+        dev = PcmSourceDevice(SignalSource("silence", sample_rate=8000, code="f", duration_s=0.25),
+                              realtime=False, chunk_frames=512)
+        finished = []
+        dev.finished.connect(lambda: finished.append(True))
+        dev.start(autorun=False)
+        total = 0
+        while not finished:
+            total += dev.pump()
+            dev.readAll()
+        assert total == 2000 * 4
@@ -0,0 +1,113 @@
+import subprocess
+import sys
+import pytest
+from timeflow.clock import (
+    VirtualClock, parse_clock_spec, configure_clock, get_clock, set_clock,
+    CLOCK_ENV_VAR, MODE_REAL, MODE_SCALED, MODE_STEP,
+)
+from timeflow.timeline import SegmentTimeline
+
+
+class FakeSource:
+    def __init__(self, t=100.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture(autouse=True)
+def reset_global_clock():
+    set_clock(None)
+    yield
+    set_clock(None)
+
+
+class TestVirtualClock:
+    def test_import_without_qt(self):
+        code = (
+            "import sys; sys.modules['PySide6'] = None; "
+            "import timeflow.clock"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_parse_specs(self):
+        assert parse_clock_spec("").mode == MODE_REAL
+        assert parse_clock_spec("real").mode == MODE_REAL
+        c = parse_clock_spec("scaled:60")
+        assert (c.mode, c.rate) == (MODE_SCALED, 60.0)
+        assert parse_clock_spec("120x").rate == 120.0
+        c = parse_clock_spec("step:0.5")
+        assert (c.mode, c.auto_step) == (MODE_STEP, 0.5)
+        with pytest.raises(ValueError):
+            parse_clock_spec("warp")
+
+    def test_cli_overrides_env(self, monkeypatch):
+        monkeypatch.setenv(CLOCK_ENV_VAR, "scaled:10")
+        assert get_clock().rate == 10.0
+        c = configure_clock(["app.py", "--clock", "step"])
+        assert c.is_stepped()
+        assert get_clock() is c
+        assert configure_clock(["app.py"]).rate == 10.0
+        assert configure_clock(["app.py", "--clock=real"]).mode == MODE_REAL
+
+    def test_scaled_mode(self):
+        src, wall = FakeSource(100.0), FakeSource(1000.0)
+        c = VirtualClock(MODE_SCALED, rate=60, source=src, wall_source=wall)
+        src.t += 2.0
+        assert c() == pytest.approx(100.0 + 120.0)
+        assert c.wall_time() == pytest.approx(1120.0)
+        assert c.to_real_seconds(60.0) == pytest.approx(1.0)
+
+    def test_step_runs_callbacks_in_order_at_due_time(self):
+        c = VirtualClock(MODE_STEP, source=FakeSource(0.0), wall_source=FakeSource(0.0))
+        seen = []
+        c.call_later(2.0, lambda: seen.append(("b", c())))
+        c.call_later(1.0, lambda: seen.append(("a", c())))
+        c.call_later(5.0, lambda: seen.append(("c", c()))).cancel()
+        assert c.advance(10.0) == 2
+        assert seen == [("a", 1.0), ("b", 2.0)]
+        assert c() == 10.0
+
+    def test_step_api_only_in_step_mode(self):
+        c = VirtualClock()
+        with pytest.raises(RuntimeError):
+            c.advance(1)
+        with pytest.raises(RuntimeError):
+            c.call_later(1, lambda: None)
+
+
+class TestVirtualTimer:
+    def test_repeating_timer_in_step_mode(self, qtbot):
+        from timeflow.virtual_timer import VirtualTimer
+        c = VirtualClock(MODE_STEP)
+        timer = VirtualTimer(clock=c)
+        hits = []
+        timer.timeout.connect(lambda: hits.append(c()))
+        timer.start(1000)
+        c.advance(3.5)
+        assert len(hits) == 3
+        timer.stop()
+        assert not timer.isActive()
+        c.advance(10)
+        assert len(hits) == 3
+
+    def test_engine_runs_deterministically(self, qtbot):
+        """A full hour finishes instantly and with exact tick times."""
+        from timeflow.timer_engine import TimerEngine
+        c = VirtualClock(MODE_STEP)
+        engine = TimerEngine(adaptive=True, clock=c)
+        engine.set_timeline(SegmentTimeline([1800, 1800]))
+        ticks, finished, entered = [], [], []
+        engine.tick.connect(ticks.append)
+        engine.finished.connect(lambda: finished.append(True))
+        engine.segmentEntered.connect(entered.append)
+
+        engine.start()
+        c.advance(3600 + 5)
+
+        assert finished == [True]
+        assert entered == [1]
+        assert ticks[-1].elapsed_s == 3600
+        assert not engine.is_running()
+        assert len(ticks) <= 3600 * 1.1
@@ -0,0 +1,39 @@
+from timeflow.level_history import LevelHistory
+
+
+class TestLevelHistory:
+    def test_min_max_decimation_per_column(self):
+        # 10 s über 10 Spalten bei 0.25 s Hop -> 4 Werte je Spalte
+        hist = LevelHistory(10.0, 0.25, 10)
+        assert hist.samples_per_column == 4
+        done = [hist.add(v) for v in (5, 9, 1, 7)]
+        assert done == [False, False, False, True]
+        assert hist.newest() == (1.0, 9.0)
+        assert len(hist) == 1
+
+    def test_ring_keeps_only_capacity_columns(self):
+        hist = LevelHistory(4.0, 1.0, 4)
+        for v in range(10):
+            hist.add(float(v))
+        assert len(hist) == 4
+        assert [lo for lo, _ in hist.columns()] == [6.0, 7.0, 8.0, 9.0]
+        hist.clear()
+        assert list(hist.columns()) == []
+
+    def test_resize_merges_columns(self):
+        hist = LevelHistory(8.0, 1.0, 8)
+        for v in range(8):
+            hist.add(float(v))
+        hist.resize(4)
+        assert hist.samples_per_column == 2
+        assert list(hist.columns()) == [(0.0, 1.0), (2.0, 3.0), (4.0, 5.0), (6.0, 7.0)]
+
+    def test_resize_partially_filled_ring(self):
+        hist = LevelHistory(8.0, 1.0, 8)
+        for v in (1.0, 2.0):
+            hist.add(v)
+        hist.resize(16)
+        # gleicher Zeitbereich, doppelte Auflösung
+        assert len(hist) == 4
+        assert min(lo for lo, _ in hist.columns()) == 1.0
+        assert max(hi for _, hi in hist.columns()) == 2.0
@@ -0,0 +1,78 @@
+import math
+import sys
+import pytest
+from timeflow.noise_stats import NoiseStatsAccumulator
+from timeflow.weighting import DB_FLOOR
+
+
+class TestNoiseStatsAccumulator:
+    def test_constant_level(self):
+        stats = NoiseStatsAccumulator()
+        for _ in range(400):
+            stats.add(60.0, 0.025)
+        assert stats.duration_s == pytest.approx(10.0)
+        assert stats.leq() == pytest.approx(60.0)
+        assert stats.max_db == 60.0
+        assert stats.l10() == pytest.approx(60.0)
+        assert stats.l90() == pytest.approx(60.0)
+
+    def test_leq_is_energy_average(self):
+        stats = NoiseStatsAccumulator()
+        stats.add(70.0, 1.0)
+        stats.add(50.0, 1.0)
+        # 10*log10((10^7 + 10^5) / 2)
+        assert stats.leq() == pytest.approx(10 * math.log10((1e7 + 1e5) / 2))
+        assert stats.max_db == 70.0
+
+    def test_percentiles_and_time_over_limit(self):
+        stats = NoiseStatsAccumulator()
+        # 1 s laut (80 dB, über dem Grenzwert), 9 s leise (40 dB)
+        for i in range(400):
+            loud = i < 40
+            stats.add(80.0 if loud else 40.0, 0.025, over_limit=loud)
+        assert stats.time_over_limit_s == pytest.approx(1.0)
+        assert stats.exceeded(5.0) == pytest.approx(80.0)
+        assert stats.l10() == pytest.approx(40.0)
+        assert stats.l90() == pytest.approx(40.0)
+
+    def test_percentiles_share_one_pass(self):
+        stats = NoiseStatsAccumulator()
+        for i in range(1000):
+            stats.add(30.0 + (i * 37) % 50, 0.1)
+        l10, l50, l90 = stats.percentiles()
+        assert (l10, l50, l90) == (stats.l10(), stats.l50(), stats.l90())
+        assert l90 <= l50 <= l10
+        assert stats.exceeded_levels(()) == ()
+        assert stats.exceeded(0.0) == pytest.approx(79.0)
+
+        def scan(percent):   # bisheriger Einzeldurchlauf als Referenz
+            acc, target = 0.0, stats.duration_s * percent / 100.0
+            for i in range(len(stats._hist) - 1, -1, -1):
+                acc += stats._hist[i]
+                if acc > target:
+                    return DB_FLOOR + i * 0.1
+            return DB_FLOOR
+        percents = (1.0, 10.0, 25.0, 50.0, 90.0, 99.0)
+        assert stats.exceeded_levels(percents) == tuple(scan(p) for p in percents)
+
+    def test_memory_is_constant_over_a_school_day(self):
+        stats = NoiseStatsAccumulator()
+        size = sys.getsizeof(stats._hist)
+        # 8 h mit 25-ms-Hops = 1.152.000 Messwerte; hier in groben Schritten mit gleicher Zeitsumme
+        for i in range(11520):
+            stats.add(30.0 + (i % 60), 2.5)
+        assert stats.duration_s == pytest.approx(8 * 3600)
+        assert sys.getsizeof(stats._hist) == size
+        assert 30.0 <= stats.l90() < stats.l10() <= 89.0
+
+    def test_reset_and_empty(self):
+        stats = NoiseStatsAccumulator()
+        assert stats.leq() == DB_FLOOR
+        stats.add(55.0, 1.0, over_limit=True)
+        stats.add(55.0, 0.0)
+        assert stats.readings == 1
+        stats.reset()
+        assert stats.duration_s == 0.0
+        assert stats.time_over_limit_s == 0.0
+        assert stats.l10() == DB_FLOOR
+        assert not any(stats._hist)
@@ -0,0 +1,50 @@
+import math
+import tracemalloc
+import pytest
+from timeflow.spectrum import BANDS, HAS_SPECTRUM, BandSpectrum
+from timeflow.weighting import DB_FLOOR
+
+pytestmark = pytest.mark.skipif(not HAS_SPECTRUM, reason="Spektrum nur mit NumPy")
+
+
+def ring_of(freq, rate=48000, frames=2400, channels=1, shift=0):
+    import numpy as np
+    t = np.arange(frames) / rate
+    x = np.repeat(np.sin(2 * math.pi * freq * t), channels).astype(np.float32)
+    # Ring mit Schreibposition `shift` Frames: dort steht das älteste Sample
+    return np.roll(x, shift * channels), shift * channels
+
+
+class TestBandSpectrum:
+    @pytest.mark.parametrize("freq,band", [(100, 0), (1000, 1), (8000, 2)])
+    def test_sine_lands_in_its_band_with_rms_level(self, freq, band):
+        spec = BandSpectrum(48000, 2400, channels=2)
+        ring, pos = ring_of(freq, channels=2, shift=700)
+        levels = spec.analyze(ring, pos)
+        # Vollaussteuerung-Sinus: RMS 1/sqrt(2) = -3 dBFS
+        assert levels[band] == pytest.approx(-3.01, abs=0.1)
+        assert all(v < -60 for i, v in enumerate(levels) if i != band)
+
+    def test_ring_position_is_unrolled(self):
+        spec = BandSpectrum(48000, 2400)
+        straight = list(spec.analyze(*ring_of(1000)))
+        assert spec.analyze(*ring_of(1000, shift=1234)) == pytest.approx(straight, abs=1e-6)
+
+    def test_bands_above_nyquist_stay_at_floor(self):
+        spec = BandSpectrum(8000, 1600)
+        levels = spec.analyze(*ring_of(1000, rate=8000, frames=1600))
+        assert len(levels) == len(BANDS)
+        assert levels[2] == DB_FLOOR
+
+    def test_no_allocations_per_block(self):
+        spec = BandSpectrum(48000, 2400, channels=2)
+        ring, pos = ring_of(1000, channels=2, shift=10)
+        spec.analyze(ring, pos)
+        tracemalloc.start()
+        try:
+            for _ in range(50):
+                spec.analyze(ring, pos)
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert current < 1024
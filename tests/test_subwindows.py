@@ -52,6 +52,131 @@ def test_noise_meter_window_init(qapp, qtbot):
     assert window.sens_slider is not None
     assert window.limit_slider is not None
 
+@pytest.mark.qt
+def test_noise_meter_statistics_follow_readings_and_timer_reset(qapp, qtbot):
+    from timeflow.audio_processor import LevelReading
+    from timeflow.timer_engine import TimerEngine
+    window = NoiseMeterWindow(lang_code="de")
+    qtbot.addWidget(window)
+    window.limit_slider.setValue(50)
+    engine = TimerEngine()
+    engine.wasReset.connect(window.reset_statistics)
+
+    for i in range(80):
+        level = 60.0 if i < 20 else 30.0
+        window._on_reading_updated(LevelReading(level, 0.1, 0.0, 0.0, dbfs=-40.0, dba=level))
+    assert window.stats.duration_s == pytest.approx(80 * window.processor.hop_s)
+    assert window.stats.time_over_limit_s == pytest.approx(20 * window.processor.hop_s)
+    assert "Leq" in window.stats_label.text()
+    assert "dB(A)" in window.stats_label.text()
+    assert "Grenzwert" in window.stats_label.text()
+
+    engine.reset()
+    assert window.stats.readings == 0
+    assert window.stats_label.text() == ""
+
+@pytest.mark.qt
+def test_noise_history_scrolls_instead_of_rebuilding(qapp, qtbot):
+    from timeflow.noise_meter_window import NoiseHistoryWidget
+    widget = NoiseHistoryWidget(hop_s=0.025)
+    qtbot.addWidget(widget)
+    widget.resize(300, 48)
+    widget.grab()
+    assert widget._rebuilds == 1
+
+    per_column = widget.history.samples_per_column
+    for i in range(per_column * 5):
+        widget.add_level(80.0 if i % 2 else 20.0)
+    widget.grab()
+    assert widget._column_paints == 5
+    assert widget._rebuilds == 1
+    # neueste Spalte rechts, mit Min/Max der Spalte
+    assert widget.history.newest() == (20.0, 80.0)
+    img = widget._pixmap.toImage()
+    assert img.pixelColor(299, 48 - 1 - int(0.5 * 47)) != img.pixelColor(0, 24)
+
+    widget.set_threshold(50.0)
+    widget.grab()
+    assert widget._rebuilds == 2
+
+@pytest.mark.qt
+def test_noise_history_uses_device_pixels_on_hidpi(qapp, qtbot):
+    from timeflow.noise_meter_window import NoiseHistoryWidget
+    widget = NoiseHistoryWidget(hop_s=0.025)
+    qtbot.addWidget(widget)
+    widget.devicePixelRatioF = lambda: 2.0
+    widget.resize(300, 48)
+    widget.grab()
+    pm = widget._pixmap
+    assert (pm.width(), pm.height()) == (600, 96)
+    assert pm.devicePixelRatio() == 2.0
+    assert widget.history.capacity == 600
+
+    # Pegel 80 liegt in Gerätezeile 95 - 0.8 * 95 = 19
+    per_column = widget.history.samples_per_column
+    for _ in range(per_column):
+        widget.add_level(80.0)
+    img = widget._pixmap.toImage()
+    bg = img.pixelColor(0, 19)
+    assert img.pixelColor(599, 19) != bg
+    assert img.pixelColor(598, 19) == bg
+    # nächste Spalte: um genau ein Gerätepixel weitergeschoben
+    for _ in range(per_column):
+        widget.add_level(80.0)
+    img = widget._pixmap.toImage()
+    assert img.pixelColor(598, 19) != bg
+    assert img.pixelColor(597, 19) == bg
+    assert widget._rebuilds == 1
+
+@pytest.mark.qt
+def test_level_meter_measures_capture_to_paint_latency(qapp, qtbot):
+    import time
+    widget = LevelMeterWidget()
+    qtbot.addWidget(widget)
+    widget.resize(500, 100)
+    widget.set_level(80.0, capture_ts=time.monotonic() - 0.05)
+    widget.grab()
+    assert widget.paint_latency.count == 1
+    assert widget.paint_latency.last_s >= 0.05
+    # ohne sichtbare Änderung kein neuer Messpunkt
+    widget.set_level(80.5, capture_ts=time.monotonic())
+    widget.grab()
+    assert widget.paint_latency.count == 1
+
+@pytest.mark.qt
+def test_noise_meter_profile_combo(qapp, qtbot):
+    window = NoiseMeterWindow(lang_code="de")
+    qtbot.addWidget(window)
+    assert window.profile_label.text() == "Profil"
+    idx = window.profile_combo.findData("low_power")
+    assert window.profile_combo.itemText(idx) == "Stromsparend"
+    window.profile_combo.setCurrentIndex(idx)
+    assert window.processor.profile == "low_power"
+    assert window.history.history.hop_s == window.processor.hop_s == 0.1
+    window.profile_combo.setCurrentIndex(window.profile_combo.findData("balanced"))
+
+@pytest.mark.qt
+def test_noise_meter_spectrum_toggle(qapp, qtbot):
+    from timeflow.spectrum import HAS_SPECTRUM
+    if not HAS_SPECTRUM:
+        pytest.skip("Spektrum nur mit NumPy")
+    window = NoiseMeterWindow(lang_code="de")
+    qtbot.addWidget(window)
+    assert window.spectrum_check.text() == "Spektrum"
+    window.spectrum_check.setChecked(True)
+    try:
+        assert not window.spectrum.isHidden()
+        # versteckt: rechnet nicht
+        assert window.processor.spectrum_fps == 0.0
+        widget = window.spectrum
+        widget.set_levels([-20.0, -10.0, -200.0])
+        widget.set_levels([-20.0, -10.0, -90.0])   # gleiche Anzeige nach Begrenzung
+        assert widget._updates == 1
+        widget.grab()
+    finally:
+        window.spectrum_check.setChecked(False)
+    assert window.spectrum.isHidden()
+
 @pytest.mark.qt
 def test_level_meter_widget_logic(qapp, qtbot):
     """Test logic inside the LevelMeterWidget."""
@@ -67,6 +192,26 @@ def test_level_meter_widget_logic(qapp, qtbot):
     # Trigger paint (basic check that it doesn't crash)
     widget.update()
 
+@pytest.mark.qt
+def test_level_meter_repaints_only_when_leds_change(qapp, qtbot):
+    """Level changes inside one LED step do not repaint; changes invalidate only the affected LEDs."""
+    widget = LevelMeterWidget()
+    qtbot.addWidget(widget)
+    widget.resize(500, 100)
+    rects = []
+    widget.update = lambda *args: rects.append(args[0] if args else widget.rect())
+
+    widget.set_level(41.0)
+    rects.clear()
+    widget.set_level(42.5)
+    widget.set_level(43.9)
+    assert rects == []
+    assert widget.lit_segments(43.9) == widget.lit_segments(41.0)
+
+    widget.set_level(44.0)
+    assert len(rects) == 1
+    assert rects[0].width() < widget.width() / 10
+
 @pytest.mark.qt
 def test_datetime_window_theme_refresh(qapp, qtbot):
     """Test if DateTimeWindow reacts to theme changes."""
@@ -132,3 +277,20 @@ def test_noise_last_settings(qapp):
     sens, limit = manager.load_last_settings()
     assert sens == 12
     assert limit == 34
+
+@pytest.mark.qt
+def test_level_meter_db_label_repaints_only_on_change(qapp, qtbot):
+    widget = LevelMeterWidget()
+    qtbot.addWidget(widget)
+    widget.resize(500, 100)
+    rects = []
+    widget.update = lambda *args: rects.append(args[0] if args else widget.rect())
+
+    widget.set_db(63.2)
+    widget.set_db(62.8)
+    assert len(rects) == 1
+    assert rects[0].width() < widget.width() / 4
+    widget.set_db(None)
+    assert len(rects) == 2
+    widget.set_db(70.0)
+    widget.grab()
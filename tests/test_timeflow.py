@@ -80,9 +80,12 @@ class TestTimerEngine:
         engine.set_total_seconds(60.0)
         engine.start()
         time.sleep(0.15)  # Let it run briefly
+        resets = []
+        engine.wasReset.connect(lambda: resets.append(True))
         engine.reset()
         assert engine._running == False
         assert engine.elapsed_seconds() == 0.0
+        assert resets == [True]
 
     def test_timer_engine_toggle(self, qtbot):
         """Test toggle functionality."""
@@ -122,9 +125,71 @@ class TestTimerEngine:
         
         engine.start()
         qtbot.wait(500)  # Wait for completion
-        
+
         assert len(finished_called) >= 1
 
+    def test_adaptive_deadline_half_seconds(self, qtbot):
+        """Test that display changes are scheduled at half seconds (format_mmss rounds)."""
+        from timeflow.timer_engine import TimerEngine
+        engine = TimerEngine(adaptive=True)
+        engine.set_total_seconds(60.0)
+        assert engine.next_deadline(0.0) == pytest.approx(0.5)
+        assert engine.next_deadline(0.5) == pytest.approx(1.5)
+        assert engine.next_deadline(59.7) == pytest.approx(60.0)
+
+    def test_adaptive_deadline_fractional_total(self, qtbot):
+        """Test that countdown rounding boundaries are honoured for fractional totals."""
+        from timeflow.timer_engine import TimerEngine
+        engine = TimerEngine(adaptive=True)
+        engine.set_total_seconds(10.2)
+        # Remaining 10.2 -> display changes when remaining crosses 9.5 (elapsed 0.7)
+        # but elapsed display changes earlier at 0.5
+        assert engine.next_deadline(0.0) == pytest.approx(0.5)
+        assert engine.next_deadline(0.5) == pytest.approx(0.7)
+
+    def test_adaptive_deadline_breakpoints_and_steps(self, qtbot):
+        """Test that segment boundaries and progress steps shorten the deadline."""
+        from timeflow.timer_engine import TimerEngine
+        engine = TimerEngine(adaptive=True)
+        engine.set_total_seconds(100.0)
+        engine.set_breakpoints([0.3, 50.0])
+        assert engine.next_deadline(0.0) == pytest.approx(0.3)
+        assert engine.next_deadline(0.3) == pytest.approx(0.5)
+
+        engine.set_breakpoints([])
+        engine.set_progress_steps(1000)  # 0.1 s per step
+        assert engine.next_deadline(0.0) == pytest.approx(0.1)
+
+    def test_adaptive_fewer_ticks(self, qtbot):
+        """Test that adaptive mode ticks far less often than the 100 ms grid."""
+        from timeflow.timer_engine import TimerEngine
+        engine = TimerEngine(adaptive=True)
+        engine.set_total_seconds(60.0)
+
+        ticks = []
+        engine.tick.connect(lambda state: ticks.append(state))
+        engine.start()
+        qtbot.wait(700)
+        engine.pause()
+
+        # start + the 0.5 s change + pause
+        assert 2 <= len(ticks) <= 4
+        assert any(0.5 <= t.elapsed_s < 0.6 for t in ticks)
+
+    def test_adaptive_finished_signal(self, qtbot):
+        """Test that the finished signal fires at the deadline in adaptive mode."""
+        from timeflow.timer_engine import TimerEngine
+        engine = TimerEngine(adaptive=True)
+        engine.set_total_seconds(0.2)
+
+        finished_called = []
+        engine.finished.connect(lambda: finished_called.append(True))
+        engine.start()
+        qtbot.wait(400)
+
+        assert finished_called == [True]
+        assert engine.elapsed_seconds() == 0.2
+
 
 # ============================================================================
 # SEGMENTS MODEL TESTS
@@ -530,6 +595,135 @@ class TestPieWidget:
         widget.set_progress(-0.5)
         assert widget._progress == 0.0
 
+    def test_pie_widget_ring_cached_across_progress(self, qtbot):
+        """Progress updates repaint only the arc; the ring pixmap is reused."""
+        from timeflow.pie_widget import PieWidget
+        from timeflow.segments_model import Segment
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(200, 200)
+        widget.set_segments([Segment("A", 10), Segment("B", 20)])
+
+        widget.grab()
+        for p in (0.1, 0.2, 0.3):
+            widget.set_progress(p)
+            widget.grab()
+        assert widget._ring_renders == 1
+
+    def test_pie_widget_ring_invalidated(self, qtbot):
+        """Segment edits and resizes rebuild the ring once."""
+        from timeflow.pie_widget import PieWidget
+        from timeflow.segments_model import Segment
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(200, 200)
+        widget.grab()
+
+        widget.set_segments([Segment("A", 10)])
+        widget.grab()
+        widget.resize(300, 300)
+        widget.grab()
+        widget.grab()
+        assert widget._ring_renders == 3
+        assert widget._ring_cache.deviceIndependentSize().width() == 300
+
+    def test_lod_merges_tiny_segments(self):
+        """Sub-pixel segments merge into aggregate arcs; big ones stay separate."""
+        from timeflow.pie_widget import lod_arcs
+        arcs = lod_arcs([60] + [0.01] * 1000 + [60], min_span_deg=1.0)
+        assert sum(span for _, span, _ in arcs) == pytest.approx(360.0)
+        assert sum(count for _, _, count in arcs) == 1002
+        assert arcs[0][2] == 1 and arcs[-1][2] == 1
+        # 10 min Kleinkram von 130 min = ~27.7° -> höchstens ~28 Sammelbögen à 1°
+        assert len(arcs) <= 2 + 28
+        # Lückenlos aneinandergereiht
+        for (a0, s0, _), (a1, _, _) in zip(arcs, arcs[1:]):
+            assert a0 - s0 == pytest.approx(a1)
+
+    def test_lod_merges_short_runs_between_wide_segments(self):
+        """A tiny segment between wide ones joins a neighbour instead of its own sub-pixel arc."""
+        from timeflow.pie_widget import lod_arcs
+        arcs = lod_arcs([0.01, 30, 0.01, 30, 0.01, 30, 0.01], min_span_deg=1.0)
+        assert len(arcs) == 3
+        assert all(span >= 1.0 for _, span, _ in arcs)
+        # vorn: in den nächsten Bogen, sonst in den vorigen
+        assert [count for _, _, count in arcs] == [3, 2, 2]
+        assert arcs[0][0] == pytest.approx(90.0)
+        assert sum(span for _, span, _ in arcs) == pytest.approx(360.0)
+        for (a0, s0, _), (a1, _, _) in zip(arcs, arcs[1:]):
+            assert a0 - s0 == pytest.approx(a1)
+
+    def test_lod_arc_count_bounded_by_resolution(self, qtbot):
+        """Path count depends on the ring size, not on the agenda length."""
+        from timeflow.pie_widget import PieWidget
+        from timeflow.segments_model import Segment
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(60, 60)
+        widget.set_segments([Segment(str(i), 1) for i in range(5000)])
+        widget.grab()
+        assert 0 < len(widget._arcs) <= 2 * widget.progress_steps()
+        assert sum(c for _, _, c in widget._arcs) == 5000
+
+    def test_progress_repaints_only_on_visible_change(self, qtbot):
+        """Sub-pixel progress changes do not schedule repaints."""
+        from timeflow.pie_widget import PieWidget
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(320, 320)
+        updates = []
+        widget.update = lambda *args: updates.append(args)
+
+        steps = widget.progress_steps()
+        widget.set_progress(0.0)
+        updates.clear()
+        widget.set_progress(0.2 / steps)
+        widget.set_progress(0.4 / steps)
+        assert updates == []
+        assert widget._progress == pytest.approx(0.4 / steps)
+
+        widget.set_progress(1.0 / steps)
+        assert len(updates) == 1
+
+    def test_progress_step_follows_frame(self, qtbot):
+        """The pie redraws at the view model's step edges, not one step off."""
+        from timeflow.pie_widget import PieWidget
+        from timeflow.view_model import TimerViewModel
+        from timeflow.timeline import SegmentTimeline
+        from timeflow.i18n import get_strings
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(320, 320)
+        steps = widget.progress_steps()
+        vm = TimerViewModel()
+        vm.set_progress_steps(steps)
+        timeline = SegmentTimeline([7.0])
+        strings = get_strings("de")
+
+        for k in range(steps + 1):
+            frame = vm.build(7.0 * k / steps, 7.0, "countup", strings, timeline, lambda i: "A")
+            widget.set_progress_step(frame.progress_step, frame.progress_steps)
+            assert widget._shown[0] == frame.progress_step
+        assert widget._progress == 1.0
+
+    def test_progress_update_rect_is_partial(self, qtbot):
+        """A one-pixel advance invalidates only the wedge near the arc edge."""
+        from timeflow.pie_widget import PieWidget
+        widget = PieWidget()
+        qtbot.addWidget(widget)
+        widget.resize(320, 320)
+        rects = []
+        widget.update = lambda *args: rects.append(args[0] if args else widget.rect())
+
+        steps = widget.progress_steps()
+        widget.set_progress(0.25)
+        rects.clear()
+        for k in range(1, 40):
+            widget.set_progress(0.25 + k / steps)
+        # Nur Keil-Updates, ohne Farbwechsel weit kleiner als das Widget
+        small = [r for r in rects if r.width() * r.height() < widget.width() * widget.height() / 4]
+        assert small
+
 
 # ============================================================================
 # STYLES TESTS
@@ -0,0 +1,129 @@
+from PySide6.QtCore import Qt, QMimeData, QModelIndex
+from timeflow.timeline import SegmentTimeline
+from timeflow.segments_model import (
+    SegmentsModel, Segment, SegmentChangeBatcher,
+    CHANGE_NAMES, CHANGE_DURATIONS, CHANGE_STRUCTURE,
+)
+
+
+class TestSegmentTimeline:
+    def test_prefix_sums(self):
+        tl = SegmentTimeline([60, 120, 30])
+        assert tl.boundaries() == [60, 180, 210]
+        assert tl.total() == 210
+        assert tl.start_of(0) == 0
+        assert tl.start_of(2) == 180
+
+    def test_negative_durations_clamped(self):
+        tl = SegmentTimeline([60, -10, 30])
+        assert tl.boundaries() == [60, 60, 90]
+
+    def test_index_at(self):
+        tl = SegmentTimeline([60, 60])
+        assert tl.index_at(0) == 0
+        assert tl.index_at(59.9) == 0
+        assert tl.index_at(60) == 1
+        # Beyond the end stays on the last segment
+        assert tl.index_at(500) == 1
+        assert SegmentTimeline().index_at(5) == -1
+
+    def test_zero_length_segments_skipped(self):
+        tl = SegmentTimeline([60, 0, 60])
+        assert tl.index_at(60) == 2
+
+    def test_next_start_and_remaining(self):
+        tl = SegmentTimeline([60, 60])
+        assert tl.next_start(10) == 60
+        assert tl.next_start(60) == 120
+        assert tl.next_start(120) == 120
+        assert tl.remaining_in_current(45) == 15
+
+    def test_incremental_updates(self):
+        tl = SegmentTimeline([10, 20, 30])
+        tl.set_duration(1, 5)
+        assert tl.boundaries() == [10, 15, 45]
+        tl.insert(1, [100])
+        assert tl.boundaries() == [10, 110, 115, 145]
+        tl.remove(0, 2)
+        assert tl.boundaries() == [5, 35]
+        tl.move(0, 1)
+        assert tl.boundaries() == [30, 35]
+
+
+class TestModelTimeline:
+    def test_set_segments(self):
+        model = SegmentsModel()
+        model.set_segments([Segment("A", 1), Segment("B", 2)])
+        assert model.timeline().boundaries() == [60, 180]
+        assert model.total_seconds() == 180
+
+    def test_set_data_minutes(self):
+        model = SegmentsModel(segments=[Segment("A", 1), Segment("B", 2)])
+        model.setData(model.index(0, 1), 3, Qt.EditRole)
+        assert model.timeline().boundaries() == [180, 300]
+        # Name edits leave the index untouched
+        model.setData(model.index(0, 0), "X", Qt.EditRole)
+        assert model.total_seconds() == 300
+
+    def test_insert_remove_rows(self):
+        model = SegmentsModel(segments=[Segment("A", 1)])
+        model.insertRows(0, 2)
+        assert model.timeline().boundaries() == [300, 600, 660]
+        model.removeRows(1, 2)
+        assert model.timeline().boundaries() == [300]
+
+    def test_drop_move(self):
+        model = SegmentsModel(segments=[Segment("A", 1), Segment("B", 2), Segment("C", 3)])
+        mime = QMimeData()
+        mime.setData("application/x-timeflow-row", b"0")
+        assert model.dropMimeData(mime, Qt.MoveAction, 3, 0, QModelIndex())
+        assert [s.name for s in model.segments()] == ["B", "C", "A"]
+        assert model.timeline().boundaries() == [120, 300, 360]
+
+
+class TestSegmentChangeBatcher:
+    def make(self):
+        model = SegmentsModel([Segment("A", 1), Segment("B", 2)])
+        batcher = SegmentChangeBatcher(model)
+        batches = []
+        batcher.changed.connect(batches.append)
+        return model, batcher, batches
+
+    def test_coalesces_within_event_loop_turn(self, qtbot):
+        model, batcher, batches = self.make()
+        model.insertRows(2, 1)
+        model.setData(model.index(2, 0), "C", Qt.EditRole)
+        model.setData(model.index(0, 1), 3, Qt.EditRole)
+        assert batches == []
+        qtbot.wait(20)
+        assert batches == [CHANGE_STRUCTURE]
+
+    def test_classifies_columns(self, qtbot):
+        model, batcher, batches = self.make()
+        model.setData(model.index(0, 0), "Renamed", Qt.EditRole)
+        batcher.flush()
+        model.setData(model.index(1, 1), 4, Qt.EditRole)
+        batcher.flush()
+        assert batches == [CHANGE_NAMES, CHANGE_DURATIONS]
+
+    def test_flush_is_idempotent(self, qtbot):
+        model, batcher, batches = self.make()
+        model.set_segments([Segment("X", 1)])
+        batcher.flush()
+        batcher.flush()
+        qtbot.wait(20)
+        assert batches == [CHANGE_STRUCTURE]
+
+    def test_main_window_add_segment_recomputes_once(self, qtbot):
+        from timeflow.main_window import MainWindow
+        from timeflow.i18n import get_strings
+        w = MainWindow()
+        qtbot.addWidget(w)
+        calls = []
+        w.segment_changes.changed.connect(calls.append)
+        w.add_segment()
+        qtbot.wait(20)
+        assert calls == [CHANGE_STRUCTURE]
+        last = w.segments_model.segment(w.segments_model.rowCount() - 1)
+        assert last.name == get_strings(w.current_lang()).new_segment_default
+        assert w.engine.total_seconds() == w.segments_model.total_seconds()
@@ -0,0 +1,182 @@
+import subprocess
+import sys
+import pytest
+from timeflow.timer_core import TimerCore, ManualClock, run_simulated
+from timeflow.timeline import SegmentTimeline
+
+
+def make_core(adaptive=True, total=60.0):
+    clock = ManualClock()
+    core = TimerCore(clock, adaptive=adaptive)
+    core.set_total_seconds(total)
+    return core, clock
+
+
+class TestTimerCore:
+    def test_import_without_qt(self):
+        """The core must not pull in PySide6."""
+        code = (
+            "import sys; sys.modules['PySide6'] = None; "
+            "import timeflow.timer_core, timeflow.timeline; "
+            "assert not any(m.startswith('PySide6.') for m in sys.modules)"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_elapsed_follows_clock(self):
+        core, clock = make_core()
+        core.start()
+        clock.advance(12.5)
+        assert core.elapsed_seconds() == 12.5
+        core.pause()
+        clock.advance(100)
+        assert core.elapsed_seconds() == 12.5
+
+    def test_seek_and_reset(self):
+        core, clock = make_core(total=100)
+        core.seek(150)
+        assert core.elapsed_seconds() == 100
+        core.start()
+        core.seek(40)
+        clock.advance(1)
+        assert core.running
+        assert core.elapsed_seconds() == 41
+        core.reset()
+        assert not core.running
+        assert core.elapsed_seconds() == 0
+
+    def test_listeners(self):
+        core, clock = make_core(total=2)
+        ticks, finished = [], []
+        core.add_tick_listener(ticks.append)
+        core.add_finished_listener(lambda: finished.append(True))
+        core.start()
+        run_simulated(core, clock, 5)
+        assert finished == [True]
+        assert ticks[-1].elapsed_s == 2
+        assert not ticks[-1].running
+
+    def test_scheduler_callbacks(self):
+        core, clock = make_core()
+        delays = []
+        core.set_scheduler(delays.append)
+        core.start()
+        assert delays[-1] == pytest.approx(0.501)
+        core.pause()
+        assert delays[-1] is None
+
+    def test_run_simulated_restores_scheduler(self):
+        core, clock = make_core(total=10)
+        delays = []
+        core.set_scheduler(delays.append)
+        core.start()
+        run_simulated(core, clock, 1.0)
+        assert core.scheduler() == delays.append
+        assert delays[-1] is not None
+
+    def test_fixed_mode_polls(self):
+        core, clock = make_core(adaptive=False, total=10)
+        core.start()
+        wakeups = run_simulated(core, clock, 1.0)
+        assert 9 <= wakeups <= 10
+
+    def test_simulated_school_day(self):
+        """Six hours of segments with wakeups only when the display changes."""
+        timeline = SegmentTimeline([45 * 60] * 8)
+        clock = ManualClock()
+        core = TimerCore(clock, adaptive=True)
+        core.set_timeline(timeline)
+        finished = []
+        core.add_finished_listener(lambda: finished.append(True))
+
+        core.start()
+        wakeups = run_simulated(core, clock, timeline.total() + 10)
+
+        assert finished == [True]
+        # One wakeup per displayed second, not ten
+        assert wakeups <= timeline.total() * 1.1
+        assert core.elapsed_seconds() == timeline.total()
+
+
+class TestSegmentEvents:
+    def make(self, durations=(60, 60, 60), warnings=()):
+        clock = ManualClock()
+        core = TimerCore(clock, adaptive=True)
+        events = []
+        core.add_segment_listener(lambda e: events.append((e.kind, e.index, e.seconds_left)))
+        core.set_approach_warnings(warnings)
+        core.set_timeline(SegmentTimeline(durations))
+        return core, clock, events
+
+    def test_enter_and_leave_on_time(self):
+        core, clock, events = self.make()
+        assert events == [("entered", 0, 0.0)]
+        core.start()
+        run_simulated(core, clock, 60.5)
+        assert events[1:] == [("left", 0, 0.0), ("entered", 1, 0.0)]
+        # Delivered right after the boundary, not on the next display tick
+        assert core.current_segment() == 1
+
+    def test_approaching_boundary(self):
+        core, clock, events = self.make(warnings=[10])
+        core.start()
+        stamps = []
+        core.add_segment_listener(lambda e: stamps.append((e.kind, core.elapsed_seconds())))
+        run_simulated(core, clock, 55)
+        assert ("approaching", 0, 10.0) in events
+        kind, t = stamps[0]
+        assert kind == "approaching"
+        assert t == pytest.approx(50.0, abs=0.01)
+
+    def test_seek_jumps_without_replaying_warnings(self):
+        core, clock, events = self.make(warnings=[10])
+        events.clear()
+        core.seek(130)
+        assert events == [("left", 0, 0.0), ("entered", 2, 0.0)]
+
+    def test_pause_resume_keeps_schedule(self):
+        core, clock, events = self.make(warnings=[5])
+        core.start()
+        run_simulated(core, clock, 30)
+        core.pause()
+        clock.advance(1000)
+        core.start()
+        run_simulated(core, clock, 26)
+        assert ("approaching", 0, 5.0) in events
+        assert core.current_segment() == 0
+        run_simulated(core, clock, 5)
+        assert core.current_segment() == 1
+
+    def test_finish_leaves_last_segment(self):
+        core, clock, events = self.make(durations=(1,))
+        core.start()
+        run_simulated(core, clock, 2)
+        assert events[-1] == ("left", 0, 0.0)
+        assert core.current_segment() == -1
+        core.reset()
+        assert events[-1] == ("entered", 0, 0.0)
+
+    def test_engine_signals(self, qtbot):
+        from timeflow.timer_engine import TimerEngine
+        clock = ManualClock()
+        engine = TimerEngine(adaptive=True, clock=clock)
+        entered, left = [], []
+        engine.segmentEntered.connect(entered.append)
+        engine.segmentLeft.connect(left.append)
+        engine.set_timeline(SegmentTimeline([10, 10]))
+        engine.seek(15)
+        assert entered == [0, 1]
+        assert left == [0]
+
+    def test_engine_approaching_signal(self, qtbot):
+        from timeflow.timer_engine import TimerEngine
+        clock = ManualClock()
+        engine = TimerEngine(adaptive=True, clock=clock)
+        approaching = []
+        engine.approachingBoundary.connect(lambda i, s: approaching.append((i, s)))
+        engine.set_approach_warnings([3])
+        engine.set_timeline(SegmentTimeline([10, 10]))
+        engine.seek(15)
+        engine.start()
+        run_simulated(engine.core(), clock, 3)
+        engine.pause()
+        assert approaching == [(1, 3.0)]
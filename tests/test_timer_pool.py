@@ -0,0 +1,97 @@
+import pytest
+from timeflow.timer_core import TimerPoolCore, ManualClock, run_simulated
+from timeflow.timeline import SegmentTimeline
+
+
+def make_pool():
+    clock = ManualClock()
+    pool = TimerPoolCore(clock)
+    batches, finished = [], []
+    pool.add_batch_listener(batches.append)
+    pool.add_finished_listener(finished.extend)
+    return pool, clock, batches, finished
+
+
+class TestTimerPoolCore:
+    def test_add_and_remove(self):
+        pool, _, _, _ = make_pool()
+        a = pool.add_timer()
+        b = pool.add_timer("hall-b")
+        assert len(pool) == 2
+        assert b == "hall-b"
+        with pytest.raises(KeyError):
+            pool.add_timer("hall-b")
+        pool.remove_timer(a)
+        assert a not in pool
+
+    def test_independent_state(self):
+        pool, clock, _, _ = make_pool()
+        a = pool.add_timer(timeline=SegmentTimeline([60]))
+        b = pool.add_timer(timeline=SegmentTimeline([120]))
+        pool.timer(a).start()
+        pool.timer(b).start()
+        pool.timer(b).seek(100)
+        run_simulated(pool, clock, 10)
+        pool.timer(a).pause()
+        assert pool.timer(a).elapsed_seconds() == pytest.approx(10)
+        assert pool.timer(b).elapsed_seconds() == pytest.approx(110)
+        assert pool.timer(b).running
+
+    def test_control_changes_are_batched(self):
+        pool, _, batches, _ = make_pool()
+        ids = [pool.add_timer(timeline=SegmentTimeline([60])) for _ in range(5)]
+        for tid in ids:
+            pool.timer(tid).start()
+        assert pool.wakeup_delay() == 0.0
+        pool.process()
+        assert len(batches) == 1
+        assert set(batches[0]) == set(ids)
+
+    def test_shared_deadlines_single_wakeup(self):
+        """Timers with aligned deadlines are served by one wakeup per change."""
+        pool, clock, batches, finished = make_pool()
+        ids = [pool.add_timer(timeline=SegmentTimeline([30])) for _ in range(1000)]
+        for tid in ids:
+            pool.timer(tid).start()
+        wakeups = run_simulated(pool, clock, 40)
+        # ~one wakeup per displayed second, independent of the timer count
+        assert wakeups <= 40
+        assert sorted(finished) == sorted(ids)
+        assert all(len(b) == 1000 for b in batches)
+
+    def test_cost_scales_with_changing_timers(self):
+        pool, clock, batches, _ = make_pool()
+        for _ in range(500):
+            pool.add_timer(timeline=SegmentTimeline([60]))
+        busy = pool.add_timer(timeline=SegmentTimeline([60]))
+        pool.timer(busy).start()
+        run_simulated(pool, clock, 5)
+        # Only the running timer shows up after the initial batch
+        assert all(set(b) == {busy} for b in batches[1:])
+
+    def test_stale_entries_compacted(self):
+        pool, clock, _, _ = make_pool()
+        tid = pool.add_timer(timeline=SegmentTimeline([600]))
+        pool.timer(tid).start()
+        for i in range(500):
+            pool.timer(tid).seek(i)
+        assert len(pool._heap) < 200
+        pool.remove_timer(tid)
+        assert pool.wakeup_delay() is None
+
+
+class TestTimerPool:
+    def test_qt_adapter_emits_batches(self, qtbot):
+        from timeflow.timer_pool import TimerPool
+        pool = TimerPool()
+        batches, finished = [], []
+        pool.ticks.connect(batches.append)
+        pool.finished.connect(finished.extend)
+
+        ids = [pool.add_timer(timeline=SegmentTimeline([0.3])) for _ in range(3)]
+        for tid in ids:
+            pool.timer(tid).start()
+        qtbot.wait(500)
+
+        assert sorted(finished) == sorted(ids)
+        assert all(not s.running for s in batches[-1].values())
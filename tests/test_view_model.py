@@ -0,0 +1,149 @@
+import pytest
+from timeflow.i18n import get_strings
+from timeflow.timeline import SegmentTimeline
+from timeflow.timer_engine import TimerState
+from timeflow.view_model import TimerViewModel, FRAME_FIELDS
+
+NAMES = ["Intro", "Work", "Outro"]
+
+
+def build(vm, elapsed, mode="countdown", lang="en", durations=(60, 60, 60)):
+    return vm.build(elapsed, sum(durations), mode, get_strings(lang),
+                    SegmentTimeline(durations), NAMES.__getitem__)
+
+
+class TestTimerViewModel:
+    def test_frame_contents(self):
+        vm = TimerViewModel()
+        vm.set_progress_steps(360)
+        f = build(vm, 90)
+        s = get_strings("en")
+        assert f.time_text == "01:30"
+        assert f.caption == s.time_remaining
+        assert f.current_text == f"{s.current_segment} Work"
+        assert f.next_text == f"{s.next_segment} Outro"
+        assert f.selected_row == 1
+        assert f.progress_step == 180
+        assert f.progress == pytest.approx(0.5)
+
+    def test_first_frame_pushes_everything(self):
+        vm = TimerViewModel()
+        assert vm.update(build(vm, 0)) == list(FRAME_FIELDS)
+        assert all(vm.change_count(name) == 1 for name in FRAME_FIELDS)
+
+    def test_unchanged_frame_is_skipped(self):
+        vm = TimerViewModel()
+        vm.set_progress_steps(100)
+        vm.update(build(vm, 10.0))
+        assert vm.update(build(vm, 10.2)) == []
+        assert vm.change_count("time_text") == 1
+
+    def test_only_changed_fields(self):
+        vm = TimerViewModel()
+        vm.set_progress_steps(100000)
+        vm.update(build(vm, 10))
+        assert vm.update(build(vm, 11)) == ["time_text", "progress_step"]
+        assert vm.update(build(vm, 61)) == [
+            "time_text", "current_text", "next_text", "progress_step", "selected_row"]
+        assert vm.update(build(vm, 61, mode="stopwatch")) == ["time_text", "caption"]
+        assert vm.change_count("caption") == 2
+        assert vm.change_count("selected_row") == 2
+
+    def test_progress_quantized_to_pixel_steps(self):
+        vm = TimerViewModel()
+        vm.set_progress_steps(10)
+        vm.update(build(vm, 0, mode="stopwatch"))
+        pushes = sum(1 for t in range(181) if "progress_step" in vm.update(build(vm, t, mode="stopwatch")))
+        assert pushes == 10
+
+    def test_progress_step_matches_core_schedule(self):
+        from timeflow.timer_core import TimerCore
+        core = TimerCore()
+        core.set_total_seconds(180)
+        core.set_progress_steps(10)
+        vm = TimerViewModel()
+        vm.set_progress_steps(10)
+        # Sekunden-Wakeups liegen auf halben Sekunden; 27.5 s = 1.53 Schritte
+        for elapsed in (26.5, 27.5, 35.5):
+            assert build(vm, elapsed, mode="stopwatch").progress_step == 1
+            assert core.next_deadline(elapsed) <= 36.0
+        # der vom Kern geplante Wakeup für Schritt 2
+        assert build(vm, 36.0, mode="stopwatch").progress_step == 2
+
+    def test_invalidate_forces_full_frame(self):
+        vm = TimerViewModel()
+        vm.update(build(vm, 5))
+        vm.invalidate()
+        assert vm.update(build(vm, 5)) == list(FRAME_FIELDS)
+
+    def test_invalidate_single_field(self):
+        vm = TimerViewModel()
+        vm.update(build(vm, 5))
+        vm.invalidate("selected_row")
+        assert vm.update(build(vm, 5)) == ["selected_row"]
+        assert vm.update(build(vm, 5)) == []
+        with pytest.raises(ValueError):
+            vm.invalidate("nope")
+
+
+class TestMainWindowRender:
+    def test_labels_set_only_on_change(self, qtbot):
+        from timeflow.main_window import MainWindow
+        w = MainWindow()
+        qtbot.addWidget(w)
+        count = w.view_model.change_count("time_text")
+        state = TimerState(True, 10.0, w.segments_model.total_seconds())
+        w.on_tick(state)
+        w.on_tick(TimerState(True, 10.3, state.total_s))
+        assert w.view_model.change_count("time_text") == count + 1
+        assert w.timer_view.time_label.text() == w.view_model.last_frame().time_text
+
+    def test_selection_survives_preset_load_while_running(self, qtbot):
+        from timeflow.main_window import MainWindow
+        from timeflow.segments_model import Segment
+        w = MainWindow()
+        qtbot.addWidget(w)
+        w.segments_model.set_segments([Segment("A", 1), Segment("B", 1), Segment("C", 1)])
+        w.segment_changes.flush()
+        w.engine.start()
+        w.engine.seek(90.0)
+        w.on_tick(w._make_state_for_ui())
+        view = w.segments_view.view
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [1]
+
+        # Preset mit gleicher Struktur: Model-Reset löscht die Auswahl, Zeile bleibt 1
+        w.segments_model.set_segments([Segment("X", 1), Segment("Y", 1), Segment("Z", 1)])
+        w.segment_changes.flush()
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [1]
+        w.engine.pause()
+
+    def test_selection_skipped_while_editing_is_retried(self, qtbot):
+        from timeflow.main_window import MainWindow
+        w = MainWindow()
+        qtbot.addWidget(w)
+        w.show()
+        view = w.segments_view.view
+        total = w.segments_model.total_seconds()
+        w.on_tick(TimerState(True, 0.0, total))
+        view.edit(w.segments_model.index(0, 0))
+        assert view.state() == view.State.EditingState
+        w.engine.seek(w.segments_model.timeline().start_of(1) + 1.0)
+        w.on_tick(TimerState(False, w.engine.elapsed_seconds(), total))
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [0]
+
+        editor = view.indexWidget(w.segments_model.index(0, 0)) or view.focusWidget()
+        view.itemDelegate().closeEditor.emit(editor)
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [1]
+
+    def test_segment_entered_reselects_current_row(self, qtbot):
+        from timeflow.main_window import MainWindow
+        w = MainWindow()
+        qtbot.addWidget(w)
+        view = w.segments_view.view
+        w.on_tick(w._make_state_for_ui())
+        # Auswahl per Hand weggeklickt: der View-Model-Diff sieht keine Änderung
+        view.selectRow(1)
+        w.on_tick(w._make_state_for_ui())
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [1]
+        w.engine.segmentEntered.emit(0)
+        assert [i.row() for i in view.selectionModel().selectedRows()] == [0]
@@ -0,0 +1,119 @@
+import array
+import math
+import pytest
+from timeflow.audio_kernels import HAS_NUMPY, HopWindowBuffer
+from timeflow.weighting import (
+    BiquadCascade, DB_FLOOR, MIN_SAMPLE_RATE, _biquad_response, a_weighting_sos, dbfs,
+    lfilter_sos_reference,
+)
+
+BACKENDS = [False] + ([True] if HAS_NUMPY else [])
+
+
+def response_db(sos, freq, rate):
+    return 20 * math.log10(_biquad_response(sos, freq, rate))
+
+
+def iec_a_db(f):
+    """Analoge A-Kurve nach IEC 61672 (Formel, nicht Tabelle)."""
+    f2 = f * f
+    ra = 12194.217 ** 2 * f2 * f2 / (
+        (f2 + 20.598997 ** 2) * math.sqrt((f2 + 107.65265 ** 2) * (f2 + 737.86223 ** 2))
+        * (f2 + 12194.217 ** 2))
+    return 20 * math.log10(ra) + 2.0
+
+
+def sine(freq, rate, n, amp=0.5):
+    return [amp * math.sin(2 * math.pi * freq * i / rate) for i in range(n)]
+
+
+class TestAWeighting:
+    @pytest.mark.parametrize("freq,expected", [
+        (31.5, -39.4), (100, -19.1), (250, -8.6), (1000, 0.0), (2000, 1.2), (4000, 1.0),
+    ])
+    def test_matches_standard_table(self, freq, expected):
+        # Tabelle aus IEC 61672; bilineare Transformation weicht erst nahe Nyquist spürbar ab
+        assert response_db(a_weighting_sos(48000), freq, 48000) == pytest.approx(expected, abs=0.2)
+
+    @pytest.mark.parametrize("freq", [2000, 2500, 3000, 3500, 4000])
+    def test_upper_band_close_to_iec_curve_at_lowest_rate(self, freq):
+        # Bei 8 kHz lagen 3 kHz/3.5 kHz 1.4 dB/5.7 dB zu tief -> dort wird nicht mehr bewertet
+        sos = a_weighting_sos(MIN_SAMPLE_RATE)
+        assert response_db(sos, freq, MIN_SAMPLE_RATE) == pytest.approx(iec_a_db(freq), abs=0.5)
+
+    def test_8khz_is_not_weighted(self):
+        with pytest.raises(ValueError):
+            a_weighting_sos(8000)
+        assert not HopWindowBuffer(8000, 1, weighting=True).weighting
+
+    def test_dbfs(self):
+        assert dbfs(1.0) == 0.0
+        assert dbfs(0.5) == pytest.approx(-6.02, abs=0.01)
+        assert dbfs(0.0) == DB_FLOOR
+
+
+class TestBiquadCascade:
+    @pytest.mark.skipif(not HAS_NUMPY, reason="NumPy fehlt")
+    @pytest.mark.parametrize("chunks", [[4000], [1, 255, 256, 257, 3231], [100] * 40])
+    def test_block_filter_matches_reference_across_buffers(self, chunks):
+        import numpy as np
+        sos = a_weighting_sos(48000)
+        x = np.random.default_rng(3).standard_normal(sum(chunks))
+        expected = lfilter_sos_reference(sos, list(x), [[0.0, 0.0] for _ in sos])
+
+        cascade = BiquadCascade(sos, block=256)
+        out = np.empty_like(x)
+        i = 0
+        for n in chunks:
+            cascade.process(x[i:i + n], out[i:i + n])
+            i += n
+        assert np.max(np.abs(out - expected)) < 1e-9
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_interleaved_channels_keep_separate_state(self, use_numpy):
+        np = pytest.importorskip("numpy") if use_numpy else None
+        sos = a_weighting_sos(16000)
+        left, right = sine(1000, 16000, 300), sine(100, 16000, 300)
+        stereo = array.array("d", [v for pair in zip(left, right) for v in pair])
+        cascade = BiquadCascade(sos, channels=2, block=32, use_numpy=use_numpy)
+        out = []
+        # Stückgrenze mitten im Frame
+        for lo, hi, first in ((0, 101, 0), (101, len(stereo), 1)):
+            part = array.array("d", bytes(8 * (hi - lo)))
+            if use_numpy:
+                part = np.zeros(hi - lo)
+            cascade.process(stereo[lo:hi], part, first_channel=first)
+            out.extend(part)
+        ref_l = lfilter_sos_reference(sos, left, [[0.0, 0.0] for _ in sos])
+        ref_r = lfilter_sos_reference(sos, right, [[0.0, 0.0] for _ in sos])
+        assert out[0::2] == pytest.approx(ref_l, abs=1e-9)
+        assert out[1::2] == pytest.approx(ref_r, abs=1e-9)
+
+
+class TestWeightedWindows:
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_low_tone_is_attenuated_against_1khz(self, use_numpy):
+        rate = MIN_SAMPLE_RATE
+        results = {}
+        for freq in (100, 1000):
+            buf = HopWindowBuffer(rate, 1, window_s=0.1, hop_s=0.1, use_numpy=use_numpy, weighting=True)
+            data = array.array("f", sine(freq, rate, rate // 2)).tobytes()
+            seen = []
+            buf.push(data, "f", lambda rms, peak: seen.append((rms, buf.weighted_rms)))
+            results[freq] = seen[-1]
+        rms_1k, weighted_1k = results[1000]
+        rms_100, weighted_100 = results[100]
+        assert rms_1k == pytest.approx(0.5 / math.sqrt(2), rel=1e-3)
+        assert dbfs(weighted_1k) - dbfs(rms_1k) == pytest.approx(0.0, abs=0.1)
+        assert dbfs(weighted_100) - dbfs(rms_100) == pytest.approx(-19.1, abs=0.3)
+
+    def test_without_weighting_no_weighted_values(self):
+        buf = HopWindowBuffer(8000, 1, window_s=0.01, hop_s=0.01)
+        buf.push(array.array("f", [0.5] * 200).tobytes(), "f", lambda r, p: None)
+        assert not buf.weighting
+        assert buf.weighted_rms == 0.0
+
+    def test_low_sample_rate_disables_weighting(self):
+        with pytest.raises(ValueError):
+            a_weighting_sos(1000)
+        assert not HopWindowBuffer(1000, 1, weighting=True).weighting
@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtMultimedia import QAudioDevice, QAudioFormat, QMediaDevices
+
+
+def device_key(device: QAudioDevice) -> str:
+    """Stabiler Schlüssel eines Geräts (für Combobox-Daten und QSettings)."""
+    return bytes(device.id().data()).hex()
+
+
+def negotiate_format(device: QAudioDevice, analysis_rate: Optional[int] = None) -> QAudioFormat:
+    """
+    Bevorzugtes Format des Geräts, mit Fallbacks; Float wenn möglich, sonst Int16.
+    Mit `analysis_rate` zuerst Mono/Int16 mit der niedrigsten unterstützten Rate
+    ab diesem Wert (Low-Power), sofern das Gerät das Format annimmt.
+    """
+    if analysis_rate:
+        low = QAudioFormat()
+        low.setSampleRate(min(max(analysis_rate, device.minimumSampleRate()), device.maximumSampleRate()))
+        low.setChannelCount(1)
+        low.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        if device.isFormatSupported(low):
+            return low
+
+    format = device.preferredFormat()
+
+    # Fallback setup if preferred format is invalid
+    if format.sampleRate() <= 0:
+        format.setSampleRate(44100)
+    if format.channelCount() <= 0:
+        format.setChannelCount(1)
+
+    # We prefer Float for simpler processing, but accept Int16
+    if QAudioFormat.SampleFormat.Float not in device.supportedSampleFormats():
+        format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+    else:
+        format.setSampleFormat(QAudioFormat.SampleFormat.Float)
+    return format
+
+
+class AudioDeviceManager(QObject):
+    """
+    Prozessweiter Cache der Audioeingänge und ihrer ausgehandelten Formate.
+
+    Die Geräteliste wird nur bei QMediaDevices.audioInputsChanged neu
+    gelesen; das Format eines Geräts wird einmal ausgehandelt und bleibt
+    gespeichert, solange das Gerät vorhanden ist. Erneutes Öffnen des
+    Lärmmessers kostet so keine Aushandlung mehr.
+    Lebt im GUI-Thread.
+    """
+    inputsChanged = Signal()
+    defaultInputChanged = Signal(object)   # QAudioDevice
+
+    def __init__(self, parent=None,
+                 list_inputs: Optional[Callable[[], List[QAudioDevice]]] = None,
+                 default_input: Optional[Callable[[], QAudioDevice]] = None) -> None:
+        super().__init__(parent)
+        self._list_inputs = list_inputs or QMediaDevices.audioInputs
+        self._default_input = default_input or QMediaDevices.defaultAudioInput
+        self._formats: Dict[Tuple[str, Optional[int]], QAudioFormat] = {}
+        self.negotiations = 0
+        self._media = QMediaDevices(self)
+        self._media.audioInputsChanged.connect(self.refresh)
+        self._read()
+
+    def _read(self) -> None:
+        self._inputs = list(self._list_inputs())
+        self._default = self._default_input()
+
+    def inputs(self) -> List[QAudioDevice]:
+        return list(self._inputs)
+
+    def default_input(self) -> QAudioDevice:
+        return self._default
+
+    def find(self, key: str) -> Optional[QAudioDevice]:
+        for device in self._inputs:
+            if device_key(device) == key:
+                return device
+        return None
+
+    def format_for(self, device: QAudioDevice, analysis_rate: Optional[int] = None) -> QAudioFormat:
+        key = (device_key(device), analysis_rate)
+        fmt = self._formats.get(key)
+        if fmt is None:
+            fmt = negotiate_format(device, analysis_rate)
+            self._formats[key] = fmt
+            self.negotiations += 1
+        return QAudioFormat(fmt)
+
+    def refresh(self) -> None:
+        """Geräteliste neu lesen (Hot-Plug); Formate entfernter Geräte verwerfen."""
+        old_default = device_key(self._default) if not self._default.isNull() else None
+        self._read()
+        present = {device_key(d) for d in self._inputs}
+        if not self._default.isNull():
+            present.add(device_key(self._default))
+        for key in list(self._formats):
+            if key[0] not in present:
+                del self._formats[key]
+        self.inputsChanged.emit()
+        new_default = device_key(self._default) if not self._default.isNull() else None
+        if new_default != old_default:
+            self.defaultInputChanged.emit(self._default)
+
+
+_manager: Optional[AudioDeviceManager] = None
+
+
+def get_device_manager() -> AudioDeviceManager:
+    """Der anwendungsweite Gerätemanager (beim ersten Zugriff angelegt)."""
+    global _manager
+    if _manager is None:
+        _manager = AudioDeviceManager()
+    return _manager
+
+
+def set_device_manager(manager: Optional[AudioDeviceManager]) -> None:
+    """Ersetzt den Gerätemanager (Tests); None = beim nächsten Zugriff neu anlegen."""
+    global _manager
+    _manager = manager
@@ -0,0 +1,137 @@
+from __future__ import annotations
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import QObject
+
+from .audio_processor import AudioProcessor
+
+# Was ein gedrosselter Abonnent pro Intervall bekommt
+KEEP_LATEST = "latest"   # den jüngsten Messwert
+KEEP_MAX = "max"         # den lautesten (z. B. für Grenzwert-Reaktionen)
+KEEP_MODES = (KEEP_LATEST, KEEP_MAX)
+
+# Toleranz für Zeitstempelvergleiche (Rundung beim Aufaddieren der Intervalle)
+_EPS = 1e-6
+
+
+class Subscription:
+    """
+    Ein Abonnent des AudioHub mit eigener Ratenbegrenzung.
+
+    Mit `max_rate_hz` wird höchstens ein Messwert pro 1/max_rate_hz Sekunden
+    ausgeliefert (gemessen an LevelReading.timestamp); dazwischen liegende
+    Werte werden verworfen bzw. bei KEEP_MAX auf den lautesten reduziert.
+    Bewusst ohne Qt.
+    """
+
+    def __init__(self, callback: Callable[[object], None],
+                 max_rate_hz: Optional[float] = None, keep: str = KEEP_LATEST) -> None:
+        if keep not in KEEP_MODES:
+            raise ValueError(f"Unbekannter Modus: {keep!r}")
+        if max_rate_hz is not None and max_rate_hz <= 0:
+            raise ValueError("max_rate_hz muss > 0 sein")
+        self.callback = callback
+        self.keep = keep
+        self.min_interval_s = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self.delivered = 0
+        self._pending = None
+        self._next_due: Optional[float] = None
+
+    def offer(self, reading) -> bool:
+        """Nimmt einen Messwert an; True, wenn dabei etwas ausgeliefert wurde."""
+        if self.min_interval_s <= 0:
+            self.delivered += 1
+            self.callback(reading)
+            return True
+        pending = self._pending
+        if pending is None or self.keep == KEEP_LATEST or reading.level >= pending.level:
+            pending = reading
+        ts = reading.timestamp
+        if self._next_due is not None and ts + _EPS < self._next_due:
+            self._pending = pending
+            return False
+        # Takt halten statt mit jedem Jitter nach hinten zu wandern
+        base = self._next_due
+        if base is None or ts - base >= self.min_interval_s:
+            base = ts
+        self._next_due = base + self.min_interval_s
+        self._pending = None
+        self.delivered += 1
+        self.callback(pending)
+        return True
+
+    def reset(self) -> None:
+        self._pending = None
+        self._next_due = None
+
+
+class AudioHub(QObject):
+    """
+    Prozessweite Audioerfassung für beliebig viele Abnehmer.
+
+    Es gibt genau einen AudioProcessor: Aufnahme und Pegelanalyse laufen
+    einmal pro Block im Audio-Thread, der Hub verteilt nur die fertigen
+    LevelReading-Objekte im GUI-Thread. Weitere Abonnenten kosten so je
+    einen Funktionsaufruf pro Messwert, keine weitere Analyse.
+    Die Erfassung läuft, solange es Abonnenten gibt; danach wird sie
+    pausiert und nach der Leerlaufzeit des Prozessors freigegeben.
+    """
+
+    def __init__(self, parent=None, processor: Optional[AudioProcessor] = None) -> None:
+        super().__init__(parent)
+        # Ohne Qt-Parent: lebt so lange wie der Hub
+        self.processor = processor if processor is not None else AudioProcessor()
+        self.processor.readingUpdated.connect(self._dispatch)
+        self._subscriptions: List[Subscription] = []
+
+    def subscribe(self, callback: Callable[[object], None], max_rate_hz: Optional[float] = None,
+                  keep: str = KEEP_LATEST, owner: Optional[QObject] = None) -> Subscription:
+        """
+        Meldet `callback` für LevelReadings an und startet bei Bedarf die
+        Erfassung. Mit `owner` endet das Abo automatisch, wenn das Objekt
+        zerstört wird.
+        """
+        sub = Subscription(callback, max_rate_hz, keep)
+        self._subscriptions.append(sub)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(sub))
+        if len(self._subscriptions) == 1:
+            self.processor.start()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub not in self._subscriptions:
+            return
+        self._subscriptions.remove(sub)
+        sub.reset()
+        if not self._subscriptions:
+            try:
+                self.processor.suspend()
+            except RuntimeError:
+                # Beim Beenden kann der Prozessor vor dem letzten Abonnenten zerstört sein
+                pass
+
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def _dispatch(self, reading) -> None:
+        # Kopie: Abonnenten dürfen sich im Callback abmelden
+        for sub in tuple(self._subscriptions):
+            sub.offer(reading)
+
+
+_hub: Optional[AudioHub] = None
+
+
+def get_audio_hub() -> AudioHub:
+    """Der anwendungsweite Audio-Hub (beim ersten Zugriff angelegt)."""
+    global _hub
+    if _hub is None:
+        _hub = AudioHub()
+    return _hub
+
+
+def set_audio_hub(hub: Optional[AudioHub]) -> None:
+    """Ersetzt den Audio-Hub (Tests); None = beim nächsten Zugriff neu anlegen."""
+    global _hub
+    _hub = hub
@@ -0,0 +1,325 @@
+from __future__ import annotations
+import array
+import math
+from typing import Callable, Optional
+
+from .weighting import MIN_SAMPLE_RATE, BiquadCascade, a_weighting_sos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy ist optional, es gibt einen reinen Python-Pfad
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Sampleformat (array-Typcode) -> (Vollaussteuerung, Nullpunkt)
+SAMPLE_SCALES = {
+    "f": (1.0, 0.0),
+    "h": (32768.0, 0.0),
+    "i": (2147483648.0, 0.0),
+    "B": (128.0, 128.0),
+}
+
+SAMPLE_SIZES = {code: array.array(code).itemsize for code in SAMPLE_SCALES}
+
+_NP_DTYPES = {"f": "float32", "h": "int16", "i": "int32", "B": "uint8"}
+
+
+# Kanalmischung für mehrkanalige Eingänge
+MIX_MEAN = "mean"
+MIX_MAX = "max"
+MIX_CHANNEL = "channel"
+MIX_MODES = (MIX_MEAN, MIX_MAX, MIX_CHANNEL)
+
+
+class HopWindowBuffer:
+    """
+    Vorab allokierter Ringpuffer für feste Analysefenster.
+
+    Eingehende Puffer beliebiger Länge werden (normiert auf -1..1) in den Ring
+    kopiert; alle `hop` Samples wird über die letzten `window` Samples RMS und
+    Spitze berechnet. Rate und Latenz der Pegel hängen so nur von Fenster und
+    Hop ab, nicht davon, wie groß die Stücke sind, die das Audio-Backend liefert.
+    Kanäle bleiben verschachtelt; Fenster und Hop zählen Frames. Je Kanal
+    stehen die Werte in `channel_rms`/`channel_peak`, gemischt nach `mix`.
+
+    Mit `weighting=True` läuft der Strom zusätzlich durch einen A-Bewertungsfilter
+    (Zustand bleibt über Puffergrenzen erhalten) in einen zweiten Ring; dessen
+    RMS steht in `channel_weighted_rms` bzw. gemischt in `weighted_rms`
+    (unterhalb von MIN_SAMPLE_RATE bleibt die Bewertung aus).
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1,
+                 window_s: float = 0.05, hop_s: float = 0.025,
+                 use_numpy: bool = HAS_NUMPY,
+                 mix: str = MIX_MEAN, mix_channel: int = 0,
+                 weighting: bool = False) -> None:
+        if window_s <= 0 or hop_s <= 0:
+            raise ValueError("window_s und hop_s müssen > 0 sein")
+        self.sample_rate = int(sample_rate)
+        self.channels = max(1, int(channels))
+        self.window_frames = max(1, int(round(window_s * self.sample_rate)))
+        self.hop_frames = max(1, int(round(hop_s * self.sample_rate)))
+        self._use_numpy = use_numpy and np is not None
+
+        self.window = self.window_frames * self.channels   # Samples
+        self.hop = self.hop_frames * self.channels
+        self._ring = self._new_ring()
+        # Werte je Kanal des letzten Fensters (werden wiederverwendet, nicht neu angelegt)
+        self.channel_rms = [0.0] * self.channels
+        self.channel_peak = [0.0] * self.channels
+
+        self._filter: Optional[BiquadCascade] = None
+        self.channel_weighted_rms = [0.0] * self.channels
+        self.weighted_rms = 0.0
+        if weighting and self.sample_rate >= MIN_SAMPLE_RATE:
+            self._filter = BiquadCascade(a_weighting_sos(self.sample_rate), self.channels,
+                                         use_numpy=self._use_numpy)
+            self._wring = self._new_ring()
+            if self._use_numpy:
+                # Normierte Samples eines Stücks, Eingang des Filters
+                self._scratch = np.zeros(max(self.window, self.hop), dtype=np.float64)
+                self._wscratch = np.zeros_like(self._scratch)
+        self.set_mix(mix, mix_channel)
+        self.reset()
+
+    def _new_ring(self):
+        if self._use_numpy:
+            return np.zeros(self.window, dtype=np.float32)
+        return array.array("d", bytes(8 * self.window))
+
+    @property
+    def weighting(self) -> bool:
+        return self._filter is not None
+
+    def set_mix(self, mix: str, channel: int = 0) -> None:
+        """Wie die Kanäle zu einem Pegel werden: MIX_MEAN, MIX_MAX oder MIX_CHANNEL (mit `channel`)."""
+        if mix not in MIX_MODES:
+            raise ValueError(f"Unbekannte Kanalmischung: {mix!r}")
+        self.mix = mix
+        self.mix_channel = max(0, int(channel))
+
+    def latest_window(self):
+        """(Ring, Schreibposition) des letzten Fensters; an der Schreibposition steht das älteste Sample."""
+        return self._ring, self._pos
+
+    @property
+    def frames_written(self) -> int:
+        """Frames seit dem letzten reset() – beim Fensteraufruf: Index hinter dem neuesten Frame."""
+        return self._written // self.channels
+
+    def reset(self) -> None:
+        self._pos = 0
+        self._written = 0
+        self._until_emit = self.window
+        self._pending = b""   # angefangenes Sample vom letzten Puffer
+        if self._filter is not None:
+            self._filter.reset()
+
+    def push(self, buf, code: str, on_window: Callable[[float, float], None]) -> int:
+        """
+        Übernimmt einen Rohpuffer und ruft `on_window(rms, peak)` für jedes
+        fertige Fenster auf. Liefert die Anzahl der Fenster.
+        """
+        full_scale, offset = SAMPLE_SCALES[code]
+        scale = 1.0 / full_scale
+        size = SAMPLE_SIZES[code]
+
+        raw = memoryview(buf).cast("B")
+        emitted = 0
+        if self._pending:
+            # Seltener Fall: Backend hat mitten im Sample geschnitten
+            need = size - len(self._pending)
+            self._pending += bytes(raw[:need])
+            if len(self._pending) == size:
+                # Das ergänzte Sample kann selbst ein Fenster abschließen
+                emitted += self._write(memoryview(self._pending), code, offset, scale, 0, 1, on_window)
+                self._pending = b""
+            raw = raw[need:]
+        count = len(raw) // size
+        tail = len(raw) - count * size
+        if tail:
+            self._pending = bytes(raw[len(raw) - tail:])
+
+        src = raw[: count * size]
+        done = 0
+        while done < count:
+            n = min(count - done, self._until_emit)
+            emitted += self._write(src, code, offset, scale, done, n, on_window)
+            done += n
+        return emitted
+
+    def _write(self, src, code: str, offset: float, scale: float,
+               start: int, n: int, on_window) -> int:
+        """Schreibt n Samples ab `start` (höchstens bis zur nächsten Fenstergrenze)."""
+        ring = self._ring
+        cap = self.window
+        if self._use_numpy:
+            x = np.frombuffer(src, dtype=_NP_DTYPES[code], count=n, offset=start * SAMPLE_SIZES[code])
+            first = min(n, cap - self._pos)
+            if self._filter is None:
+                for dst, part in ((ring[self._pos:self._pos + first], x[:first]),
+                                  (ring[:n - first], x[first:])):
+                    if len(part):
+                        if offset:
+                            np.subtract(part, offset, out=dst, casting="unsafe")
+                            dst *= scale
+                        else:
+                            np.multiply(part, scale, out=dst, casting="unsafe")
+            else:
+                norm = self._scratch[:n]
+                np.subtract(x, offset, out=norm)
+                norm *= scale
+                weighted = self._wscratch[:n]
+                self._filter.process(norm, weighted, self._pos % self.channels)
+                wring = self._wring
+                ring[self._pos:self._pos + first] = norm[:first]
+                ring[:n - first] = norm[first:]
+                wring[self._pos:self._pos + first] = weighted[:first]
+                wring[:n - first] = weighted[first:]
+        else:
+            view = src.cast(code) if isinstance(src, memoryview) and src.format == "B" else src
+            pos = self._pos
+            for i in range(start, start + n):
+                ring[pos] = (view[i] - offset) * scale
+                pos += 1
+                if pos == cap:
+                    pos = 0
+            if self._filter is not None:
+                self._write_weighted_python(n)
+        self._pos = (self._pos + n) % cap
+        self._written += n
+        self._until_emit -= n
+        if self._until_emit > 0:
+            return 0
+
+        self._until_emit = self.hop
+        self._analyze_channels()
+        rms, peak = self._mixed()
+        on_window(rms, peak)
+        return 1
+
+    def _write_weighted_python(self, n: int) -> None:
+        """Fallback ohne NumPy: die eben geschriebenen n Samples des Rings filtern."""
+        cap = self.window
+        start = self._pos
+        idx = [(start + i) % cap for i in range(n)]
+        norm = array.array("d", (self._ring[i] for i in idx))
+        weighted = array.array("d", bytes(8 * n))
+        self._filter.process(norm, weighted, start % self.channels)
+        for i, v in zip(idx, weighted):
+            self._wring[i] = v
+
+    def _analyze_channels(self) -> None:
+        """RMS/Spitze je Kanal über Strided Views auf den Ring – ohne Entschachtelungskopie."""
+        ring = self._ring
+        ch = self.channels
+        frames = self.window_frames
+        rms, peak = self.channel_rms, self.channel_peak
+        if self._use_numpy:
+            for c in range(ch):
+                v = ring[c::ch]
+                rms[c] = math.sqrt(max(0.0, float(np.dot(v, v))) / frames)
+                peak[c] = max(float(v.max()), -float(v.min()))
+        else:
+            view = memoryview(ring)
+            for c in range(ch):
+                v = view[c::ch]
+                rms[c] = math.sqrt(math.fsum(x * x for x in v) / frames)
+                peak[c] = max(max(v), -min(v))
+        if self._filter is not None:
+            self._analyze_weighted()
+
+    def _analyze_weighted(self) -> None:
+        ring = self._wring
+        ch = self.channels
+        frames = self.window_frames
+        wrms = self.channel_weighted_rms
+        if self._use_numpy:
+            for c in range(ch):
+                v = ring[c::ch]
+                wrms[c] = math.sqrt(max(0.0, float(np.dot(v, v))) / frames)
+        else:
+            view = memoryview(ring)
+            for c in range(ch):
+                wrms[c] = math.sqrt(math.fsum(x * x for x in view[c::ch]) / frames)
+        self.weighted_rms = self._mix_rms(wrms)
+
+    def _mixed(self) -> Tuple[float, float]:
+        peak = self.channel_peak
+        if self.mix == MIX_CHANNEL:
+            peak_mixed = peak[min(self.mix_channel, self.channels - 1)]
+        else:
+            peak_mixed = max(peak)
+        return self._mix_rms(self.channel_rms), peak_mixed
+
+    def _mix_rms(self, rms) -> float:
+        if self.mix == MIX_CHANNEL:
+            return rms[min(self.mix_channel, self.channels - 1)]
+        if self.mix == MIX_MAX:
+            return max(rms)
+        # MIX_MEAN: Leistungsmittel = RMS über alle Samples (wie Mono-Downmix der Energie)
+        return math.sqrt(math.fsum(r * r for r in rms) / len(rms))
+
+
+class Decimator:
+    """
+    Anti-Aliasing-Tiefpass und Abwärtstastung um einen ganzzahligen Faktor.
+
+    Ein gefensterter Sinc-FIR (Grenze knapp unter der neuen Nyquist-Frequenz)
+    wird nur an den behaltenen Positionen ausgewertet: eine Strided View auf
+    den Arbeitspuffer, ein Matrixprodukt pro Puffer. Die letzten taps-1 Frames
+    bleiben als Zustand stehen, das Ergebnis hängt daher nicht von der
+    Stückelung ab. Ausgabe: normierte float32-Samples, Kanäle verschachtelt
+    wie am Eingang. Nur mit NumPy.
+    """
+
+    def __init__(self, factor: int, channels: int = 1, taps_per_phase: int = 8) -> None:
+        if np is None:
+            raise RuntimeError("Decimator benötigt NumPy")
+        if factor < 2:
+            raise ValueError("factor muss >= 2 sein")
+        self.factor = int(factor)
+        self.channels = max(1, int(channels))
+        n = self.factor * taps_per_phase + 1
+        k = np.arange(n) - (n - 1) / 2
+        cutoff = 0.45 / self.factor   # relativ zur Eingangsrate, 10 % Übergangsband
+        taps = 2 * cutoff * np.sinc(2 * cutoff * k) * np.blackman(n)
+        self.taps = (taps / taps.sum()).astype(np.float32)
+        # Zeilen 0..taps-2: Verlauf des vorigen Puffers, danach der neue Puffer
+        self._work = np.zeros((n - 1 + 1024, self.channels), dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        self._work[: len(self.taps) - 1] = 0.0
+        self._skip = 0        # Index des nächsten behaltenen Frames im neuen Puffer
+        self._pending = b""   # angefangener Frame vom letzten Puffer
+
+    def process(self, buf, code: str):
+        """Rohpuffer im Format `code` -> dezimierte, normierte Samples (float32, 1-D)."""
+        full_scale, offset = SAMPLE_SCALES[code]
+        frame_bytes = SAMPLE_SIZES[code] * self.channels
+        raw = memoryview(buf).cast("B")
+        if self._pending:
+            # Selten: Backend hat mitten im Frame geschnitten
+            raw = memoryview(self._pending + bytes(raw))
+        frames = len(raw) // frame_bytes
+        tail = len(raw) - frames * frame_bytes
+        self._pending = bytes(raw[len(raw) - tail:]) if tail else b""
+
+        hist = len(self.taps) - 1
+        if hist + frames > len(self._work):
+            work = np.zeros((hist + frames, self.channels), dtype=np.float32)
+            work[:hist] = self._work[:hist]
+            self._work = work
+        x = np.frombuffer(raw, dtype=_NP_DTYPES[code], count=frames * self.channels)
+        new = self._work[hist:hist + frames]
+        np.subtract(x.reshape(frames, self.channels), offset, out=new, casting="unsafe")
+        new *= 1.0 / full_scale
+
+        used = self._work[:hist + frames]
+        windows = np.lib.stride_tricks.sliding_window_view(used, len(self.taps), axis=0)
+        out = windows[self._skip::self.factor] @ self.taps
+        self._skip += len(out) * self.factor - frames
+        self._work[:hist] = used[frames:]
+        return out.reshape(-1)
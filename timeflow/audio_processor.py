@@ -1,120 +1,713 @@
+import logging
 import math
-import array
-import sys
-from PySide6.QtCore import QObject, Signal, QByteArray
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from PySide6.QtCore import (
+    QObject, Signal, Slot, QByteArray, QThread, QMutex, QMutexLocker, QCoreApplication, QTimer,
+    QMetaObject, Qt,
+)
 from PySide6.QtMultimedia import (
     QAudioSource, QAudioFormat, QMediaDevices, QAudioInput,
-    QMediaCaptureSession
+    QMediaCaptureSession, QAudioDevice
 )
 
-class AudioProcessor(QObject):
+from .audio_devices import device_key, get_device_manager, negotiate_format
+from .audio_kernels import HAS_NUMPY, Decimator, HopWindowBuffer, MIX_MEAN, MIX_MODES, SAMPLE_SIZES
+from .audio_profiles import (
+    DEFAULT_PROFILE, PROFILES, AudioProfile, BufferPlan, CaptureClock, LatencyStats, plan_buffers,
+)
+from .audio_sources import SOURCE_ENV_VAR, PcmSource, PcmSourceDevice, parse_source_spec
+from .spectrum import HAS_SPECTRUM, SPECTRUM_FPS, BandSpectrum
+from .weighting import DB_FLOOR, dbfs
+
+logger = logging.getLogger(__name__)
+
+# QAudioFormat-Sampleformat -> Typcode für audio_kernels
+_SAMPLE_CODES = {
+    QAudioFormat.SampleFormat.Float: "f",
+    QAudioFormat.SampleFormat.Int16: "h",
+    QAudioFormat.SampleFormat.Int32: "i",
+    QAudioFormat.SampleFormat.UInt8: "B",
+}
+
+# rms (relativ zur Vollaussteuerung) liegt bei normaler Sprache oft nur bei 0.01 - 0.05
+# Wir nutzen einen Multiplikator der die Sensitivity stärker gewichtet
+LEVEL_GAIN = 150.0
+
+# Feste Analysefenster: Pegelrate = 1 / HOP_S, unabhängig vom Audio-Backend
+# (Standardprofil; andere Profile bringen eigene Werte mit, siehe audio_profiles)
+WINDOW_S = PROFILES[DEFAULT_PROFILE].window_s
+HOP_S = PROFILES[DEFAULT_PROFILE].hop_s
+
+# Pegelskala des Meters: bisheriger linearer Wert oder kalibrierte dB(A) direkt (0..100)
+LEVEL_SCALE_LINEAR = "linear"
+LEVEL_SCALE_DBA = "dba"
+LEVEL_SCALES = (LEVEL_SCALE_LINEAR, LEVEL_SCALE_DBA)
+
+# dB SPL bei 0 dBFS – grober Wert für eingebaute Mikrofone, per Kalibrierung anpassen
+DEFAULT_CALIBRATION_DB = 110.0
+
+# So lange bleiben Thread und Capture-Session nach suspend() warm, dann wird alles freigegeben
+IDLE_RELEASE_S = 30.0
+
+# Höchstens so lange blockiert das Beenden des Audio-Threads die GUI
+THREAD_STOP_TIMEOUT_MS = 2000
+
+
+@dataclass(frozen=True)
+class LevelReading:
+    """Ergebnis einer Pufferanalyse – das Einzige, was den Audio-Thread verlässt."""
+    level: float        # 0..100, inkl. Sensitivity
+    peak: float         # 0..1, relativ zur Vollaussteuerung
+    timestamp: float    # time.monotonic() bei Ende der Analyse
+    analysis_s: float   # Rechenzeit für dieses Fenster
+    channel_rms: Tuple[float, ...] = ()   # RMS je Kanal (0..1)
+    dbfs: float = DB_FLOOR             # ungewichteter RMS in dBFS
+    dba: Optional[float] = None        # A-bewertet, kalibriert (dB SPL); None ohne Bewertung
+    capture_ts: float = 0.0            # geschätzte Aufnahmezeit des neuesten Samples (monotonic)
+
+
+class AudioStats:
+    """Laufende Messwerte: Analysezeit im Worker vs. Zustelllatenz bis zur GUI."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.readings = 0
+        self.analysis_total_s = 0.0
+        self.analysis_max_s = 0.0
+        self.latency_total_s = 0.0
+        self.latency_max_s = 0.0
+        # Aufnahme -> Auslieferung an die GUI (inkl. Pufferung im Backend)
+        self.capture = LatencyStats()
+        # Verworfene Puffer (Format passt nicht oder Fehler in der Analyse)
+        self.buffer_errors = 0
+        self.last_error = ""
+
+    def record(self, reading: LevelReading, received_at: float) -> None:
+        latency = max(0.0, received_at - reading.timestamp)
+        self.readings += 1
+        self.analysis_total_s += reading.analysis_s
+        self.analysis_max_s = max(self.analysis_max_s, reading.analysis_s)
+        self.latency_total_s += latency
+        self.latency_max_s = max(self.latency_max_s, latency)
+        if reading.capture_ts > 0:
+            self.capture.record(received_at - reading.capture_ts)
+
+    def record_error(self, message: str) -> None:
+        self.buffer_errors += 1
+        self.last_error = message
+
+    def mean_analysis_s(self) -> float:
+        return self.analysis_total_s / self.readings if self.readings else 0.0
+
+    def mean_latency_s(self) -> float:
+        return self.latency_total_s / self.readings if self.readings else 0.0
+
+
+class AudioWorker(QObject):
     """
-    Erfasst Audio-Daten vom Mikrofon und berechnet den RMS-Pegel.
+    Lebt im Audio-Thread: besitzt Capture-Session und QAudioSource und
+    rechnet Pegel direkt im readyRead-Handler dieses Threads.
     Nutzt QMediaCaptureSession, um macOS-Berechtigungen zu erzwingen.
+    Mit gesetzter PcmSource (Datei, Testsignal) ersetzt ein PcmSourceDevice
+    das Mikrofon; der Weg über readyRead/_process_data bleibt derselbe.
     """
-    levelUpdated = Signal(float)
+    readingReady = Signal(object)   # LevelReading
+    stopped = Signal()
+    spectrumReady = Signal(object)   # dBFS je Band (spectrum.BANDS)
+    bufferFailed = Signal(str)       # Puffer verworfen, mit Grund
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self) -> None:
+        super().__init__()
+        self.session = None
+        self.audio_input = None
+        self.audio_source = None
+        self.io_device = None
+        self.sensitivity = 1.0
+        self.window_s = WINDOW_S
+        self.hop_s = HOP_S
+        self.mix = MIX_MEAN
+        self.mix_channel = 0
+        # A-Bewertung nur mit NumPy per Default – der reine Python-Filter ist zu langsam
+        self.weighting = HAS_NUMPY
+        self.calibration_db = DEFAULT_CALIBRATION_DB
+        self.level_scale = LEVEL_SCALE_LINEAR
+        self._device: Optional[QAudioDevice] = None
+        self._format: Optional[QAudioFormat] = None
+        self._active = False   # zwischen start() und stop(), auch ohne Gerät
+        self._source: Optional[PcmSource] = None
+        self.realtime = True
+        self._code: Optional[str] = None
+        self.profile: AudioProfile = PROFILES[DEFAULT_PROFILE]
+        self.buffer_plan: Optional[BufferPlan] = None
+        self._poll_timer: Optional[QTimer] = None
+        self._windows: Optional[HopWindowBuffer] = None
+        self._decimator: Optional[Decimator] = None
+        self._capture: Optional[CaptureClock] = None
+        self._t_mark = 0.0
+        # Bandspektrum: 0 = aus, sonst höchstens so viele Spektren pro Sekunde
+        self.spectrum_fps = 0.0
+        self._spectrum: Optional[BandSpectrum] = None
+        self._spectrum_due = 0.0
+
+    def _ensure_session(self) -> None:
+        # Multimedia-Objekte im Worker-Thread anlegen, damit ihre Events hier laufen
+        if self.session is not None:
+            return
         self.session = QMediaCaptureSession(self)
         self.audio_input = QAudioInput(self)
         self.audio_input.setVolume(1.0)
         self.audio_input.setMuted(False)
         self.session.setAudioInput(self.audio_input)
-        
-        self.audio_source = None
-        self.io_device = None
-        self.sensitivity = 1.0
 
+    def _release_session(self) -> None:
+        # Gibt das Mikrofon-Subsystem des Betriebssystems frei
+        if self.session is not None:
+            self.session.setAudioInput(None)
+            self.session.deleteLater()
+            self.session = None
+        if self.audio_input is not None:
+            self.audio_input.deleteLater()
+            self.audio_input = None
+
+    @Slot()
     def start(self):
+        self._active = True
+        self._close_source()
+        if self._source is not None:
+            self._start_pcm_source()
+            return
+        self._ensure_session()
+
         # 1. Device check
-        device = QMediaDevices.defaultAudioInput()
+        device = self._device if self._device is not None else QMediaDevices.defaultAudioInput()
         if not device.isNull():
             self.audio_input.setDevice(device)
         else:
             return
 
-        # 2. Format Negotiation
-        format = device.preferredFormat()
-        
-        # Fallback setup if preferred format is invalid
-        if format.sampleRate() < 0:
-            format.setSampleRate(44100)
-        if format.channelCount() <= 0:
-            format.setChannelCount(1)
-        
-        # We prefer Float for simpler processing, but accept Int16
-        if QAudioFormat.SampleFormat.Float not in device.supportedSampleFormats():
-             format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
-        else:
-             format.setSampleFormat(QAudioFormat.SampleFormat.Float)
+        # 2. Format Negotiation (vom Gerätemanager gecacht mitgegeben, sonst hier)
+        format = self._format if self._format is not None else negotiate_format(device, self.profile.analysis_rate)
 
-        # 3. Source setup
+        self._setup_analysis(format.sampleRate(), format.channelCount(), _SAMPLE_CODES.get(format.sampleFormat()))
+
+        # 3. Source setup: Puffer aus Format und Ziel-Latenz des Profils
+        self.buffer_plan = plan_buffers(format.sampleRate(), format.channelCount(),
+                                        format.bytesPerSample(), self.profile)
         self.audio_source = QAudioSource(device, format, self)
-        self.audio_source.setBufferSize(16384) # 16k buffer is usually enough for responsiveness
-        
+        self.audio_source.setBufferSize(self.buffer_plan.buffer_bytes)
+
         self.io_device = self.audio_source.start()
-        
+
         if self.io_device:
-            self.io_device.readyRead.connect(self._process_data)
+            self._connect_reads()
         else:
             # Fallback for errors
             pass
 
+    def _connect_reads(self):
+        """readyRead direkt oder (Profil mit poll) einmal pro Periode per Timer lesen."""
+        if not self.profile.poll:
+            self.io_device.readyRead.connect(self._process_data)
+            return
+        if self._poll_timer is None:
+            self._poll_timer = QTimer(self)
+            self._poll_timer.timeout.connect(self._process_data)
+        self._poll_timer.start(max(1, int(round(self.buffer_plan.period_s * 1000))))
+
+    def _start_pcm_source(self):
+        source = self._source
+        self._setup_analysis(source.sample_rate, source.channels, source.code)
+        self.buffer_plan = plan_buffers(source.sample_rate, source.channels,
+                                        SAMPLE_SIZES[source.code], self.profile)
+        # Im Echtzeitbetrieb liefert die Quelle im Periodentakt, wie ein Backend
+        interval_ms = max(1, int(round(self.buffer_plan.period_s * 1000)))
+        self.io_device = PcmSourceDevice(source, self.realtime, interval_ms=interval_ms, parent=self)
+        self.io_device.readyRead.connect(self._process_data)
+        self.io_device.start()
+
+    @Slot()
+    def suspend(self):
+        """Erfassung pausieren: Quelle schließen, Session und Thread bleiben für einen schnellen Neustart."""
+        self._active = False
+        self._close_source()
+
+    @Slot()
     def stop(self):
+        """Schließt Quelle und Session und beendet die Event-Loop des Audio-Threads."""
+        self._active = False
+        self._close_source()
+        self._release_session()
+        self.stopped.emit()
+        thread = self.thread()
+        if thread is not QCoreApplication.instance().thread():
+            thread.quit()
+
+    @Slot(object, object)
+    def set_device(self, device: Optional[QAudioDevice], format: Optional[QAudioFormat] = None):
+        self._device, self._format = device, format
+        # Läuft die Erfassung (oder wartet sie auf ein Gerät), sofort umschalten
+        if self._active and self._source is None:
+            self.start()
+
+    @Slot(object, bool)
+    def set_source(self, source: Optional[PcmSource], realtime: bool = True):
+        self._source = source
+        self.realtime = realtime
+        if self.io_device is not None:
+            self.start()
+
+    @Slot(float)
+    def set_sensitivity(self, value: float):
+        self.sensitivity = value
+
+    @Slot(str, object)
+    def set_profile(self, name: str, format: Optional[QAudioFormat] = None):
+        """Profil (ggf. mit passendem Geräteformat) wechseln; Puffergrößen gelten erst mit neuer Quelle, daher Neustart."""
+        self.profile = PROFILES[name]
+        if format is not None:
+            self._format = format
+        self.window_s, self.hop_s = self.profile.window_s, self.profile.hop_s
+        if self.io_device is not None:
+            self.start()
+        elif self._windows is not None:
+            self.configure(self._windows.sample_rate, self._windows.channels)
+
+    def _setup_analysis(self, sample_rate: int, channels: int, code: Optional[str]) -> None:
+        """Analyse für das gelieferte Format; liegt es über analysis_rate des Profils, wird dezimiert."""
+        self._code = code
+        self._decimator = None
+        target = self.profile.analysis_rate
+        factor = sample_rate // target if target and HAS_NUMPY else 1
+        if factor >= 2:
+            self._decimator = Decimator(factor, channels)
+            sample_rate = int(round(sample_rate / factor))
+        self.configure(sample_rate, channels)
+
+    def configure(self, sample_rate: int, channels: int) -> None:
+        """Legt den Ringpuffer für das aktuelle Format an (einmal pro Start, nicht pro Puffer)."""
+        self._windows = HopWindowBuffer(
+            sample_rate, channels, self.window_s, self.hop_s,
+            mix=self.mix, mix_channel=self.mix_channel, weighting=self.weighting,
+        )
+        self._capture = CaptureClock(sample_rate)
+        self._setup_spectrum()
+
+    def _setup_spectrum(self) -> None:
+        # Puffer des Spektrums gehören zum Format, nicht zum Block
+        windows = self._windows
+        if self.spectrum_fps > 0 and HAS_SPECTRUM and windows is not None:
+            self._spectrum = BandSpectrum(windows.sample_rate, windows.window_frames, windows.channels)
+        else:
+            self._spectrum = None
+        self._spectrum_due = 0.0
+
+    @Slot(str, int)
+    def set_channel_mix(self, mix: str, channel: int = 0):
+        self.mix, self.mix_channel = mix, channel
+        if self._windows is not None:
+            self._windows.set_mix(mix, channel)
+
+    @Slot(float, float)
+    def set_analysis_window(self, window_s: float, hop_s: float):
+        self.window_s = window_s
+        self.hop_s = hop_s
+        if self._windows is not None:
+            self.configure(self._windows.sample_rate, self._windows.channels)
+
+    @Slot(bool, float)
+    def set_weighting(self, enabled: bool, calibration_db: float = DEFAULT_CALIBRATION_DB):
+        self.calibration_db = calibration_db
+        if enabled != self.weighting:
+            self.weighting = enabled
+            if self._windows is not None:
+                self.configure(self._windows.sample_rate, self._windows.channels)
+
+    @Slot(str)
+    def set_level_scale(self, scale: str):
+        self.level_scale = scale
+
+    @Slot(float)
+    def set_spectrum(self, fps: float):
+        """Bandspektrum mit höchstens `fps` Bildern pro Sekunde; 0 = aus (Pegelweg unverändert)."""
+        self.spectrum_fps = max(0.0, fps)
+        if (self.spectrum_fps > 0) != (self._spectrum is not None):
+            self._setup_spectrum()
+
+    def _close_source(self):
+        if self._poll_timer is not None:
+            self._poll_timer.stop()
         if self.audio_source:
             self.audio_source.stop()
+            self.audio_source.deleteLater()
             self.audio_source = None
+        if isinstance(self.io_device, PcmSourceDevice):
+            self.io_device.stop()
+            self.io_device.deleteLater()
         self.io_device = None
 
-    def set_sensitivity(self, value: float):
-        self.sensitivity = value
-
     def _process_data(self):
         if not self.io_device:
             return
-            
+
         q_data = self.io_device.readAll()
         if q_data.isEmpty():
             return
 
-        raw_bytes = bytes(q_data.data())
-        
-        fmt = self.audio_source.format()
-        samples = []
-        max_val = 1.0
+        if self._code is not None:
+            self.process_buffer(q_data, self._code)
 
+    def process_buffer(self, data: QByteArray, code: str) -> int:
+        """
+        Schiebt einen Puffer in den Ring und sendet pro fertigem Fenster ein
+        LevelReading (queued) an die GUI. Liefert die Anzahl der Fenster.
+        """
+        if self._windows is None:
+            return 0
+        self._t_mark = time.monotonic()
         try:
-            sample_fmt = fmt.sampleFormat()
-            if sample_fmt == QAudioFormat.SampleFormat.Float:
-                samples = array.array('f', raw_bytes)
-                max_val = 1.0
-            elif sample_fmt == QAudioFormat.SampleFormat.Int16:
-                samples = array.array('h', raw_bytes)
-                max_val = 32768.0
-            elif sample_fmt == QAudioFormat.SampleFormat.Int32:
-                samples = array.array('i', raw_bytes)
-                max_val = 2147483648.0
-            elif sample_fmt == QAudioFormat.SampleFormat.UInt8:
-                raw_ptr = array.array('B', raw_bytes)
-                samples = [float(x) - 128.0 for x in raw_ptr]
-                max_val = 128.0
-        except Exception:
+            if self._decimator is not None:
+                data = self._decimator.process(data, code)
+                code = "f"
+            frame_bytes = SAMPLE_SIZES[code] * self._windows.channels
+            self._capture.on_buffer(self._t_mark, memoryview(data).nbytes // frame_bytes)
+            return self._windows.push(data, code, self._on_window)
+        except (ValueError, TypeError, KeyError) as exc:
+            # Puffer passt nicht zum Format (Typcode, Länge): verwerfen, Erfassung läuft weiter
+            logger.debug("Audiopuffer verworfen: %r", exc)
+            self.bufferFailed.emit(repr(exc))
+        except Exception as exc:
+            # Fehler in der Analyse selbst: sichtbar machen, aber den Audio-Thread nicht beenden
+            logger.exception("Fehler bei der Pegelanalyse")
+            self.bufferFailed.emit(repr(exc))
+        return 0
+
+    def _on_window(self, rms: float, peak: float) -> None:
+        windows = self._windows
+        dba = None
+        if windows.weighting:
+            dba = dbfs(windows.weighted_rms) + self.calibration_db
+        if self.level_scale == LEVEL_SCALE_DBA and dba is not None:
+            # Sensitivity wirkt hier als Kalibrierkorrektur in dB (4.0x = +12 dB)
+            trim = 20.0 * math.log10(self.sensitivity) if self.sensitivity > 0 else DB_FLOOR
+            level = max(0.0, min(100.0, dba + trim))
+        else:
+            level = min(100.0, float(rms * LEVEL_GAIN * self.sensitivity))
+        t1 = time.monotonic()
+        # Rechenzeit seit Pufferanfang bzw. seit dem vorigen Fenster
+        reading = LevelReading(level, min(1.0, peak), t1, t1 - self._t_mark,
+                               tuple(windows.channel_rms), dbfs(rms), dba,
+                               self._capture.capture_time(windows.frames_written))
+        self._t_mark = t1
+        self.readingReady.emit(reading)
+        # Spektrum nur zum nächsten fälligen Bild, nicht pro Fenster
+        spectrum = self._spectrum
+        if spectrum is not None and t1 >= self._spectrum_due:
+            self._spectrum_due = t1 + 1.0 / self.spectrum_fps
+            self.spectrumReady.emit(tuple(spectrum.analyze(*windows.latest_window())))
+
+
+class _AudioThread(QThread):
+    """
+    Audio-Thread samt Worker.
+
+    Hängt an der QCoreApplication statt an der Fassade: so überlebt er eine
+    zerstörte Fassade, bis die Loop beendet ist, und räumt sich danach selbst
+    ab (finished -> deleteLater). Spätestens bei aboutToQuit wird er beendet.
+    """
+
+    def __init__(self, worker: "AudioWorker") -> None:
+        app = QCoreApplication.instance()
+        super().__init__(app)
+        self.setObjectName("TimeFlowAudio")
+        self.worker = worker
+        worker.moveToThread(self)
+        self.finished.connect(worker.deleteLater)
+        self.finished.connect(self.deleteLater)
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def finish(self, timeout_ms: int = THREAD_STOP_TIMEOUT_MS) -> bool:
+        """Wartet begrenzt auf das Ende der Loop; False, wenn sie noch läuft."""
+        if self.wait(timeout_ms):
+            return True
+        # Nicht weiter blockieren: endet die Loop später, räumt finished auf
+        logger.warning("Audio-Thread nach %d ms nicht beendet (Backend hängt?)", timeout_ms)
+        return False
+
+    @Slot()
+    def shutdown(self) -> None:
+        """Worker stoppen (schließt Quelle und Session, beendet die Loop) und begrenzt warten."""
+        if not self.isRunning():
             return
+        QMetaObject.invokeMethod(self.worker, "stop", Qt.QueuedConnection)
+        self.finish()
+
+
+class AudioProcessor(QObject):
+    """
+    GUI-seitige Fassade für den Audio-Thread.
+
+    start/stop/set_device/set_sensitivity dürfen aus jedem Thread kommen; sie
+    werden als queued Signale an den AudioWorker gereicht. Zurück kommen nur
+    kompakte LevelReading-Objekte.
+
+    Thread und Capture-Session entstehen erst mit dem ersten start().
+    suspend() pausiert nur die Erfassung; bleibt es `idle_release_s` lang
+    dabei, folgt stop() und alles wird freigegeben. Die Einstellungen liegen
+    in der Fassade und gehen beim nächsten start() an den neuen Worker.
+    """
+    levelUpdated = Signal(float)
+    readingUpdated = Signal(object)   # LevelReading
+    spectrumUpdated = Signal(object)  # dBFS je Band
+
+    _startRequested = Signal()
+    _suspendRequested = Signal()
+    _stopRequested = Signal()
+    _deviceRequested = Signal(object, object)
+    _sensitivityRequested = Signal(float)
+    _windowRequested = Signal(float, float)
+    _mixRequested = Signal(str, int)
+    _weightingRequested = Signal(bool, float)
+    _scaleRequested = Signal(str)
+    _sourceRequested = Signal(object, bool)
+    _profileRequested = Signal(str, object)
+    _spectrumRequested = Signal(float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sensitivity = 1.0
+        self.profile = DEFAULT_PROFILE
+        self.window_s = WINDOW_S
+        self.hop_s = HOP_S
+        self.mix = MIX_MEAN
+        self.mix_channel = 0
+        self.weighting = HAS_NUMPY
+        self.calibration_db = DEFAULT_CALIBRATION_DB
+        self.level_scale = LEVEL_SCALE_LINEAR
+        self.spectrum_fps = 0.0
+        self.stats = AudioStats()
+        # None = Standardeingang des Systems (folgt dessen Wechseln)
+        self._device: Optional[QAudioDevice] = None
+        self._active_key: Optional[str] = None
+        self._devices = get_device_manager()
+        self._devices.inputsChanged.connect(self._on_inputs_changed)
+        # Ohne Mikrofon (CI, Demo): TIMEFLOW_AUDIO_SOURCE=sine:440 / wav:<pfad>
+        self._source: Optional[PcmSource] = parse_source_spec(os.environ.get(SOURCE_ENV_VAR, ""))
+        self.realtime = True
+        self._lock = QMutex()
+        self._thread: Optional[QThread] = None
+        self._connections = []
+        self._worker: Optional[AudioWorker] = None
+        self._suspended = False
+        self.idle_release_s = IDLE_RELEASE_S
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self.stop)
 
-        if not samples:
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def is_running(self) -> bool:
+        with QMutexLocker(self._lock):
+            return self._thread is not None
+
+    def is_capturing(self) -> bool:
+        """Läuft die Erfassung (Thread vorhanden und nicht pausiert)?"""
+        with QMutexLocker(self._lock):
+            return self._thread is not None and not self._suspended
+
+    def worker(self) -> Optional[AudioWorker]:
+        return self._worker
+
+    def start(self):
+        self._idle_timer.stop()
+        with QMutexLocker(self._lock):
+            if self._thread is not None:
+                # Pausiert: derselbe Worker öffnet nur die Quelle neu
+                resume, self._suspended = self._suspended, False
+            else:
+                resume = True
+                worker = AudioWorker()
+                worker.sensitivity = self.sensitivity
+                worker.profile = PROFILES[self.profile]
+                worker.window_s, worker.hop_s = self.window_s, self.hop_s
+                worker.mix, worker.mix_channel = self.mix, self.mix_channel
+                worker.weighting, worker.calibration_db = self.weighting, self.calibration_db
+                worker.level_scale = self.level_scale
+                worker.spectrum_fps = self.spectrum_fps
+                worker._device, worker._format = self._resolve_device()
+                worker._source, worker.realtime = self._source, self.realtime
+                thread = _AudioThread(worker)
+
+                # Verbindungen merken: stop() trennt sie auch, wenn der Worker schon weg ist
+                self._connections = [
+                    self._startRequested.connect(worker.start),
+                    self._suspendRequested.connect(worker.suspend),
+                    self._stopRequested.connect(worker.stop),
+                    self._deviceRequested.connect(worker.set_device),
+                    self._sensitivityRequested.connect(worker.set_sensitivity),
+                    self._windowRequested.connect(worker.set_analysis_window),
+                    self._mixRequested.connect(worker.set_channel_mix),
+                    self._weightingRequested.connect(worker.set_weighting),
+                    self._scaleRequested.connect(worker.set_level_scale),
+                    self._spectrumRequested.connect(worker.set_spectrum),
+                    self._sourceRequested.connect(worker.set_source),
+                    self._profileRequested.connect(worker.set_profile),
+                ]
+                worker.readingReady.connect(self._on_reading)
+                worker.spectrumReady.connect(self._on_spectrum)
+                worker.bufferFailed.connect(self._on_buffer_failed)
+
+                self._thread, self._worker = thread, worker
+                # Fenster ohne hide() zerstört: Thread trotzdem beenden (ohne self zu binden)
+                self.destroyed.connect(thread.shutdown)
+                thread.start()
+        if resume:
+            self._startRequested.emit()
+
+    def suspend(self):
+        """
+        Erfassung pausieren (z. B. Fenster versteckt). Nach `idle_release_s`
+        ohne erneutes start() werden Session, Eingang und Thread freigegeben.
+        """
+        with QMutexLocker(self._lock):
+            if self._thread is None or self._suspended:
+                return
+            self._suspended = True
+        self._suspendRequested.emit()
+        if self.idle_release_s <= 0:
+            self.stop()
+        else:
+            self._idle_timer.start(int(self.idle_release_s * 1000))
+
+    def set_idle_release(self, seconds: float):
+        """Wartezeit nach suspend() bis zur Freigabe; 0 = sofort freigeben."""
+        if seconds < 0:
+            raise ValueError("seconds muss >= 0 sein")
+        self.idle_release_s = float(seconds)
+        if self._idle_timer.isActive():
+            self._idle_timer.start(int(self.idle_release_s * 1000))
+
+    def stop(self):
+        self._idle_timer.stop()
+        with QMutexLocker(self._lock):
+            thread = self._thread
+            self._thread = self._worker = None
+            self._suspended = False
+        if thread is None:
             return
+        # Worker schließt die Quelle und beendet danach selbst die Thread-Loop
+        self._stopRequested.emit()
+        for connection in self._connections:
+            QObject.disconnect(connection)
+        self._connections = []
+        thread.finish()
 
-        # RMS Calculation
-        try:
-            sum_sq = sum(float(s)**2 for s in samples)
-            rms = math.sqrt(sum_sq / len(samples))
-            
-            # Subtiler Boost und Skalierung
-            # rms / max_val liegt bei normaler Sprache oft nur bei 0.01 - 0.05
-            # Wir nutzen einen Multiplikator der die Sensitivity stärker gewichtet
-            level = (rms / max_val) * 150.0 * self.sensitivity # Mittelweg
-            self.levelUpdated.emit(min(100.0, float(level)))
-        except Exception:
-            pass
+    def set_device(self, device: Optional[QAudioDevice]):
+        """Eingang wählen; None = Systemstandard (wechselt bei Hot-Plug mit)."""
+        self._device = device
+        self._deviceRequested.emit(*self._resolve_device())
+
+    def current_device(self) -> Optional[QAudioDevice]:
+        return self._device
+
+    def _resolve_device(self):
+        """Zu nutzendes Gerät samt gecachtem Format (im GUI-Thread)."""
+        device = self._device if self._device is not None else self._devices.default_input()
+        if device.isNull():
+            self._active_key = None
+            return device, None
+        self._active_key = device_key(device)
+        return device, self._devices.format_for(device, PROFILES[self.profile].analysis_rate)
+
+    def _on_inputs_changed(self):
+        # Gewähltes Gerät abgezogen -> zurück zum Standard
+        if self._device is not None and self._devices.find(device_key(self._device)) is None:
+            self._device = None
+        previous = self._active_key
+        device, format = self._resolve_device()
+        if self._active_key != previous:
+            self._deviceRequested.emit(device, format)
+
+    def set_source(self, source: Optional[PcmSource], realtime: bool = True):
+        """
+        Datei/Testsignal statt Mikrofon (None = wieder Mikrofon). `realtime=False`
+        liefert so schnell wie möglich, z. B. für Durchsatzmessungen.
+        """
+        self._source = source
+        self.realtime = bool(realtime)
+        self._sourceRequested.emit(source, self.realtime)
+
+    def set_sensitivity(self, value: float):
+        self.sensitivity = value
+        self._sensitivityRequested.emit(float(value))
+
+    def set_profile(self, name: str):
+        """
+        "low_latency", "balanced" oder "low_power": Puffergröße/-perioden im
+        Backend und Analysefenster; "low_power" analysiert zudem mit
+        16 kHz (Gerät in Mono/Int16 oder dezimiert; genug für dB(A)). Läuft die
+        Erfassung, startet sie neu.
+        """
+        if name not in PROFILES:
+            raise ValueError(f"Unbekanntes Profil: {name!r}")
+        self.profile = name
+        self.window_s, self.hop_s = PROFILES[name].window_s, PROFILES[name].hop_s
+        # Low-Power fragt das Gerät nach einem anderen Format
+        self._profileRequested.emit(name, self._resolve_device()[1])
+
+    def set_analysis_window(self, window_s: float, hop_s: float):
+        """Fensterlänge und Hop in Sekunden (z. B. 0.05 / 0.025 -> 40 Pegel pro Sekunde)."""
+        if window_s <= 0 or hop_s <= 0:
+            raise ValueError("window_s und hop_s müssen > 0 sein")
+        self.window_s, self.hop_s = window_s, hop_s
+        self._windowRequested.emit(float(window_s), float(hop_s))
+
+    def set_channel_mix(self, mix: str, channel: int = 0):
+        """Kanalmischung für Mehrkanal-Mikrofone: "mean", "max" oder "channel" (mit Kanalindex)."""
+        if mix not in MIX_MODES:
+            raise ValueError(f"Unbekannte Kanalmischung: {mix!r}")
+        self.mix, self.mix_channel = mix, int(channel)
+        self._mixRequested.emit(mix, int(channel))
+
+    def set_weighting(self, enabled: bool, calibration_db: Optional[float] = None):
+        """A-Bewertung an/aus; `calibration_db` ist der Schalldruck (dB SPL) bei 0 dBFS."""
+        if calibration_db is not None:
+            self.calibration_db = float(calibration_db)
+        self.weighting = bool(enabled)
+        self._weightingRequested.emit(self.weighting, self.calibration_db)
+
+    def set_level_scale(self, scale: str):
+        """"linear" (bisheriger Pegel) oder "dba" (Meter zeigt dB(A) direkt, 0..100)."""
+        if scale not in LEVEL_SCALES:
+            raise ValueError(f"Unbekannte Pegelskala: {scale!r}")
+        self.level_scale = scale
+        self._scaleRequested.emit(scale)
+
+    def set_spectrum(self, enabled: bool, fps: float = SPECTRUM_FPS):
+        """
+        Bandspektrum (spectrum.BANDS) an/aus. Es wird im Audio-Thread aus
+        demselben Analysefenster berechnet, höchstens `fps` Mal pro Sekunde,
+        und kommt über spectrumUpdated. Ohne NumPy bleibt es aus.
+        """
+        if enabled and fps <= 0:
+            raise ValueError("fps muss > 0 sein")
+        self.spectrum_fps = float(fps) if enabled and HAS_SPECTRUM else 0.0
+        self._spectrumRequested.emit(self.spectrum_fps)
+
+    def _on_reading(self, reading: LevelReading):
+        self.stats.record(reading, time.monotonic())
+        self.readingUpdated.emit(reading)
+        self.levelUpdated.emit(reading.level)
+
+    def _on_buffer_failed(self, message: str):
+        self.stats.record_error(message)
 
+    def _on_spectrum(self, levels):
+        self.spectrumUpdated.emit(levels)
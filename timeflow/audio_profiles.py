@@ -0,0 +1,131 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Profilnamen (auch als Schlüssel in QSettings)
+PROFILE_LOW_LATENCY = "low_latency"
+PROFILE_BALANCED = "balanced"
+PROFILE_LOW_POWER = "low_power"
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    """
+    Wie viel Latenz für wie wenig Aufwachen getauscht wird.
+
+    `target_latency_s` ist die gewünschte Puffertiefe im Backend, `periods`
+    die Anzahl Teilstücke darin. Bei `poll=True` wird nicht auf jedes
+    readyRead reagiert, sondern einmal pro Periode per Timer gelesen –
+    weniger Wakeups, dafür mehr Latenz.
+
+    `analysis_rate` begrenzt die Abtastrate der Pegelanalyse: das Gerät wird
+    um die niedrigste unterstützte Rate ab diesem Wert in Mono/Int16 gebeten;
+    liefert es trotzdem mehr, wird vor der Analyse dezimiert.
+    """
+    name: str
+    target_latency_s: float
+    periods: int
+    window_s: float
+    hop_s: float
+    poll: bool = False
+    analysis_rate: Optional[int] = None
+
+
+PROFILES: Dict[str, AudioProfile] = {
+    PROFILE_LOW_LATENCY: AudioProfile(PROFILE_LOW_LATENCY, 0.02, 4, 0.05, 0.0125),
+    PROFILE_BALANCED: AudioProfile(PROFILE_BALANCED, 0.08, 4, 0.05, 0.025),
+    PROFILE_LOW_POWER: AudioProfile(PROFILE_LOW_POWER, 0.4, 2, 0.2, 0.1, poll=True, analysis_rate=16000),
+}
+DEFAULT_PROFILE = PROFILE_BALANCED
+
+# Grenzen, unter/über die kein Backend sinnvoll puffert
+MIN_BUFFER_FRAMES = 128
+MAX_BUFFER_S = 1.0
+
+
+@dataclass(frozen=True)
+class BufferPlan:
+    """Ausgehandelte Puffergrößen für ein konkretes Format."""
+    buffer_bytes: int
+    period_bytes: int
+    frame_bytes: int
+    sample_rate: int
+
+    @property
+    def buffer_s(self) -> float:
+        return self.buffer_bytes / self.frame_bytes / self.sample_rate
+
+    @property
+    def period_s(self) -> float:
+        return self.period_bytes / self.frame_bytes / self.sample_rate
+
+
+def plan_buffers(sample_rate: int, channels: int, bytes_per_sample: int,
+                 profile: AudioProfile) -> BufferPlan:
+    """
+    Puffer- und Periodengröße aus Format und Ziel-Latenz: ganze Frames,
+    Puffer = Perioden x Periode, begrenzt auf MIN_BUFFER_FRAMES..MAX_BUFFER_S.
+    """
+    rate = max(1, int(sample_rate))
+    frame_bytes = max(1, int(channels) * int(bytes_per_sample))
+    periods = max(1, int(profile.periods))
+    frames = int(round(profile.target_latency_s * rate))
+    frames = min(max(frames, MIN_BUFFER_FRAMES), int(MAX_BUFFER_S * rate))
+    period_frames = max(1, -(-frames // periods))   # aufrunden
+    return BufferPlan(period_frames * periods * frame_bytes, period_frames * frame_bytes,
+                      frame_bytes, rate)
+
+
+class CaptureClock:
+    """
+    Schätzt, wann ein Sample aufgenommen wurde, aus Pufferzeitstempeln.
+
+    Sample k entsteht bei anchor + k / rate. Der Anker ist das Minimum von
+    (Ankunft - bisherige Frames / rate) über alle Puffer: der Puffer mit der
+    kürzesten Wartezeit im Backend legt die Zeitbasis fest. Daraus folgt die
+    Latenz von der Aufnahme bis zur Auslieferung bzw. bis zum Zeichnen.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self.sample_rate = max(1, int(sample_rate))
+        self.reset()
+
+    def reset(self) -> None:
+        self.frames = 0
+        self._anchor: Optional[float] = None
+
+    def on_buffer(self, arrival: float, frames: int) -> None:
+        """Ein Puffer mit `frames` neuen Frames ist bei `arrival` (monotonic) angekommen."""
+        self.frames += frames
+        anchor = arrival - self.frames / self.sample_rate
+        if self._anchor is None or anchor < self._anchor:
+            self._anchor = anchor
+
+    def capture_time(self, frame_index: int) -> float:
+        """Aufnahmezeitpunkt von Frame `frame_index` (0, solange kein Puffer kam)."""
+        if self._anchor is None:
+            return 0.0
+        return self._anchor + frame_index / self.sample_rate
+
+
+class LatencyStats:
+    """Laufender Mittelwert/Maximum einer Latenz, konstanter Speicher."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_s = 0.0
+
+    def record(self, latency_s: float) -> None:
+        latency_s = max(0.0, latency_s)
+        self.count += 1
+        self.total_s += latency_s
+        self.max_s = max(self.max_s, latency_s)
+        self.last_s = latency_s
+
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
@@ -0,0 +1,278 @@
+from __future__ import annotations
+import abc
+import array
+import math
+import os
+import random
+import struct
+from typing import BinaryIO, Optional
+
+from PySide6.QtCore import QIODevice, QTimer, Signal
+
+from .audio_kernels import SAMPLE_SIZES
+from .clock import get_clock
+
+# Ersatzquelle statt Mikrofon, z. B. "wav:/pfad/datei.wav", "sine:440", "noise", "silence"
+SOURCE_ENV_VAR = "TIMEFLOW_AUDIO_SOURCE"
+
+
+class PcmSource(abc.ABC):
+    """Liefert verschachtelte PCM-Frames; read() gibt b"" am Ende zurück."""
+    sample_rate: int
+    channels: int
+    code: str
+
+    @property
+    def frame_size(self) -> int:
+        return SAMPLE_SIZES[self.code] * self.channels
+
+    @abc.abstractmethod
+    def read(self, frames: int) -> bytes:
+        """Bis zu `frames` Frames; weniger nur am Ende der Quelle."""
+
+    def close(self) -> None:
+        pass
+
+
+# WAV-Formatcodes
+_WAVE_PCM = 1
+_WAVE_FLOAT = 3
+_WAVE_EXTENSIBLE = 0xFFFE
+
+
+class WavFileSource(PcmSource):
+    """
+    Liest PCM aus einer WAV-Datei (8/16/32 Bit Integer, 32 Bit Float).
+    Eigener RIFF-Parser, da das wave-Modul kein Float-WAV kennt.
+    """
+
+    def __init__(self, path: str, loop: bool = False) -> None:
+        self.path = path
+        self.loop = loop
+        self._file: BinaryIO = open(path, "rb")
+        try:
+            self._parse_header()
+        except Exception:
+            self._file.close()
+            raise
+        self._remaining = self._data_size
+
+    def _parse_header(self) -> None:
+        f = self._file
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"Keine WAV-Datei: {self.path}")
+        fmt = None
+        while True:
+            head = f.read(8)
+            if len(head) < 8:
+                raise ValueError(f"WAV ohne data-Chunk: {self.path}")
+            chunk_id, size = struct.unpack("<4sI", head)
+            if chunk_id == b"fmt ":
+                body = f.read(size + (size & 1))
+                tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == _WAVE_EXTENSIBLE and size >= 26:
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV ohne fmt-Chunk: {self.path}")
+                self._data_start = f.tell()
+                self._data_size = size
+                break
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)
+
+        tag, channels, rate, bits = fmt
+        codes = {(_WAVE_PCM, 8): "B", (_WAVE_PCM, 16): "h", (_WAVE_PCM, 32): "i", (_WAVE_FLOAT, 32): "f"}
+        if (tag, bits) not in codes:
+            raise ValueError(f"Nicht unterstütztes WAV-Format (Format {tag}, {bits} Bit)")
+        self.code = codes[(tag, bits)]
+        self.channels = channels
+        self.sample_rate = rate
+
+    def read(self, frames: int) -> bytes:
+        want = frames * self.frame_size
+        parts = []
+        got = 0
+        while got < want:
+            if self._remaining <= 0:
+                if not self.loop or self._data_size < self.frame_size:
+                    break
+                self._file.seek(self._data_start)
+                self._remaining = self._data_size
+            chunk = self._file.read(min(want - got, self._remaining))
+            if not chunk:
+                break
+            self._remaining -= len(chunk)
+            got += len(chunk)
+            parts.append(chunk)
+        # Meist genau ein Stück: ohne weitere Kopie zurück
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def write_wav(path: str, data: bytes, sample_rate: int, channels: int, code: str) -> None:
+    """Schreibt PCM-Bytes im Format `code` als WAV (Gegenstück zu WavFileSource)."""
+    bits = SAMPLE_SIZES[code] * 8
+    tag = _WAVE_FLOAT if code == "f" else _WAVE_PCM
+    block = channels * SAMPLE_SIZES[code]
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sI4s", b"RIFF", 36 + len(data), b"WAVE"))
+        f.write(struct.pack("<4sIHHIIHH", b"fmt ", 16, tag, channels, sample_rate,
+                            sample_rate * block, block, bits))
+        f.write(struct.pack("<4sI", b"data", len(data)))
+        f.write(data)
+
+
+def encode_samples(values, code: str) -> bytes:
+    """Floats (-1..1) in das Sampleformat `code` umwandeln (mit Begrenzung)."""
+    if code == "f":
+        return array.array("f", values).tobytes()
+    if code == "B":
+        return array.array("B", (min(255, max(0, int(round(v * 128.0)) + 128)) for v in values)).tobytes()
+    full = {"h": 32767, "i": 2147483647}[code]
+    return array.array(code, (min(full, max(-full - 1, int(round(v * full)))) for v in values)).tobytes()
+
+
+SIGNAL_KINDS = ("sine", "noise", "silence")
+
+
+class SignalSource(PcmSource):
+    """
+    Erzeugtes Testsignal. Eine Sekunde wird einmal vorab kodiert und danach
+    zyklisch ausgelesen – read() kostet so nur eine Slice, und Durchsatzmessungen
+    messen die Analyse, nicht den Generator.
+    """
+
+    def __init__(self, kind: str = "sine", frequency: float = 440.0, amplitude: float = 0.5,
+                 sample_rate: int = 48000, channels: int = 1, code: str = "f",
+                 duration_s: Optional[float] = None, seed: int = 0) -> None:
+        if kind not in SIGNAL_KINDS:
+            raise ValueError(f"Unbekanntes Testsignal: {kind!r}")
+        self.kind = kind
+        self.sample_rate = int(sample_rate)
+        self.channels = max(1, int(channels))
+        self.code = code
+        self._remaining = None if duration_s is None else int(duration_s * self.sample_rate) * self.frame_size
+
+        n = self.sample_rate
+        if kind == "sine":
+            # ganze Perioden, damit der Zyklus nahtlos ist
+            freq = max(1, round(frequency))
+            values = [amplitude * math.sin(2 * math.pi * freq * i / n) for i in range(n)]
+        elif kind == "noise":
+            rng = random.Random(seed)
+            values = [amplitude * rng.uniform(-1.0, 1.0) for _ in range(n)]
+        else:
+            values = [0.0] * n
+        frames = [v for v in values for _ in range(self.channels)]
+        self._cycle = encode_samples(frames, code)
+        self._pos = 0
+
+    def read(self, frames: int) -> bytes:
+        want = frames * self.frame_size
+        if self._remaining is not None:
+            want = min(want, self._remaining)
+            self._remaining -= want
+        cycle = self._cycle
+        parts = []
+        while want > 0:
+            take = min(want, len(cycle) - self._pos)
+            parts.append(cycle[self._pos:self._pos + take])
+            self._pos = (self._pos + take) % len(cycle)
+            want -= take
+        # Ohne Zyklusübergang nur die eine Slice
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+
+def parse_source_spec(spec: str) -> Optional[PcmSource]:
+    """
+    "wav:<pfad>" (bzw. Pfad auf .wav), "sine[:freq]", "noise", "silence";
+    leer -> None (= Mikrofon).
+    """
+    spec = (spec or "").strip()
+    if not spec:
+        return None
+    kind, _, arg = spec.partition(":")
+    if kind == "wav":
+        return WavFileSource(arg, loop=True)
+    if spec.lower().endswith(".wav"):
+        return WavFileSource(spec, loop=True)
+    if kind == "sine":
+        return SignalSource("sine", frequency=float(arg or 440.0))
+    if kind in SIGNAL_KINDS:
+        return SignalSource(kind)
+    raise ValueError(f"Unbekannte Audioquelle: {spec!r}")
+
+
+class PcmSourceDevice(QIODevice):
+    """
+    QIODevice über einer PcmSource, damit Datei- und Testsignale denselben
+    readyRead/_process_data-Weg nehmen wie das Mikrofon.
+
+    Echtzeitbetrieb liefert im Takt von `interval_ms` so viele Frames, wie
+    laut Uhr (clock.get_clock, also auch beschleunigt/schrittweise) fällig
+    sind; sonst wird so schnell wie möglich in Blöcken von `chunk_frames`
+    geliefert. `finished` kommt, wenn die Quelle leer ist.
+    """
+    finished = Signal()
+
+    def __init__(self, source: PcmSource, realtime: bool = True,
+                 chunk_frames: int = 1024, interval_ms: int = 10, parent=None) -> None:
+        super().__init__(parent)
+        self.source = source
+        self.realtime = realtime
+        self.chunk_frames = max(1, int(chunk_frames))
+        self._buffer = b""
+        self._delivered = 0
+        self._t0 = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms if realtime else 0)
+        self._timer.timeout.connect(self.pump)
+
+    def start(self, autorun: bool = True) -> None:
+        """Öffnet das Gerät; mit `autorun=False` liefert nur pump() (Tests, Benchmarks)."""
+        self.open(QIODevice.ReadOnly)
+        self._delivered = 0
+        self._t0 = get_clock().monotonic()
+        if autorun:
+            self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+        self.close()
+
+    def pump(self) -> int:
+        """Holt die fälligen Frames aus der Quelle und meldet readyRead. Liefert die Bytezahl."""
+        if self.realtime:
+            due = int(round((get_clock().monotonic() - self._t0) * self.source.sample_rate))
+            frames = due - self._delivered
+        else:
+            frames = self.chunk_frames
+        if frames <= 0:
+            return 0
+        data = self.source.read(frames)
+        if not data:
+            self._timer.stop()
+            self.finished.emit()
+            return 0
+        self._delivered += len(data) // self.source.frame_size
+        self._buffer += data
+        self.readyRead.emit()
+        return len(data)
+
+    def isSequential(self) -> bool:
+        return True
+
+    def bytesAvailable(self) -> int:
+        return len(self._buffer) + super().bytesAvailable()
+
+    def readData(self, maxlen: int) -> bytes:
+        data, self._buffer = self._buffer[:maxlen], self._buffer[maxlen:]
+        return data
+
+    def writeData(self, data) -> int:
+        return -1
@@ -0,0 +1,178 @@
+from __future__ import annotations
+import heapq
+import itertools
+import os
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Anwendungsweite Zeitquelle (ohne Qt). TimerEngine, TimerPool und
+# DateTimeWindow lesen die Zeit hier statt direkt aus time/QDateTime, damit
+# lange Abläufe beschleunigt oder schrittweise simuliert werden können.
+
+MODE_REAL = "real"
+MODE_SCALED = "scaled"
+MODE_STEP = "step"
+
+CLOCK_ENV_VAR = "TIMEFLOW_CLOCK"
+CLOCK_CLI_FLAG = "--clock"
+
+
+class _Call:
+    __slots__ = ("due", "fn", "cancelled")
+
+    def __init__(self, due: float, fn: Callable[[], None]) -> None:
+        self.due = due
+        self.fn = fn
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class VirtualClock:
+    """
+    Monotone Uhr mit drei Betriebsarten:
+
+    - real:   Echtzeit (wie time.monotonic)
+    - scaled: Echtzeit mal `rate` (z. B. 60 = eine Minute pro Sekunde)
+    - step:   Zeit steht, bis `advance()` aufgerufen wird. Fällige Callbacks
+              aus `call_later()` laufen dabei in Zeitreihenfolge, jeweils mit
+              der Uhr exakt auf ihrem Fälligkeitszeitpunkt – deterministisch.
+
+    Im step-Modus kann `auto_step` (Sekunden) gesetzt sein; dann schiebt ein
+    Treiber in der Event-Loop die Uhr fortlaufend weiter (Maschinentempo).
+    Aufrufbar wie time.monotonic, passt also direkt als Clock für TimerCore.
+    """
+
+    def __init__(
+        self,
+        mode: str = MODE_REAL,
+        rate: float = 1.0,
+        auto_step: float = 0.0,
+        source: Callable[[], float] = time.monotonic,
+        wall_source: Callable[[], float] = time.time,
+    ) -> None:
+        if mode not in (MODE_REAL, MODE_SCALED, MODE_STEP):
+            raise ValueError(f"Unbekannter Uhr-Modus: {mode!r}")
+        if mode == MODE_SCALED and rate <= 0:
+            raise ValueError("rate muss > 0 sein")
+        self.mode = mode
+        self.rate = float(rate) if mode == MODE_SCALED else 1.0
+        self.auto_step = max(0.0, float(auto_step)) if mode == MODE_STEP else 0.0
+
+        self._source = source
+        self._wall_source = wall_source
+        self._real0 = source()
+        self._now = self._real0
+        self._wall0 = wall_source()
+
+        self._calls: List[Tuple[float, int, _Call]] = []
+        self._seq = itertools.count()
+
+    def __call__(self) -> float:
+        return self.monotonic()
+
+    def is_stepped(self) -> bool:
+        return self.mode == MODE_STEP
+
+    def monotonic(self) -> float:
+        if self.mode == MODE_REAL:
+            return self._source()
+        if self.mode == MODE_SCALED:
+            return self._real0 + (self._source() - self._real0) * self.rate
+        return self._now
+
+    def wall_time(self) -> float:
+        """Virtuelle Unix-Zeit (Sekunden): Startzeitpunkt plus virtuell vergangene Zeit."""
+        if self.mode == MODE_REAL:
+            return self._wall_source()
+        return self._wall0 + (self.monotonic() - self._real0)
+
+    def to_real_seconds(self, virtual_s: float) -> float:
+        """Echtzeit-Verzögerung für eine virtuelle Dauer (nur real/scaled sinnvoll)."""
+        return virtual_s / self.rate
+
+    # --- step-Modus ---
+    def call_later(self, delay_s: float, fn: Callable[[], None]) -> _Call:
+        """Plant fn nach delay_s virtuellen Sekunden ein (nur step-Modus)."""
+        if self.mode != MODE_STEP:
+            raise RuntimeError("call_later ist nur im step-Modus verfügbar")
+        call = _Call(self._now + max(0.0, delay_s), fn)
+        heapq.heappush(self._calls, (call.due, next(self._seq), call))
+        return call
+
+    def next_due(self) -> Optional[float]:
+        while self._calls and self._calls[0][2].cancelled:
+            heapq.heappop(self._calls)
+        return self._calls[0][0] if self._calls else None
+
+    def advance(self, seconds: float) -> int:
+        """Schiebt die Uhr um `seconds` weiter und führt fällige Callbacks aus. Liefert deren Anzahl."""
+        if self.mode != MODE_STEP:
+            raise RuntimeError("advance ist nur im step-Modus verfügbar")
+        target = self._now + max(0.0, float(seconds))
+        fired = 0
+        while True:
+            due = self.next_due()
+            if due is None or due > target:
+                break
+            _, _, call = heapq.heappop(self._calls)
+            self._now = max(self._now, call.due)
+            fired += 1
+            call.fn()
+        self._now = target
+        return fired
+
+
+def parse_clock_spec(spec: str) -> VirtualClock:
+    """
+    Erzeugt eine Uhr aus einer Kurzbeschreibung:
+    "real", "scaled:60" (oder "60x"), "step" bzw. "step:0.5" (Auto-Schritt in Sekunden).
+    """
+    spec = (spec or "").strip().lower()
+    if not spec or spec == MODE_REAL:
+        return VirtualClock()
+    if spec.endswith("x"):
+        return VirtualClock(MODE_SCALED, rate=float(spec[:-1]))
+    mode, _, arg = spec.partition(":")
+    if mode == MODE_SCALED:
+        return VirtualClock(MODE_SCALED, rate=float(arg or 1.0))
+    if mode == MODE_STEP:
+        return VirtualClock(MODE_STEP, auto_step=float(arg or 0.0))
+    raise ValueError(f"Unbekannte Uhr-Angabe: {spec!r}")
+
+
+def clock_spec_from_args(argv: Sequence[str]) -> Optional[str]:
+    """Liest `--clock=<spec>` bzw. `--clock <spec>` aus der Kommandozeile."""
+    for i, arg in enumerate(argv):
+        if arg.startswith(CLOCK_CLI_FLAG + "="):
+            return arg.split("=", 1)[1]
+        if arg == CLOCK_CLI_FLAG and i + 1 < len(argv):
+            return argv[i + 1]
+    return None
+
+
+_clock: Optional[VirtualClock] = None
+
+
+def get_clock() -> VirtualClock:
+    """Die anwendungsweite Uhr (beim ersten Zugriff aus TIMEFLOW_CLOCK)."""
+    global _clock
+    if _clock is None:
+        _clock = parse_clock_spec(os.environ.get(CLOCK_ENV_VAR, ""))
+    return _clock
+
+
+def set_clock(clock: Optional[VirtualClock]) -> None:
+    """Ersetzt die anwendungsweite Uhr (None = beim nächsten Zugriff neu aus der Umgebung)."""
+    global _clock
+    _clock = clock
+
+
+def configure_clock(argv: Sequence[str]) -> VirtualClock:
+    """CLI-Flag hat Vorrang vor der Umgebungsvariable."""
+    spec = clock_spec_from_args(argv)
+    if spec is None:
+        spec = os.environ.get(CLOCK_ENV_VAR, "")
+    set_clock(parse_clock_spec(spec))
+    return get_clock()
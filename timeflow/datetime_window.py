@@ -1,10 +1,12 @@
-from PySide6.QtCore import Qt, QTimer, QDateTime, QLocale, QSize
+from PySide6.QtCore import Qt, QDateTime, QLocale, QSize
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFrame, QSizePolicy
 from PySide6.QtGui import QFont, QGuiApplication, QFontMetrics
 import logging
 
+from .clock import get_clock
 from .i18n import get_strings
 from .styles import PALETTES
+from .virtual_timer import VirtualTimer
 
 logger = logging.getLogger(__name__) 
 
@@ -29,7 +31,8 @@ class DateTimeWindow(QFrame):
         
         # Timer für die Aktualisierung (jede Minute reicht ohne Sekunden, 
         # aber wir bleiben bei 1s für sofortiges Feedback nach Start)
-        self.timer = QTimer(self)
+        # VirtualTimer folgt der anwendungsweiten Uhr (Echtzeit, beschleunigt oder schrittweise)
+        self.timer = VirtualTimer(self)
         self.timer.timeout.connect(self._update_display)
         self.timer.start(1000)
         
@@ -106,7 +109,7 @@ class DateTimeWindow(QFrame):
         return QLocale(self.lang_code)
 
     def _update_display(self):
-        now = QDateTime.currentDateTime()
+        now = QDateTime.fromMSecsSinceEpoch(int(get_clock().wall_time() * 1000))
         locale = self._get_locale()
 
         # Debug-Ausgabe für aktuelle Zeit und Datum
@@ -50,6 +50,18 @@ class Strings:
     noise_meter: str
     sensitivity: str
     limit: str
+    over_limit: str
+    audio_profile: str
+    profile_low_latency: str
+    profile_balanced: str
+    profile_low_power: str
+    latency: str
+    microphone: str
+    default_device: str
+    spectrum: str
+    band_low: str
+    band_speech: str
+    band_high: str
     # Date & Time
     date_time: str
 
@@ -91,6 +103,18 @@ _STRINGS = {
         noise_meter="Noise Meter",
         sensitivity="Sensitivity",
         limit="Limit",
+        over_limit="over limit",
+        audio_profile="Profile",
+        profile_low_latency="Low latency",
+        profile_balanced="Balanced",
+        profile_low_power="Low power",
+        latency="Latency",
+        microphone="Microphone",
+        default_device="Default",
+        spectrum="Spectrum",
+        band_low="Rumble",
+        band_speech="Speech",
+        band_high="High",
         date_time="Date & Time",
     ),
     "de": Strings(
@@ -130,6 +154,18 @@ _STRINGS = {
         noise_meter="Lärmampel",
         sensitivity="Empfindlichkeit",
         limit="Grenzwert",
+        over_limit="über Grenzwert",
+        audio_profile="Profil",
+        profile_low_latency="Geringe Latenz",
+        profile_balanced="Ausgewogen",
+        profile_low_power="Stromsparend",
+        latency="Latenz",
+        microphone="Mikrofon",
+        default_device="Standard",
+        spectrum="Spektrum",
+        band_low="Rumpeln",
+        band_speech="Sprache",
+        band_high="Hoch",
         date_time="Datum & Uhrzeit",
     ),
     "es": Strings(
@@ -169,6 +205,18 @@ _STRINGS = {
         noise_meter="Monitor de ruido",
         sensitivity="Sensibilidad",
         limit="Límite",
+        over_limit="sobre el límite",
+        audio_profile="Perfil",
+        profile_low_latency="Baja latencia",
+        profile_balanced="Equilibrado",
+        profile_low_power="Bajo consumo",
+        latency="Latencia",
+        microphone="Micrófono",
+        default_device="Predeterminado",
+        spectrum="Espectro",
+        band_low="Retumbo",
+        band_speech="Voz",
+        band_high="Agudos",
         date_time="Fecha y hora",
     ),
     "fr": Strings(
@@ -208,6 +256,18 @@ _STRINGS = {
         noise_meter="Moniteur de bruit",
         sensitivity="Sensibilité",
         limit="Limite",
+        over_limit="au-dessus de la limite",
+        audio_profile="Profil",
+        profile_low_latency="Faible latence",
+        profile_balanced="Équilibré",
+        profile_low_power="Économie d'énergie",
+        latency="Latence",
+        microphone="Microphone",
+        default_device="Par défaut",
+        spectrum="Spectre",
+        band_low="Grondement",
+        band_speech="Parole",
+        band_high="Aigus",
         date_time="Date et heure",
     ),
 }
@@ -0,0 +1,100 @@
+from __future__ import annotations
+import array
+from typing import Iterator, Tuple
+
+
+class LevelHistory:
+    """
+    Pegelverlauf der letzten `span_s` Sekunden als Ring fester Größe.
+
+    Pro Spalte (= Pixelspalte der Anzeige) werden nur Minimum und Maximum
+    der hineinfallenden Messwerte gespeichert; bei `hop_s` pro Messwert fasst
+    eine Spalte `samples_per_column` Werte zusammen. Speicher hängt nur von
+    der Spaltenzahl ab, nicht von der Laufzeit. Bewusst ohne Qt.
+    """
+
+    def __init__(self, span_s: float, hop_s: float, columns: int) -> None:
+        self.span_s = float(span_s)
+        self.hop_s = float(hop_s)
+        self._alloc(max(1, int(columns)))
+
+    def _alloc(self, columns: int) -> None:
+        self.capacity = columns
+        self._mins = array.array("f", bytes(4 * columns))
+        self._maxs = array.array("f", bytes(4 * columns))
+        self._head = 0      # nächste Schreibposition
+        self._count = 0     # fertige Spalten im Ring
+        self._update_rate()
+        self._start_column()
+
+    def _update_rate(self) -> None:
+        per_column = self.span_s / self.hop_s / self.capacity if self.hop_s > 0 else 1
+        self.samples_per_column = max(1, int(round(per_column)))
+
+    def _start_column(self) -> None:
+        self._cur_min = float("inf")
+        self._cur_max = float("-inf")
+        self._cur_n = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def set_hop(self, hop_s: float) -> None:
+        self.hop_s = float(hop_s)
+        self._update_rate()
+
+    def clear(self) -> None:
+        self._head = self._count = 0
+        self._start_column()
+
+    def add(self, level: float) -> bool:
+        """Nimmt einen Messwert auf; True, wenn dadurch eine Spalte fertig wurde."""
+        if level < self._cur_min:
+            self._cur_min = level
+        if level > self._cur_max:
+            self._cur_max = level
+        self._cur_n += 1
+        if self._cur_n < self.samples_per_column:
+            return False
+        self._mins[self._head] = self._cur_min
+        self._maxs[self._head] = self._cur_max
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        self._start_column()
+        return True
+
+    def newest(self) -> Tuple[float, float]:
+        i = (self._head - 1) % self.capacity
+        return self._mins[i], self._maxs[i]
+
+    def columns(self) -> Iterator[Tuple[float, float]]:
+        """(min, max) je fertiger Spalte, älteste zuerst."""
+        start = (self._head - self._count) % self.capacity
+        for k in range(self._count):
+            i = (start + k) % self.capacity
+            yield self._mins[i], self._maxs[i]
+
+    def resize(self, columns: int) -> None:
+        """
+        Neue Spaltenzahl (z. B. nach Größenänderung). Vorhandene Spalten werden
+        umverteilt: beim Verkleinern Min/Max zusammengefasst, beim Vergrößern
+        wiederholt – der Verlauf geht nicht verloren.
+        """
+        columns = max(1, int(columns))
+        if columns == self.capacity:
+            return
+        old = list(self.columns())
+        old_capacity = self.capacity
+        self._alloc(columns)
+        if not old:
+            return
+        # Zeitlich gleicher Bereich: Anteil am alten Ring -> Anteil am neuen
+        n = max(1, int(round(len(old) * columns / old_capacity)))
+        for k in range(n):
+            lo = k * len(old) // n
+            hi = max(lo + 1, (k + 1) * len(old) // n)
+            part = old[lo:hi]
+            self._mins[self._head] = min(p[0] for p in part)
+            self._maxs[self._head] = max(p[1] for p in part)
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
@@ -8,8 +8,11 @@ from PySide6.QtWidgets import (
 )
 from .i18n import get_strings
 from .timer_engine import TimerEngine, TimerState
-from .segments_model import SegmentsModel, Segment
-from .utils import format_mmss, clamp, resource_path
+from .segments_model import (
+    SegmentsModel, Segment, SegmentChangeBatcher, CHANGE_DURATIONS, CHANGE_STRUCTURE
+)
+from .utils import clamp, resource_path
+from .view_model import TimerViewModel
 from .views import SegmentsView, TimerView
 from .updater import UpdateWorker
 from .help_window import HelpWindow
@@ -33,8 +36,10 @@ class MainWindow(QWidget):
         self.setObjectName("TimeFlowMain")
 
         self.settings = QSettings("TimeFlow", "TimeFlow")
-        self.engine = TimerEngine()
+        self.engine = TimerEngine(adaptive=True)
         self.segments_model = SegmentsModel()
+        self.view_model = TimerViewModel()
+        self.segment_changes = SegmentChangeBatcher(self.segments_model, self)
         
         self._last_focus_size = QSize(TINY_WIDTH_LIMIT, 450) 
         self.help_window = None 
@@ -229,11 +234,15 @@ class MainWindow(QWidget):
         self.pin_btn.toggled.connect(self.on_pin_toggled)
 
         self.engine.tick.connect(self.on_tick)
-        self.segments_model.dataChanged.connect(lambda *_: self.on_segments_changed())
-        self.segments_model.modelReset.connect(lambda: self.on_segments_changed())
-        self.segments_model.rowsInserted.connect(lambda *_: self.on_segments_changed())
-        self.segments_model.rowsRemoved.connect(lambda *_: self.on_segments_changed())
-        self.segments_model.rowsMoved.connect(lambda *_: self.on_segments_changed())
+        self.engine.segmentEntered.connect(self.on_segment_entered)
+        self.timer_view.pie.progressStepsChanged.connect(self.engine.set_progress_steps)
+        self.timer_view.pie.progressStepsChanged.connect(self.on_progress_steps_changed)
+        # Modelländerungen einer Event-Loop-Runde werden gebündelt verarbeitet
+        self.segment_changes.changed.connect(self.on_segments_changed)
+        # Während des Editierens übersprungene Zeilenauswahl nachholen
+        table = self.segments_view.view
+        table.itemDelegate().closeEditor.connect(self.on_editor_closed)
+        table.itemDelegateForColumn(1).closeEditor.connect(self.on_editor_closed)
 
         # --- Init ---
         self._ensure_localized_defaults(saved_lang)
@@ -242,8 +251,8 @@ class MainWindow(QWidget):
         # Load Stylesheet with Asset Path and Theme
         self.refresh_theme()
 
-        self.on_segments_changed()
-        self.on_tick(self._make_state_for_ui())
+        self.segment_changes.mark(CHANGE_STRUCTURE)
+        self.segment_changes.flush()
         
         if focus_only:
             self.segments_view.setVisible(False)
@@ -278,6 +287,8 @@ class MainWindow(QWidget):
         """Öffnet das Fenster für den Lärmwächter."""
         if self.noise_window is None:
             self.noise_window = NoiseMeterWindow(self, self.current_lang())
+            # Lärmstatistik gilt pro Durchlauf: Reset des Timers setzt sie zurück
+            self.engine.wasReset.connect(self.noise_window.reset_statistics)
             # Initiales Theme setzen
             self.noise_window.refresh_theme(self.is_dark_mode())
         
@@ -474,7 +485,7 @@ class MainWindow(QWidget):
         self.settings.setValue("language", new_lang)
         self._translate_segments_if_defaults(old_lang, new_lang)
         self.apply_language(new_lang, False)
-        self.on_segments_changed()
+        self.segment_changes.flush()
         self.on_tick(self._make_state_for_ui())
 
     def on_mode_changed(self):
@@ -529,7 +540,7 @@ class MainWindow(QWidget):
         row = self.segments_model.rowCount()
         self.segments_model.insertRows(row, 1)
         s = get_strings(self.current_lang())
-        self.segments_model.setData(self.segments_model.index(row, 0), s.new_segment, Qt.EditRole)
+        self.segments_model.setData(self.segments_model.index(row, 0), s.new_segment_default, Qt.EditRole)
         self.segments_view.view.selectRow(row)
 
     def remove_selected_segment(self):
@@ -537,90 +548,89 @@ class MainWindow(QWidget):
         if sel and sel.hasSelection():
             self.segments_model.removeRows(sel.selectedRows()[0].row(), 1)
 
-    def on_segments_changed(self):
-        total_s = self.segments_model.total_seconds()
-        self.engine.set_total_seconds(total_s)
-        self.timer_view.pie.set_segments(self.segments_model.segments())
+    def on_segments_changed(self, flags: int = CHANGE_STRUCTURE):
+        if flags & CHANGE_DURATIONS:
+            # Namen beeinflussen weder Zeitachse noch Kreisgeometrie
+            self.engine.set_timeline(self.segments_model.timeline())
+            self.timer_view.pie.set_segments(self.segments_model.segments())
+        if flags & CHANGE_STRUCTURE:
+            # Model-Reset/removeRows löscht die Tabellenauswahl bei gleichem Zeilenindex
+            self.view_model.invalidate()
+        # Labels anderer Zeilen bleiben unberührt: der View-Model-Diff schreibt nur Geändertes
+        self.on_tick(self._make_state_for_ui())
+
+    def on_editor_closed(self, *_):
         self.on_tick(self._make_state_for_ui())
 
     def on_reset(self):
+        self.segment_changes.flush()
         self.engine.reset()
         self.on_tick(self._make_state_for_ui())
 
     def on_skip_prev(self):
+        self.segment_changes.flush()
         elapsed = self.engine.elapsed_seconds()
-        segs = self.segments_model.segments()
-        t = 0.0
+        timeline = self.segments_model.timeline()
         target = 0.0
-        for i, seg in enumerate(segs):
-            dur = max(0.0, seg.minutes) * 60.0
-            if elapsed < t + dur + 0.1: # Current segment
-                # If more than 2 seconds passed in current segment, go to start of current
-                if (elapsed - t) > 2.0:
-                    target = t
-                elif i > 0:
-                    # Go to previous segment start
-                    prev_dur = max(0.0, segs[i-1].minutes) * 60.0
-                    target = max(0.0, t - prev_dur)
-                else:
-                    target = 0.0
-                break
-            t += dur
+        i = timeline.first_ending_after(elapsed - 0.1) # Current segment
+        if i < len(timeline):
+            t = timeline.start_of(i)
+            # If more than 2 seconds passed in current segment, go to start of current
+            if (elapsed - t) > 2.0:
+                target = t
+            elif i > 0:
+                # Go to previous segment start
+                target = timeline.start_of(i - 1)
         self.engine.seek(target)
 
     def on_skip_next(self):
+        # Target is the start of the next segment
+        self.segment_changes.flush()
         elapsed = self.engine.elapsed_seconds()
-        segs = self.segments_model.segments()
-        t = 0.0
-        target = self.segments_model.total_seconds()
-        for i, seg in enumerate(segs):
-            dur = max(0.0, seg.minutes) * 60.0
-            if elapsed < t + dur - 0.1:
-                # Target is the start of the next segment
-                target = t + dur
-                break
-            t += dur
-        self.engine.seek(target)
+        self.engine.seek(self.segments_model.timeline().next_start(elapsed + 0.1))
 
     def _make_state_for_ui(self):
         return TimerState(False, self.engine.elapsed_seconds(), self.segments_model.total_seconds())
 
     def on_tick(self, state):
-        total = max(0.0, state.total_s)
-        elapsed = max(0.0, state.elapsed_s)
-        if total > 0: elapsed = min(elapsed, total)
-        
-        progress = (elapsed / total) if total > 0 else 0.0
-        self.timer_view.pie.set_progress(progress)
+        frame = self.view_model.build(
+            state.elapsed_s, state.total_s, self.current_mode(),
+            get_strings(self.current_lang()), self.segments_model.timeline(),
+            lambda row: self.segments_model.segment(row).name,
+        )
+        changed = self.view_model.update(frame)
+        if changed:
+            self._apply_frame(frame, changed)
+
+    def on_segment_entered(self, index: int):
+        # Labels folgen dem Frame-Diff; die Tabellenauswahl wird an jeder
+        # Segmentgrenze neu gesetzt, auch wenn inzwischen eine andere Zeile markiert ist
+        self.view_model.invalidate("selected_row")
+        self.on_tick(self._make_state_for_ui())
 
-        s = get_strings(self.current_lang())
-        mode = self.current_mode()
-        
-        text_time = format_mmss(max(0.0, total - elapsed) if mode == "countdown" else elapsed)
-        text_caption = s.time_remaining if mode == "countdown" else s.time_elapsed
-        
-        segs = self.segments_model.segments()
-        current_idx = -1
-        t = 0.0
-        
-        for i, seg in enumerate(segs):
-            dur = max(0.0, seg.minutes) * 60.0
-            if elapsed < t + dur or i == len(segs) - 1:
-                current_idx = i
-                break
-            t += dur
-        
-        text_current = ""
-        text_next = ""
-        if 0 <= current_idx < len(segs):
-            text_current = f"{s.current_segment} {segs[current_idx].name}"
-            if current_idx + 1 < len(segs):
-                text_next = f"{s.next_segment} {segs[current_idx+1].name}"
-            else:
-                text_next = ""
-            
-            if not self.segments_view.view.state() == QAbstractItemView.EditingState:
-                with QSignalBlocker(self.segments_view.view.selectionModel()):
-                    self.segments_view.view.selectRow(current_idx)
+    def on_progress_steps_changed(self, steps: int):
+        self.view_model.set_progress_steps(steps)
+        self.on_tick(self._make_state_for_ui())
 
-        self.timer_view.update_display(text_time, text_caption, text_current, text_next)
\ No newline at end of file
+    def _apply_frame(self, frame, changed):
+        # Nur geänderte Felder an die Widgets geben: jedes setText auf dem
+        # großen TimeLabel kostet ein Relayout
+        tv = self.timer_view
+        if "progress_step" in changed or "progress_steps" in changed:
+            tv.pie.set_progress_step(frame.progress_step, frame.progress_steps)
+        if "time_text" in changed:
+            tv.set_time_text(frame.time_text)
+        if "caption" in changed:
+            tv.set_caption(frame.caption)
+        if "current_text" in changed:
+            tv.set_current_segment(frame.current_text)
+        if "next_text" in changed:
+            tv.set_next_segment(frame.next_text)
+        if "selected_row" in changed and frame.selected_row >= 0:
+            view = self.segments_view.view
+            if view.state() == QAbstractItemView.EditingState:
+                # Nach dem Schließen des Editors erneut versuchen
+                self.view_model.invalidate("selected_row")
+            else:
+                with QSignalBlocker(view.selectionModel()):
+                    view.selectRow(frame.selected_row)
\ No newline at end of file
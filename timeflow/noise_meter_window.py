@@ -1,42 +1,111 @@
-from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize
+import bisect
+import math
+import time
+from PySide6.QtCore import Qt, Signal, QRect, QPoint, QSize, QEvent
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QSlider, QFrame, QSizePolicy, QMessageBox
+    QSlider, QFrame, QSizePolicy, QMessageBox, QComboBox, QCheckBox
 )
-from PySide6.QtGui import QPainter, QColor, QLinearGradient, QFont, QPen
+from PySide6.QtGui import QPainter, QColor, QLinearGradient, QFont, QPen, QPixmap
 
-from .audio_processor import AudioProcessor
+from .audio_devices import device_key, get_device_manager
+from .audio_hub import get_audio_hub
+from .audio_profiles import (
+    DEFAULT_PROFILE, PROFILES, PROFILE_BALANCED, PROFILE_LOW_LATENCY, PROFILE_LOW_POWER, LatencyStats,
+)
 from .i18n import get_strings
+from .level_history import LevelHistory
+from .noise_stats import NoiseStatsAccumulator
 from .styles import get_meter_bg_color
 from .noise_presets_manager import NoisePresetsManager
 from .presets_dialog import SavePresetDialog, ManagePresetsDialog
+from .spectrum import BANDS, HAS_SPECTRUM
+from .utils import format_mmss
+
+def level_color(level: float, threshold: float) -> QColor:
+    """Ampelfarbe eines Pegels relativ zum Grenzwert."""
+    if level >= threshold:
+        return QColor("#FF3B30") # Rot
+    if level >= threshold * 0.7:
+        return QColor("#FFCC00") # Gelb
+    return QColor("#34C759") # Grün
 
 class LevelMeterWidget(QWidget):
     """
     Ein Custom Widget das einen LED-Balken visualisiert.
     """
+    NUM_SEGMENTS = 25 # Etwas weniger Segmente für "blockigeren" Style
+    PADDING = 6
+    SEG_GAP = 4
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(100)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         self._level = 0.0
         self._threshold = 70.0
+        # Pegel, ab dem LED i leuchtet
+        n = self.NUM_SEGMENTS
+        self._seg_levels = [(i / n) * 100 for i in range(n)]
+        self._lit = self.lit_segments(self._level)
+        self._db_text = ""
+        # Aufnahme -> sichtbare Änderung (gemessen im paintEvent)
+        self.paint_latency = LatencyStats()
+        self._pending_capture_ts = 0.0
 
-    def set_level(self, level: float):
+    def lit_segments(self, level: float) -> int:
+        """Anzahl leuchtender LEDs – nur deren Änderung ist sichtbar."""
+        return bisect.bisect_right(self._seg_levels, level)
+
+    def set_level(self, level: float, capture_ts: float = 0.0):
+        """`capture_ts`: Aufnahmezeit (monotonic) der Messung, für die Latenzmessung."""
         self._level = level
-        self.update()
+        lit = self.lit_segments(level)
+        if lit == self._lit:
+            return
+        lo, hi = sorted((self._lit, lit))
+        self._lit = lit
+        if capture_ts > 0 and not self._pending_capture_ts:
+            self._pending_capture_ts = capture_ts
+        # Nur die LEDs zwischen altem und neuem Stand neu zeichnen
+        self.update(self._segments_rect(lo, hi))
+
+    def set_db(self, db):
+        """Zeigt einen dB(A)-Wert rechts im Balken; None blendet ihn aus."""
+        text = "" if db is None else f"{db:.0f} dB(A)"
+        if text == self._db_text:
+            return
+        self._db_text = text
+        self.update(self._db_rect())
+
+    def _db_rect(self) -> QRect:
+        p = self.PADDING + self.SEG_GAP
+        return QRect(self.width() - p - 90, p, 90, self.height() - 2 * p)
+
+    def _segment_width(self) -> float:
+        n = self.NUM_SEGMENTS
+        return (self.width() - 2*self.PADDING - (n + 1) * self.SEG_GAP) / n
+
+    def _segments_rect(self, first: int, end: int) -> QRect:
+        seg_w = self._segment_width()
+        x0 = self.PADDING + self.SEG_GAP + first * (seg_w + self.SEG_GAP)
+        x1 = self.PADDING + self.SEG_GAP + end * (seg_w + self.SEG_GAP) - self.SEG_GAP
+        return QRect(int(math.floor(x0)) - 1, 0, int(math.ceil(x1 - x0)) + 2, self.height())
 
     def set_threshold(self, threshold: float):
         self._threshold = threshold
         self.update()
 
     def paintEvent(self, event):
+        if self._pending_capture_ts:
+            self.paint_latency.record(time.monotonic() - self._pending_capture_ts)
+            self._pending_capture_ts = 0.0
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
         w = self.width()
         h = self.height()
-        padding = 6
+        padding = self.PADDING
         
         # Hintergrund mit subtilem Glass-Effekt - Theme-aware
         bg_rect = QRect(padding, padding, w - 2*padding, h - 2*padding)
@@ -46,22 +115,16 @@ class LevelMeterWidget(QWidget):
         painter.drawRoundedRect(bg_rect, 16, 16)
 
         # Segmente zeichnen
-        num_segments = 25 # Etwas weniger Segmente für "blockigeren" Style
-        seg_gap = 4
-        seg_w = (w - 2*padding - (num_segments + 1) * seg_gap) / num_segments
+        num_segments = self.NUM_SEGMENTS
+        seg_gap = self.SEG_GAP
+        seg_w = self._segment_width()
         seg_h = h - 2*padding - 16
         
         for i in range(num_segments):
-            seg_level = (i / num_segments) * 100
+            seg_level = self._seg_levels[i]
             
-            # Farbe bestimmen
-            if seg_level >= self._threshold:
-                color = QColor("#FF3B30") # Rot
-            elif seg_level >= self._threshold * 0.7:
-                color = QColor("#FFCC00") # Gelb
-            else:
-                color = QColor("#34C759") # Grün
-                
+            color = level_color(seg_level, self._threshold)
+
             # Aktiv?
             if seg_level > self._level:
                 color.setAlpha(40) # Transparenter statt nur heller
@@ -77,6 +140,164 @@ class LevelMeterWidget(QWidget):
         painter.setPen(QPen(QColor("#5856D6"), 3, Qt.DashLine))
         painter.drawLine(tx, padding - 2, tx, h - padding + 2)
 
+        if self._db_text:
+            font = QFont(self.font())
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(self.palette().windowText().color())
+            painter.drawText(self._db_rect().adjusted(0, 0, -6, 0),
+                             Qt.AlignRight | Qt.AlignVCenter, self._db_text)
+
+class NoiseHistoryWidget(QWidget):
+    """
+    Verlauf der letzten Minuten als Streifen unter dem Meter.
+
+    Die Spalten liegen in einem gecachten Pixmap in Gerätepixeln (eine
+    Verlaufsspalte = ein Gerätepixel, scharf auch bei HiDPI). Ist eine neue
+    Spalte fertig, wird das Pixmap um ein Gerätepixel nach links verschoben
+    und nur die neue Spalte gezeichnet; komplett neu gezeichnet wird nur bei
+    Größen-, DPI-, Grenzwert- oder Theme-Wechsel.
+    """
+    HISTORY_S = 5 * 60
+
+    def __init__(self, hop_s: float = 0.025, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(48)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._threshold = 70.0
+        self.history = LevelHistory(self.HISTORY_S, hop_s, max(1, self.width()))
+        self._pixmap = None
+        self._column_paints = 0   # gezeichnete Einzelspalten (für Tests/Profiling)
+        self._rebuilds = 0
+
+    def set_hop(self, hop_s: float):
+        self.history.set_hop(hop_s)
+
+    def set_threshold(self, threshold: float):
+        if threshold == self._threshold:
+            return
+        self._threshold = threshold
+        self._pixmap = None
+        self.update()
+
+    def add_level(self, level: float):
+        if not self.history.add(level):
+            return
+        pm = self._pixmap
+        if pm is None or pm.size() != self._device_size():
+            self.update()   # paintEvent baut neu auf
+            return
+        # scroll() und rect() arbeiten in Gerätepixeln
+        pm.scroll(-1, 0, pm.rect())
+        painter = self._device_painter(pm)
+        self._paint_column(painter, pm.width() - 1, *self.history.newest())
+        painter.end()
+        self._column_paints += 1
+        self.update()
+
+    def _device_size(self) -> QSize:
+        dpr = self.devicePixelRatioF()
+        return QSize(max(1, math.ceil(self.width() * dpr)), max(1, math.ceil(self.height() * dpr)))
+
+    @staticmethod
+    def _device_painter(pm: QPixmap) -> QPainter:
+        """Painter in Gerätepixeln: hebt die Skalierung des Pixmaps wieder auf."""
+        painter = QPainter(pm)
+        dpr = pm.devicePixelRatio()
+        painter.scale(1.0 / dpr, 1.0 / dpr)
+        return painter
+
+    def _paint_column(self, painter: QPainter, x: int, lo: float, hi: float):
+        h = painter.device().height()
+        painter.setPen(self._bg_color)
+        painter.drawLine(x, 0, x, h - 1)
+        painter.setPen(level_color(hi, self._threshold))
+        y_hi = int(round(h - 1 - max(0.0, min(100.0, hi)) / 100 * (h - 1)))
+        y_lo = int(round(h - 1 - max(0.0, min(100.0, lo)) / 100 * (h - 1)))
+        painter.drawLine(x, y_lo, x, y_hi)
+
+    def _rebuild(self):
+        is_dark = self.palette().window().color().lightness() < 128
+        self._bg_color = get_meter_bg_color(is_dark)
+        size = self._device_size()
+        self.history.resize(size.width())
+        pm = QPixmap(size)
+        pm.setDevicePixelRatio(self.devicePixelRatioF())
+        pm.fill(self._bg_color)
+        painter = self._device_painter(pm)
+        x = pm.width() - len(self.history)
+        for lo, hi in self.history.columns():
+            self._paint_column(painter, x, lo, hi)
+            x += 1
+        painter.end()
+        self._pixmap = pm
+        self._rebuilds += 1
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._pixmap = None
+            self.update()
+
+    def paintEvent(self, event):
+        if self._pixmap is None or self._pixmap.size() != self._device_size():
+            self._rebuild()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._pixmap)
+        # Grenzwert-Linie wie im Meter
+        ty = int(round(self.height() - 1 - self._threshold / 100 * (self.height() - 1)))
+        painter.setPen(QPen(QColor("#5856D6"), 2, Qt.DashLine))
+        painter.drawLine(0, ty, self.width(), ty)
+
+class SpectrumWidget(QWidget):
+    """
+    Energie je Band (Rumpeln, Sprache, hoch) als waagerechte Balken.
+
+    Die Werte kommen bereits gedrosselt aus dem Audio-Thread (siehe
+    AudioProcessor.set_spectrum); neu gezeichnet wird nur bei Änderung.
+    """
+    FLOOR_DB = -80.0
+    BAR_COLORS = ("#5856D6", "#34C759", "#FF9500")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(22 * len(BANDS))
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self._names = [name for name, _, _ in BANDS]
+        self._levels = [self.FLOOR_DB] * len(BANDS)
+        self._updates = 0   # angeforderte Neuzeichnungen (für Tests)
+
+    def set_band_names(self, names):
+        self._names = list(names)
+        self.update()
+
+    def set_levels(self, levels):
+        levels = [max(self.FLOOR_DB, min(0.0, float(v))) for v in levels]
+        if levels == self._levels:
+            return
+        self._levels = levels
+        self._updates += 1
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        is_dark = self.palette().window().color().lightness() < 128
+        row_h = self.height() // max(1, len(self._levels))
+        label_w = 90
+        bar_w = max(1, self.width() - label_w - 8)
+        for i, level in enumerate(self._levels):
+            y = i * row_h
+            painter.setPen(self.palette().windowText().color())
+            painter.drawText(QRect(0, y, label_w - 6, row_h), Qt.AlignRight | Qt.AlignVCenter, self._names[i])
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(get_meter_bg_color(is_dark))
+            painter.drawRoundedRect(label_w, y + 3, bar_w, row_h - 6, 4, 4)
+            fill = int(round((level - self.FLOOR_DB) / -self.FLOOR_DB * bar_w))
+            if fill > 0:
+                painter.setBrush(QColor(self.BAR_COLORS[i % len(self.BAR_COLORS)]))
+                painter.drawRoundedRect(label_w, y + 3, fill, row_h - 6, 4, 4)
+
 class NoiseMeterWindow(QFrame):
     """
     Hauptfenster für den Lärmwächter.
@@ -89,8 +310,15 @@ class NoiseMeterWindow(QFrame):
         
         self.lang_code = lang_code
         self.presets_manager = NoisePresetsManager()
-        self.processor = AudioProcessor(self)
-        self.processor.levelUpdated.connect(self._on_level_updated)
+        # Gemeinsame Erfassung aller Abnehmer; das Fenster stellt sie ein und abonniert beim Anzeigen
+        self.hub = get_audio_hub()
+        self.processor = self.hub.processor
+        self.processor.spectrumUpdated.connect(self._on_spectrum_updated)
+        self._subscription = None
+        self.stats = NoiseStatsAccumulator()
+        self._last_reading = None
+        self._stats_unit = "dBFS"
+        self._stats_shown_s = -1
         
         self._setup_ui()
         self._load_last_settings()
@@ -129,6 +357,18 @@ class NoiseMeterWindow(QFrame):
         self.meter = LevelMeterWidget()
         root.addWidget(self.meter)
 
+        # Verlauf der letzten Minuten
+        self.history = NoiseHistoryWidget(self.processor.hop_s)
+
+        # Bandspektrum (optional, nur mit NumPy)
+        self.spectrum = SpectrumWidget()
+        self.spectrum.setVisible(False)
+
+        # Statistik seit dem letzten Reset (Leq, Max, L10/L90, Zeit über Grenzwert)
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("font-size: 13px; font-weight: 600;")
+        self.stats_label.setAlignment(Qt.AlignCenter)
+
         # Settings
         settings = QVBoxLayout()
         # Weniger Abstand zwischen Sensitivity und Limit, damit die Slider "nebensächlich" wirken
@@ -162,8 +402,42 @@ class NoiseMeterWindow(QFrame):
         limit_row.addWidget(self.limit_slider)
         settings.addLayout(limit_row)
 
+        # Mikrofon (Standard folgt dem System, auch bei Hot-Plug)
+        device_row = QHBoxLayout()
+        self.device_label = QLabel("Microphone")
+        self.device_label.setStyleSheet("font-size: 16px; font-weight: 600; min-width: 80px;")
+        self.device_combo = QComboBox()
+        self.device_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.device_combo.currentIndexChanged.connect(self._on_device_changed)
+        get_device_manager().inputsChanged.connect(self._populate_devices)
+        device_row.addWidget(self.device_label)
+        device_row.addWidget(self.device_combo)
+        device_row.addStretch()
+        settings.addLayout(device_row)
+
+        # Latenz/Stromverbrauch
+        profile_row = QHBoxLayout()
+        self.profile_label = QLabel("Profile")
+        self.profile_label.setStyleSheet("font-size: 16px; font-weight: 600; min-width: 80px;")
+        self.profile_combo = QComboBox()
+        self.profile_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        for name in (PROFILE_LOW_LATENCY, PROFILE_BALANCED, PROFILE_LOW_POWER):
+            self.profile_combo.addItem(name, name)
+        self.profile_combo.currentIndexChanged.connect(self._on_profile_changed)
+        profile_row.addWidget(self.profile_label)
+        profile_row.addWidget(self.profile_combo)
+        profile_row.addStretch()
+        self.spectrum_check = QCheckBox("Spectrum")
+        self.spectrum_check.setEnabled(HAS_SPECTRUM)
+        self.spectrum_check.toggled.connect(self._on_spectrum_toggled)
+        profile_row.addWidget(self.spectrum_check)
+        settings.addLayout(profile_row)
+
         # Gebe dem Meter mehr vertikalen Platz (größere Stretch-Relation)
         root.addWidget(self.meter, 3)
+        root.addWidget(self.history)
+        root.addWidget(self.spectrum)
+        root.addWidget(self.stats_label)
         root.addLayout(settings, 1)
 
     def retranslate(self, lang_code: str):
@@ -172,7 +446,20 @@ class NoiseMeterWindow(QFrame):
         self.title_label.setText(f"🚦 {s.noise_meter}")
         self.sens_label.setText(s.sensitivity)
         self.limit_label.setText(s.limit)
+        self.profile_label.setText(s.audio_profile)
+        self.device_label.setText(s.microphone)
+        self.spectrum_check.setText(s.spectrum)
+        self.spectrum.set_band_names([s.band_low, s.band_speech, s.band_high])
+        self._populate_devices()
+        names = {
+            PROFILE_LOW_LATENCY: s.profile_low_latency,
+            PROFILE_BALANCED: s.profile_balanced,
+            PROFILE_LOW_POWER: s.profile_low_power,
+        }
+        for i in range(self.profile_combo.count()):
+            self.profile_combo.setItemText(i, names[self.profile_combo.itemData(i)])
         self.setWindowTitle(s.noise_meter)
+        self._refresh_stats()
 
     def refresh_theme(self, is_dark: bool):
         """Aktualisiert die Styles des Fensters bei Theme-Wechsel."""
@@ -180,8 +467,73 @@ class NoiseMeterWindow(QFrame):
         # das meiste regeln, aber wir können hier spezifische Anpassungen machen.
         self.update() # Triggert Neurechnen des LevelMeterWidget backgrounds
 
+    def _on_reading_updated(self, reading):
+        self._last_reading = reading
+        self.meter.set_db(reading.dba)
+        self._stats_unit = "dBFS" if reading.dba is None else "dB(A)"
+        db = reading.dbfs if reading.dba is None else reading.dba
+        self.stats.add(db, self.processor.hop_s, reading.level >= self.limit_slider.value())
+        # Perzentile kosten einen Histogrammdurchlauf: Text nur einmal pro Sekunde erneuern
+        if int(self.stats.duration_s) != self._stats_shown_s:
+            self._refresh_stats()
+
+    def _populate_devices(self):
+        """Combobox aus dem Gerätecache füllen, Auswahl beibehalten."""
+        manager = get_device_manager()
+        s = get_strings(self.lang_code)
+        current = self.processor.current_device()
+        current_key = device_key(current) if current is not None else ""
+        default = manager.default_input()
+        default_text = s.default_device
+        if not default.isNull():
+            default_text += f" ({default.description()})"
+
+        self.device_combo.blockSignals(True)
+        self.device_combo.clear()
+        self.device_combo.addItem(default_text, "")
+        for device in manager.inputs():
+            self.device_combo.addItem(device.description(), device_key(device))
+        self.device_combo.setCurrentIndex(max(0, self.device_combo.findData(current_key)))
+        self.device_combo.blockSignals(False)
+
+    def _on_device_changed(self, index: int):
+        key = self.device_combo.itemData(index) or ""
+        self.processor.set_device(get_device_manager().find(key) if key else None)
+        self.presets_manager.save_device(key)
+
+    def _on_profile_changed(self, index: int):
+        name = self.profile_combo.itemData(index)
+        if name is None or name == self.processor.profile:
+            return
+        self.processor.set_profile(name)
+        self.history.set_hop(self.processor.hop_s)
+        self.presets_manager.save_profile(name)
+
+    def reset_statistics(self):
+        self.stats.reset()
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        stats = self.stats
+        self._stats_shown_s = int(stats.duration_s)
+        if stats.readings == 0:
+            self.stats_label.setText("")
+            return
+        s = get_strings(self.lang_code)
+        latency = self.meter.paint_latency
+        if latency.count:
+            self.meter.setToolTip(f"{s.latency}: Ø {latency.mean_s() * 1000:.0f} ms, max {latency.max_s * 1000:.0f} ms")
+        l10, l90 = stats.exceeded_levels((10.0, 90.0))
+        self.stats_label.setText(
+            f"Leq {stats.leq():.0f} · Max {stats.max_db:.0f} · "
+            f"L10 {l10:.0f} · L90 {l90:.0f} {self._stats_unit} · "
+            f"{format_mmss(stats.time_over_limit_s)} {s.over_limit}"
+        )
+
     def _on_level_updated(self, level: float):
-        self.meter.set_level(level)
+        reading = self._last_reading
+        self.meter.set_level(level, reading.capture_ts if reading is not None else 0.0)
+        self.history.add_level(level)
         # Check limit
         if level >= self.limit_slider.value():
             self.setProperty("alarm", True)
@@ -197,6 +549,7 @@ class NoiseMeterWindow(QFrame):
 
     def _on_limit_changed(self, value):
         self.meter.set_threshold(float(value))
+        self.history.set_threshold(float(value))
         self._save_last_settings()
 
     def _on_presets_clicked(self):
@@ -249,6 +602,7 @@ class NoiseMeterWindow(QFrame):
                 self.limit_slider.setValue(data["limit"])
                 self.processor.set_sensitivity(data["sensitivity"] / 10.0)
                 self.meter.set_threshold(float(data["limit"]))
+                self.history.set_threshold(float(data["limit"]))
                 
                 self.sens_slider.blockSignals(False)
                 self.limit_slider.blockSignals(False)
@@ -267,11 +621,40 @@ class NoiseMeterWindow(QFrame):
         self.limit_slider.setValue(limit)
         self.processor.set_sensitivity(sens / 10.0)
         self.meter.set_threshold(float(limit))
+        self.history.set_threshold(float(limit))
+        device = get_device_manager().find(self.presets_manager.load_device())
+        if device is not None:
+            self.processor.set_device(device)
+        self.spectrum_check.setChecked(HAS_SPECTRUM and self.presets_manager.load_spectrum())
+        profile = self.presets_manager.load_profile()
+        if profile not in PROFILES:
+            profile = DEFAULT_PROFILE
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(profile))
+
+    def _on_spectrum_toggled(self, checked: bool):
+        self.spectrum.setVisible(checked)
+        self.presets_manager.save_spectrum(checked)
+        # Rechnet nur, solange das Fenster sichtbar ist
+        self.processor.set_spectrum(checked and self.isVisible())
+
+    def _on_spectrum_updated(self, levels):
+        if self.spectrum.isVisible():
+            self.spectrum.set_levels(levels)
+
+    def _on_hub_reading(self, reading):
+        self._on_reading_updated(reading)
+        self._on_level_updated(reading.level)
 
     def showEvent(self, event):
         super().showEvent(event)
-        self.processor.start()
+        if self._subscription is None:
+            self._subscription = self.hub.subscribe(self._on_hub_reading, owner=self)
+        self.processor.set_spectrum(self.spectrum_check.isChecked())
 
     def hideEvent(self, event):
         super().hideEvent(event)
-        self.processor.stop()
+        # Letzter Abonnent weg: Session bleibt kurz warm, nach IDLE_RELEASE_S wird alles freigegeben
+        self.processor.set_spectrum(False)
+        if self._subscription is not None:
+            self.hub.unsubscribe(self._subscription)
+            self._subscription = None
@@ -56,3 +56,25 @@ class NoisePresetsManager:
         sens = last_settings.value("noise_last_sensitivity", 40)
         limit = last_settings.value("noise_last_limit", 70)
         return int(sens), int(limit)
+
+    def save_profile(self, profile: str):
+        """Speichert das gewählte Audio-Profil (Latenz/Stromverbrauch)."""
+        QSettings("TimeFlow", "TimeFlow").setValue("noise_profile", profile)
+
+    def load_profile(self, default: str = "balanced") -> str:
+        return str(QSettings("TimeFlow", "TimeFlow").value("noise_profile", default))
+
+    def save_spectrum(self, enabled: bool):
+        """Speichert, ob das Bandspektrum angezeigt wird."""
+        QSettings("TimeFlow", "TimeFlow").setValue("noise_spectrum", bool(enabled))
+
+    def load_spectrum(self) -> bool:
+        value = QSettings("TimeFlow", "TimeFlow").value("noise_spectrum", False)
+        return value in (True, "true", "1", 1)
+
+    def save_device(self, key: str):
+        """Speichert das gewählte Mikrofon ("" = Systemstandard)."""
+        QSettings("TimeFlow", "TimeFlow").setValue("noise_device", key)
+
+    def load_device(self) -> str:
+        return str(QSettings("TimeFlow", "TimeFlow").value("noise_device", ""))
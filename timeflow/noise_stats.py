@@ -0,0 +1,91 @@
+from __future__ import annotations
+import array
+import bisect
+import itertools
+import math
+from typing import Iterable, Tuple
+
+from .weighting import DB_FLOOR
+
+# Histogrammbereich und Auflösung (dB); oberhalb/unterhalb wird in den Randbin sortiert
+HIST_MAX_DB = 140.0
+HIST_STEP_DB = 0.1
+
+
+class NoiseStatsAccumulator:
+    """
+    Laufende Lärmstatistik einer Stunde/Phase: Leq, Maximum, L10/L50/L90 und
+    Zeit über dem Grenzwert.
+
+    Speicher bleibt konstant: Leq wird als Energiesumme geführt, Perzentile
+    kommen aus einem festen Histogramm (0.1 dB), gewichtet mit der Dauer
+    jedes Messwerts. Ein 8-Stunden-Tag mit 25-ms-Hops kostet also genauso
+    viel Speicher wie eine Minute. Bewusst ohne Qt.
+    """
+
+    def __init__(self) -> None:
+        self._bins = int(round((HIST_MAX_DB - DB_FLOOR) / HIST_STEP_DB)) + 1
+        self._hist = array.array("d", bytes(8 * self._bins))
+        self.reset()
+
+    def reset(self) -> None:
+        self._hist[:] = array.array("d", bytes(8 * self._bins))
+        self.duration_s = 0.0
+        self.time_over_limit_s = 0.0
+        self.max_db = DB_FLOOR
+        self.readings = 0
+        self._energy = 0.0
+
+    def add(self, db: float, duration_s: float, over_limit: bool = False) -> None:
+        """Ein Messwert `db`, der `duration_s` Sekunden gilt."""
+        if duration_s <= 0:
+            return
+        db = min(HIST_MAX_DB, max(DB_FLOOR, db))
+        self._hist[int(round((db - DB_FLOOR) / HIST_STEP_DB))] += duration_s
+        self._energy += duration_s * 10.0 ** (db / 10.0)
+        self.duration_s += duration_s
+        if over_limit:
+            self.time_over_limit_s += duration_s
+        if db > self.max_db:
+            self.max_db = db
+        self.readings += 1
+
+    def leq(self) -> float:
+        """Energieäquivalenter Dauerschallpegel."""
+        if self.duration_s <= 0:
+            return DB_FLOOR
+        return max(DB_FLOOR, 10.0 * math.log10(self._energy / self.duration_s))
+
+    def exceeded_levels(self, percents: Iterable[float]) -> Tuple[float, ...]:
+        """
+        Pegel, die in den jeweiligen `percents` % der Zeit überschritten wurden.
+        Ein Durchlauf über das Histogramm (kumuliert von oben) für alle Werte.
+        """
+        percents = tuple(percents)
+        if self.duration_s <= 0:
+            return (DB_FLOOR,) * len(percents)
+        # acc[j]: Zeit in den obersten j + 1 Bins, monoton steigend
+        acc = list(itertools.accumulate(reversed(self._hist)))
+        top = self._bins - 1
+        levels = []
+        for percent in percents:
+            j = bisect.bisect_right(acc, self.duration_s * percent / 100.0)
+            levels.append(DB_FLOOR + (top - j) * HIST_STEP_DB if j < len(acc) else DB_FLOOR)
+        return tuple(levels)
+
+    def exceeded(self, percent: float) -> float:
+        """Pegel, der in `percent` % der Zeit überschritten wurde (L10 = exceeded(10))."""
+        return self.exceeded_levels((percent,))[0]
+
+    def percentiles(self) -> Tuple[float, float, float]:
+        """(L10, L50, L90) aus einem Durchlauf."""
+        return self.exceeded_levels((10.0, 50.0, 90.0))
+
+    def l10(self) -> float:
+        return self.exceeded(10.0)
+
+    def l50(self) -> float:
+        return self.exceeded(50.0)
+
+    def l90(self) -> float:
+        return self.exceeded(90.0)
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import List
-from PySide6.QtCore import Qt, QRectF
-from PySide6.QtGui import QPainter, QPainterPath, QPen, QColor
+import math
+from typing import List, Optional, Sequence, Tuple
+from PySide6.QtCore import Qt, QEvent, QRectF, Signal
+from PySide6.QtGui import QPainter, QPainterPath, QPen, QColor, QPixmap
 from PySide6.QtWidgets import QWidget, QSizePolicy
 
 from .segments_model import Segment
@@ -18,86 +19,224 @@ def _progress_color(t: float) -> QColor:
     r = (231, 76, 60)
     return QColor(_lerp(g[0], r[0], t), _lerp(g[1], r[1], t), _lerp(g[2], r[2], t))
 
+def _wedge_path(outer_rect: QRectF, inner_rect: QRectF, start_angle: float, span: float) -> QPainterPath:
+    path = QPainterPath()
+    path.arcMoveTo(outer_rect, start_angle)
+    path.arcTo(outer_rect, start_angle, span)
+    path.arcTo(inner_rect, start_angle + span, -span)
+    path.closeSubpath()
+    return path
+
+def lod_arcs(minutes: Sequence[float], min_span_deg: float) -> List[Tuple[float, float, int]]:
+    """
+    Winkelbereiche (start, span, anzahl_segmente) für den Ring, im Uhrzeigersinn ab 12 Uhr.
+
+    Aufeinanderfolgende Segmente unter `min_span_deg` werden zu einem
+    Sammelbogen zusammengefasst, bis dieser sichtbar breit ist. Ein Rest, der
+    dafür nicht reicht, geht im vorigen Bogen auf (am Anfang im nächsten), so
+    dass kein Bogen schmaler als `min_span_deg` wird. Die Zahl der Bögen ist
+    damit durch die Auflösung begrenzt, nicht durch die Agendalänge.
+    """
+    total = sum(max(0.0, m) for m in minutes)
+    if total <= 0:
+        return []
+    arcs: List[Tuple[float, float, int]] = []
+    angle = 90.0
+    run_start, run_span, run_count = angle, 0.0, 0
+    for m in minutes:
+        span = 360.0 * max(0.0, m) / total
+        if span <= 0.0:
+            continue
+        if span >= min_span_deg:
+            start, arc_span, count = angle, span, 1
+            if run_count:
+                if arcs:
+                    prev_start, prev_span, prev_count = arcs[-1]
+                    arcs[-1] = (prev_start, prev_span + run_span, prev_count + run_count)
+                else:
+                    start, arc_span, count = run_start, run_span + span, run_count + 1
+                run_count = 0
+            arcs.append((start, arc_span, count))
+        else:
+            if not run_count:
+                run_start, run_span = angle, 0.0
+            run_span += span
+            run_count += 1
+            if run_span >= min_span_deg:
+                arcs.append((run_start, run_span, run_count))
+                run_count = 0
+        angle -= span
+    if run_count:
+        if arcs:
+            prev_start, prev_span, prev_count = arcs[-1]
+            arcs[-1] = (prev_start, prev_span + run_span, prev_count + run_count)
+        else:
+            arcs.append((run_start, run_span, run_count))
+    return arcs
+
 class PieWidget(QWidget):
+    # Anzahl sichtbarer Fortschrittsschritte hat sich geändert (Resize / DPI)
+    progressStepsChanged = Signal(int)
+
+    MARGIN = 10
+    INNER_SCALE = 0.55
+
     def __init__(self) -> None:
         super().__init__()
         self._segments: List[Segment] = []
         self._progress: float = 0.0 
+        self._progress_steps = 0
+        self._ring_cache: Optional[QPixmap] = None
+        self._ring_key = None
+        self._ring_renders = 0
+        self._arcs: List[Tuple[float, float, int]] = []
+        # Zuletzt zum Zeichnen angemeldeter Fortschritt: (Pixelschritt, Farbe) und Wert
+        self._shown: Optional[Tuple[int, int]] = None
+        self._shown_progress = 0.0
         self.setMinimumSize(40, 40)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
+    def progress_steps(self) -> int:
+        """Umfang des Rings in Gerätepixeln = kleinste sichtbare Fortschrittsänderung."""
+        side = min(self.width(), self.height()) - (self.MARGIN * 2)
+        if side <= 0:
+            return 0
+        return int(math.ceil(math.pi * side * self.devicePixelRatioF()))
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._shown = None
+        steps = self.progress_steps()
+        if steps != self._progress_steps:
+            self._progress_steps = steps
+            self.progressStepsChanged.emit(steps)
+
     def set_segments(self, segments: List[Segment]) -> None:
         self._segments = list(segments)
+        self._invalidate_ring()
         self.update()
 
     def set_progress(self, progress_0_1: float) -> None:
+        self._set_progress(progress_0_1, None)
+
+    def set_progress_step(self, step: int, steps: int) -> None:
+        """
+        Fortschritt als Schritt `step` von `steps` (TimerFrame). Passt die
+        Rasterung zum Widget, wird der Schritt direkt übernommen – ohne den
+        Umweg über einen Bruch, der bei floor() um eins danebenliegen kann.
+        """
+        progress = step / steps if steps > 0 else 0.0
+        self._set_progress(progress, step if steps == self.progress_steps() else None)
+
+    def _set_progress(self, progress_0_1: float, step: Optional[int]) -> None:
         self._progress = _clamp(progress_0_1)
-        self.update()
+        steps = self.progress_steps()
+        rects = self._ring_rects()
+        if steps <= 0 or rects is None:
+            self.update()
+            return
 
-    def paintEvent(self, event) -> None:
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
-        p.fillRect(self.rect(), QColor(0, 0, 0, 0))
+        # Neu zeichnen nur, wenn die Bogenkante ein Gerätepixel weiterrückt
+        # oder sich die Fortschrittsfarbe ändert; floor wie TimerCore/TimerViewModel
+        if step is None:
+            step = math.floor(self._progress * steps)
+        shown = (step, _progress_color(self._progress).rgb())
+        if shown == self._shown:
+            return
+        old, old_progress = self._shown, self._shown_progress
+        self._shown, self._shown_progress = shown, self._progress
+
+        outer_rect, inner_rect = rects
+        if old is None or old[1] != shown[1]:
+            # Farbwechsel betrifft den ganzen Bogen
+            self.update(outer_rect.toAlignedRect().adjusted(-2, -2, 2, 2))
+            return
+        # Sonst nur der Keil zwischen alter und neuer Kante
+        lo = min(old_progress, self._progress)
+        hi = max(old_progress, self._progress)
+        wedge = _wedge_path(outer_rect, inner_rect, 90.0 - 360.0 * lo, -360.0 * (hi - lo))
+        self.update(wedge.boundingRect().toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._invalidate_ring()
 
-        w = self.width()
-        h = self.height()
-        margin = 10 
-        side = min(w, h) - (margin * 2)
-        if side <= 0: return
+    def _invalidate_ring(self) -> None:
+        self._ring_cache = None
 
-        cx = w / 2
-        cy = h / 2
-        
+    def _ring_rects(self):
+        side = min(self.width(), self.height()) - (self.MARGIN * 2)
+        if side <= 0:
+            return None
+        cx = self.width() / 2
+        cy = self.height() / 2
         outer_rect = QRectF(cx - side/2, cy - side/2, side, side)
-        inner_scale = 0.55 
-        inner_side = side * inner_scale
+        inner_side = side * self.INNER_SCALE
         inner_rect = QRectF(cx - inner_side/2, cy - inner_side/2, inner_side, inner_side)
+        return outer_rect, inner_rect
+
+    def _ring_pixmap(self, outer_rect: QRectF, inner_rect: QRectF) -> QPixmap:
+        """Statischer Ring (Hintergrund, Segmente, Trennlinien) – nur bei Resize/DPI/Segment-/Theme-Änderung neu."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr)
+        if self._ring_cache is not None and self._ring_key == key:
+            return self._ring_cache
+
+        pm = QPixmap(max(1, math.ceil(self.width() * dpr)), max(1, math.ceil(self.height() * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.Antialiasing, True)
 
-        total_s = sum(max(0.0, s.minutes) for s in self._segments)
-        
         path_bg = QPainterPath()
         path_bg.addEllipse(outer_rect)
         path_inner = QPainterPath()
         path_inner.addEllipse(inner_rect)
         path_ring = path_bg.subtracted(path_inner)
-        
+
         p.setPen(Qt.NoPen)
-        p.setBrush(QColor(242, 242, 247)) 
+        p.setBrush(QColor(242, 242, 247))
         p.drawPath(path_ring)
 
-        if total_s > 0:
-            start_angle = 90.0
-            current_angle = start_angle
-            for seg in self._segments:
-                frac = (max(0.0, seg.minutes) / total_s)
-                span = -360.0 * frac
-                if abs(span) < 0.1: continue
-
-                path_seg = QPainterPath()
-                path_seg.arcMoveTo(outer_rect, current_angle)
-                path_seg.arcTo(outer_rect, current_angle, span)
-                path_seg.arcTo(inner_rect, current_angle + span, -span)
-                path_seg.closeSubpath()
-                
-                p.setBrush(QColor(229, 229, 234)) 
-                p.drawPath(path_seg)
-                
-                # Weiße Trennlinien
-                p.setPen(QPen(Qt.white, 2))
-                p.setBrush(Qt.NoBrush)
-                p.drawPath(path_seg)
-                p.setPen(Qt.NoPen)
-
-                current_angle += span
-
-            # Progress
-            prog_span = -360.0 * self._progress
-            if abs(prog_span) >= 0.1:
-                prog_path = QPainterPath()
-                prog_path.arcMoveTo(outer_rect, 90.0)
-                prog_path.arcTo(outer_rect, 90.0, prog_span)
-                prog_path.arcTo(inner_rect, 90.0 + prog_span, -prog_span)
-                prog_path.closeSubpath()
-                
-                p.setBrush(_progress_color(self._progress))
-                p.drawPath(prog_path)
\ No newline at end of file
+        # LOD: ein Gerätepixel auf dem Außenrand als kleinster eigener Bogen
+        min_span = 360.0 / max(1.0, math.pi * outer_rect.width() * dpr)
+        self._arcs = lod_arcs([seg.minutes for seg in self._segments], min_span)
+        for start_angle, arc_span, _count in self._arcs:
+            path_seg = _wedge_path(outer_rect, inner_rect, start_angle, -arc_span)
+
+            p.setBrush(QColor(229, 229, 234))
+            p.drawPath(path_seg)
+
+            # Weiße Trennlinien
+            p.setPen(QPen(Qt.white, 2))
+            p.setBrush(Qt.NoBrush)
+            p.drawPath(path_seg)
+            p.setPen(Qt.NoPen)
+        p.end()
+
+        self._ring_cache = pm
+        self._ring_key = key
+        self._ring_renders += 1
+        return pm
+
+    def paintEvent(self, event) -> None:
+        rects = self._ring_rects()
+        if rects is None: return
+        outer_rect, inner_rect = rects
+
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._ring_pixmap(outer_rect, inner_rect))
+
+        if not self._arcs:
+            return
+
+        # Pro Frame nur der Fortschrittsbogen
+        prog_span = -360.0 * self._progress
+        if abs(prog_span) >= 0.1:
+            p.setRenderHint(QPainter.Antialiasing, True)
+            p.setPen(Qt.NoPen)
+            prog_path = _wedge_path(outer_rect, inner_rect, 90.0, prog_span)
+            p.setBrush(_progress_color(self._progress))
+            p.drawPath(prog_path)
@@ -2,7 +2,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QMimeData
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QMimeData, QObject, QTimer, Signal
+
+from .timeline import SegmentTimeline
 
 @dataclass
 class Segment:
@@ -21,13 +23,23 @@ class SegmentsModel(QAbstractTableModel):
         super().__init__()
         self._segments: List[Segment] = segments or []
         self._headers = list(headers)
+        self._timeline = SegmentTimeline(s.minutes * 60.0 for s in self._segments)
 
     def segments(self) -> List[Segment]:
         return list(self._segments)
 
+    def segment(self, row: int) -> Segment:
+        """Direkter Zugriff ohne Listenkopie."""
+        return self._segments[row]
+
+    def timeline(self) -> SegmentTimeline:
+        """Präfixsummen-Index der Segmentgrenzen (wird bei jeder Änderung mitgeführt)."""
+        return self._timeline
+
     def set_segments(self, segments: List[Segment]) -> None:
         self.beginResetModel()
         self._segments = list(segments)
+        self._timeline.reset(s.minutes * 60.0 for s in self._segments)
         self.endResetModel()
 
     def set_headers(self, name_header: str, minutes_header: str) -> None:
@@ -35,7 +47,7 @@ class SegmentsModel(QAbstractTableModel):
         self.headerDataChanged.emit(Qt.Horizontal, 0, 1)
 
     def total_seconds(self) -> float:
-        return max(0.0, sum(max(0.0, s.minutes) for s in self._segments) * 60.0)
+        return self._timeline.total()
 
     # --- Qt Model API ---
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
@@ -91,6 +103,7 @@ class SegmentsModel(QAbstractTableModel):
             except Exception:
                 return False
             seg.minutes = max(0.0, v)
+            self._timeline.set_duration(index.row(), seg.minutes * 60.0)
         else:
             return False
         
@@ -139,6 +152,7 @@ class SegmentsModel(QAbstractTableModel):
         if self.beginMoveRows(QModelIndex(), source_row, source_row, QModelIndex(), target_row + (1 if target_row > source_row else 0)):
             item = self._segments.pop(source_row)
             self._segments.insert(target_row, item)
+            self._timeline.move(source_row, target_row)
             self.endMoveRows()
             return True
             
@@ -147,8 +161,9 @@ class SegmentsModel(QAbstractTableModel):
     def insertRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
         row = max(0, min(row, len(self._segments)))
         self.beginInsertRows(QModelIndex(), row, row + count - 1)
-        for _ in range(count):
-            self._segments.insert(row, Segment("New segment", 5))
+        new = [Segment("New segment", 5) for _ in range(count)]
+        self._segments[row:row] = new
+        self._timeline.insert(row, (s.minutes * 60.0 for s in new))
         self.endInsertRows()
         return True
 
@@ -158,5 +173,60 @@ class SegmentsModel(QAbstractTableModel):
         end = min(len(self._segments) - 1, row + count - 1)
         self.beginRemoveRows(QModelIndex(), row, end)
         del self._segments[row : end + 1]
+        self._timeline.remove(row, end - row + 1)
         self.endRemoveRows()
-        return True
\ No newline at end of file
+        return True
+
+
+# Änderungsklassen für SegmentChangeBatcher (Bitmaske)
+CHANGE_NAMES = 0x1
+CHANGE_DURATIONS = 0x2
+CHANGE_STRUCTURE = 0x4 | CHANGE_NAMES | CHANGE_DURATIONS
+
+
+class SegmentChangeBatcher(QObject):
+    """
+    Sammelt Modelländerungen innerhalb einer Event-Loop-Runde und meldet sie
+    gebündelt als ein `changed(flags)`.
+
+    Namensänderungen und Minutenänderungen werden getrennt gemeldet, damit
+    z. B. ein Umbenennen keine Kreisgeometrie neu aufbaut. `flush()` liefert
+    ausstehende Änderungen sofort (etwa vor einem Sprung im Timer).
+    """
+    changed = Signal(int)
+
+    def __init__(self, model: SegmentsModel, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._pending = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(lambda: self.mark(CHANGE_STRUCTURE))
+        model.rowsInserted.connect(lambda *_: self.mark(CHANGE_STRUCTURE))
+        model.rowsRemoved.connect(lambda *_: self.mark(CHANGE_STRUCTURE))
+        model.rowsMoved.connect(lambda *_: self.mark(CHANGE_STRUCTURE))
+
+    def pending(self) -> int:
+        return self._pending
+
+    def mark(self, flags: int) -> None:
+        self._pending |= flags
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> None:
+        self._timer.stop()
+        flags, self._pending = self._pending, 0
+        if flags:
+            self.changed.emit(flags)
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()) -> None:
+        flags = 0
+        if top_left.column() <= SegmentsModel.COL_NAME <= bottom_right.column():
+            flags |= CHANGE_NAMES
+        if top_left.column() <= SegmentsModel.COL_MIN <= bottom_right.column():
+            flags |= CHANGE_DURATIONS
+        self.mark(flags)
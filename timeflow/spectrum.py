@@ -0,0 +1,98 @@
+from __future__ import annotations
+import math
+from typing import List, Sequence, Tuple
+
+from .audio_kernels import np
+from .weighting import DB_FLOOR
+
+HAS_SPECTRUM = np is not None
+
+# (Name, untere Grenze Hz, obere Grenze Hz): Rumpeln/Lüftung, Sprache, Zischen/Klappern
+BANDS: Tuple[Tuple[str, float, float], ...] = (
+    ("low", 20.0, 250.0),
+    ("speech", 250.0, 4000.0),
+    ("high", 4000.0, 20000.0),
+)
+
+# Bildrate der Spektrumanzeige (Obergrenze)
+SPECTRUM_FPS = 15.0
+
+
+class BandSpectrum:
+    """
+    Bandenergien aus dem Analysefenster per Hann-gefensterter reeller FFT.
+
+    Fensterkoeffizienten, Mono-Puffer, FFT-Ausgabe und Leistungsspektrum
+    werden einmal angelegt (pro Format, nicht pro Block); analyze() schreibt
+    nur in diese Puffer (rfft mit out=, ab NumPy 2.0). Ergebnis sind dBFS je
+    Band in `levels`, normiert so, dass ein Sinus dieselben dBFS zeigt wie
+    der RMS-Pegel. Bänder oberhalb der Nyquist-Frequenz bleiben bei DB_FLOOR.
+    Bewusst ohne Qt; nur mit NumPy.
+    """
+
+    def __init__(self, sample_rate: int, frames: int, channels: int = 1,
+                 bands: Sequence[Tuple[str, float, float]] = BANDS) -> None:
+        if np is None:
+            raise RuntimeError("BandSpectrum benötigt NumPy")
+        self.sample_rate = int(sample_rate)
+        self.frames = max(2, int(frames))
+        self.channels = max(1, int(channels))
+        self.bands = tuple(bands)
+        n = self.frames
+        self._window = np.hanning(n)
+        # Parseval, einseitig: Summe |X|^2 * norm = mittlere Leistung
+        self._norm = 2.0 / (n * float(np.dot(self._window, self._window)))
+        self._mono = np.zeros(n)
+        self._mix = np.zeros(n)
+        self._spec = np.zeros(n // 2 + 1, dtype=np.complex128)
+        self._power = np.zeros(n // 2 + 1)
+        self._imag_sq = np.zeros(n // 2 + 1)
+        hz_per_bin = self.sample_rate / n
+        self._bins: List[Tuple[int, int]] = []
+        for _, lo, hi in self.bands:
+            a = max(1, int(math.ceil(lo / hz_per_bin)))
+            b = min(n // 2 + 1, int(math.ceil(hi / hz_per_bin)))
+            self._bins.append((a, max(a, b)))
+        self.levels = [DB_FLOOR] * len(self.bands)
+        try:
+            np.fft.rfft(self._mono, out=self._spec)
+            self._rfft_out = True
+        except TypeError:   # NumPy < 2.0: rfft ohne out=
+            self._rfft_out = False
+
+    def analyze(self, ring, pos: int) -> List[float]:
+        """
+        `ring`: verschachtelter Ring (frames * channels Samples, -1..1),
+        `pos`: Schreibposition = ältestes Sample. Liefert `levels`.
+        """
+        ch = self.channels
+        start = pos // ch
+        if ch == 1:
+            mix = ring
+        else:
+            # Kanäle mitteln, ohne Entschachtelungskopie
+            mix = self._mix
+            frames = ring.reshape(self.frames, ch)
+            np.add.reduce(frames, axis=1, out=mix)
+            mix *= 1.0 / ch
+        # Chronologisch: ältester Frame zuerst
+        mono = self._mono
+        k = self.frames - start
+        mono[:k] = mix[start:]
+        mono[k:] = mix[:start]
+        mono *= self._window
+
+        if self._rfft_out:
+            spec = np.fft.rfft(mono, out=self._spec)
+        else:
+            spec = np.fft.rfft(mono)
+        power = self._power
+        np.multiply(spec.real, spec.real, out=power)
+        np.multiply(spec.imag, spec.imag, out=self._imag_sq)
+        power += self._imag_sq
+
+        levels = self.levels
+        for i, (a, b) in enumerate(self._bins):
+            energy = float(power[a:b].sum()) * self._norm if b > a else 0.0
+            levels[i] = max(DB_FLOOR, 10.0 * math.log10(energy)) if energy > 0 else DB_FLOOR
+        return levels
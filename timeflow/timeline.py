@@ -0,0 +1,99 @@
+from __future__ import annotations
+import bisect
+from typing import Iterable, List
+
+
+class SegmentTimeline:
+    """
+    Präfixsummen-Index über Segmentdauern (Sekunden).
+
+    `_ends[i]` ist das Ende von Segment i; Abfragen laufen per bisect in O(log n).
+    Änderungen ab einer Zeile bauen nur den Rest der Präfixsummen neu auf.
+    Bewusst ohne Qt, damit die Zeitlogik auch headless nutzbar bleibt.
+    """
+
+    def __init__(self, durations: Iterable[float] = ()) -> None:
+        self._durations: List[float] = []
+        self._ends: List[float] = []
+        self.reset(durations)
+
+    # --- Aufbau ---
+    def copy(self) -> "SegmentTimeline":
+        clone = SegmentTimeline()
+        clone._durations = list(self._durations)
+        clone._ends = list(self._ends)
+        return clone
+
+    def reset(self, durations: Iterable[float]) -> None:
+        self._durations = [max(0.0, float(d)) for d in durations]
+        self._ends = [0.0] * len(self._durations)
+        self._rebuild_from(0)
+
+    def set_duration(self, row: int, seconds: float) -> None:
+        self._durations[row] = max(0.0, float(seconds))
+        self._rebuild_from(row)
+
+    def insert(self, row: int, durations: Iterable[float]) -> None:
+        new = [max(0.0, float(d)) for d in durations]
+        self._durations[row:row] = new
+        self._ends[row:row] = [0.0] * len(new)
+        self._rebuild_from(row)
+
+    def remove(self, row: int, count: int) -> None:
+        del self._durations[row : row + count]
+        del self._ends[row : row + count]
+        self._rebuild_from(row)
+
+    def move(self, source_row: int, target_row: int) -> None:
+        d = self._durations.pop(source_row)
+        self._durations.insert(target_row, d)
+        self._rebuild_from(min(source_row, target_row))
+
+    def _rebuild_from(self, row: int) -> None:
+        t = self._ends[row - 1] if row > 0 else 0.0
+        ends = self._ends
+        durations = self._durations
+        for i in range(row, len(durations)):
+            t += durations[i]
+            ends[i] = t
+
+    # --- Abfragen ---
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def total(self) -> float:
+        return self._ends[-1] if self._ends else 0.0
+
+    def boundaries(self) -> List[float]:
+        """Endzeitpunkte aller Segmente (Kopie)."""
+        return list(self._ends)
+
+    def duration(self, index: int) -> float:
+        return self._durations[index]
+
+    def start_of(self, index: int) -> float:
+        return self._ends[index - 1] if index > 0 else 0.0
+
+    def end_of(self, index: int) -> float:
+        return self._ends[index]
+
+    def index_at(self, t: float) -> int:
+        """Segment, das zum Zeitpunkt t läuft (das letzte ab dem Ende); -1 ohne Segmente."""
+        if not self._ends:
+            return -1
+        return min(bisect.bisect_right(self._ends, t), len(self._ends) - 1)
+
+    def first_ending_after(self, t: float) -> int:
+        """Erstes Segment, dessen Ende > t liegt; len(self), falls keins."""
+        return bisect.bisect_right(self._ends, t)
+
+    def next_start(self, t: float) -> float:
+        """Beginn des nächsten Segments nach t (bzw. Gesamtende)."""
+        i = self.first_ending_after(t)
+        return self._ends[i] if i < len(self._ends) else self.total()
+
+    def remaining_in_current(self, t: float) -> float:
+        i = self.index_at(t)
+        if i < 0:
+            return 0.0
+        return max(0.0, self._ends[i] - t)
@@ -0,0 +1,543 @@
+from __future__ import annotations
+import bisect
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .timeline import SegmentTimeline
+from .utils import clamp
+
+# Bewusst ohne Qt-Import: der Core läuft auch in Diensten, CLI-Tools und Tests
+# ohne QApplication. TimerEngine (timer_engine.py) ist nur ein dünner Qt-Adapter.
+
+Clock = Callable[[], float]
+TickListener = Callable[["TimerState"], None]
+FinishedListener = Callable[[], None]
+Scheduler = Callable[[Optional[float]], None]
+SegmentListener = Callable[["SegmentEvent"], None]
+BatchListener = Callable[[Dict[Hashable, "TimerState"]], None]
+PoolFinishedListener = Callable[[List[Hashable]], None]
+
+# Kleiner Sicherheitsabstand, damit der Tick sicher *nach* der Grenze landet
+_DEADLINE_SLACK_S = 0.001
+
+
+@dataclass
+class TimerState:
+    running: bool
+    elapsed_s: float
+    total_s: float
+
+
+# Arten von Segment-Ereignissen
+SEGMENT_ENTERED = "entered"
+SEGMENT_LEFT = "left"
+SEGMENT_APPROACHING = "approaching"
+
+
+@dataclass
+class SegmentEvent:
+    kind: str                   # SEGMENT_ENTERED / SEGMENT_LEFT / SEGMENT_APPROACHING
+    index: int
+    seconds_left: float = 0.0   # nur bei SEGMENT_APPROACHING
+
+
+class ManualClock:
+    """Schrittweise gesteuerte Uhr für Simulationen und Tests."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = float(start)
+
+    def __call__(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += max(0.0, float(seconds))
+
+
+class TimerCore:
+    """
+    Reine Zeitlogik des Timers: Laufzeit, Pause, Seek und Deadline-Berechnung.
+
+    Die Uhr ist injizierbar (jede Funktion, die Sekunden liefert), Ereignisse
+    gehen an einfache Callbacks. Wann der Core wieder geweckt werden will,
+    meldet er über den Scheduler-Callback als Verzögerung in Sekunden
+    (None = nichts zu tun); der Treiber ruft dann `process()` auf.
+
+    Mit einer Timeline meldet der Core außerdem Segmentwechsel (left/entered)
+    und Vorwarnungen vor dem Segmentende; deren Zeitpunkte fließen in die
+    Deadline ein. Nach dem Ende bzw. ohne Segmente ist kein Segment aktiv (-1).
+    Bei Sprüngen (seek/reset) wird nur altes Segment verlassen und neues
+    betreten, übersprungene Vorwarnungen werden nicht nachgeholt.
+    """
+
+    POLL_INTERVAL_S = 0.1
+
+    def __init__(self, clock: Clock = time.monotonic, adaptive: bool = False) -> None:
+        self._clock = clock
+        self._tick_listeners: List[TickListener] = []
+        self._finished_listeners: List[FinishedListener] = []
+        self._segment_listeners: List[SegmentListener] = []
+        self._scheduler: Optional[Scheduler] = None
+
+        self._running = False
+        self._t0 = 0.0
+        self._elapsed_before = 0.0
+        self._total_s = 0.0
+
+        self._adaptive = bool(adaptive)
+        self._progress_steps = 0
+        self._breakpoints: List[float] = []
+
+        self._timeline: Optional[SegmentTimeline] = None
+        self._segment = -1
+        self._approach_leads: List[float] = []
+        # Sortierte Vorwarn-Zeitpunkte und zugehörige (Segment, Restsekunden)
+        self._approach_times: List[float] = []
+        self._approach_info: List[Tuple[int, float]] = []
+        self._last_elapsed = 0.0
+        self._jumped = False
+
+    # --- Listener / Treiber ---
+    def add_tick_listener(self, fn: TickListener) -> None:
+        self._tick_listeners.append(fn)
+
+    def remove_tick_listener(self, fn: TickListener) -> None:
+        self._tick_listeners.remove(fn)
+
+    def add_finished_listener(self, fn: FinishedListener) -> None:
+        self._finished_listeners.append(fn)
+
+    def remove_finished_listener(self, fn: FinishedListener) -> None:
+        self._finished_listeners.remove(fn)
+
+    def add_segment_listener(self, fn: SegmentListener) -> None:
+        self._segment_listeners.append(fn)
+
+    def remove_segment_listener(self, fn: SegmentListener) -> None:
+        self._segment_listeners.remove(fn)
+
+    def scheduler(self) -> Optional[Scheduler]:
+        return self._scheduler
+
+    def set_scheduler(self, fn: Optional[Scheduler]) -> None:
+        self._scheduler = fn
+        self._reschedule()
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def total_s(self) -> float:
+        return self._total_s
+
+    # --- Scheduler Konfiguration ---
+    def is_adaptive(self) -> bool:
+        return self._adaptive
+
+    def set_adaptive(self, enabled: bool) -> None:
+        """Schaltet zwischen festem 100-ms-Raster und Deadline-Scheduling um."""
+        self._adaptive = bool(enabled)
+        self._reschedule()
+
+    def set_progress_steps(self, steps: int) -> None:
+        """Anzahl sichtbarer Fortschrittsschritte (z. B. Ringumfang in Pixeln). 0 = aus."""
+        self._progress_steps = max(0, int(steps))
+        self._rearm()
+
+    def set_breakpoints(self, seconds: Iterable[float]) -> None:
+        """Zusätzliche Zeitpunkte (Sekunden), an denen ein Tick fällig ist, z. B. Segmentgrenzen."""
+        self._breakpoints = sorted(float(s) for s in seconds)
+        self._rearm()
+
+    def set_timeline(self, timeline: SegmentTimeline) -> None:
+        """Übernimmt Gesamtdauer und Segmentgrenzen (als Kopie) aus einer SegmentTimeline."""
+        self._timeline = timeline.copy()
+        self._breakpoints = self._timeline.boundaries()
+        self._build_approach_points()
+        self._jumped = True
+        self.set_total_seconds(self._timeline.total())
+
+    def set_approach_warnings(self, seconds_before: Iterable[float]) -> None:
+        """Vorwarnzeiten (Sekunden vor Segmentende) für SEGMENT_APPROACHING."""
+        self._approach_leads = sorted({float(s) for s in seconds_before if s > 0})
+        self._build_approach_points()
+        self._rearm()
+
+    def current_segment(self) -> int:
+        return self._segment
+
+    def _build_approach_points(self) -> None:
+        points = []
+        tl = self._timeline
+        if tl is not None:
+            for i in range(len(tl)):
+                start, end = tl.start_of(i), tl.end_of(i)
+                for lead in self._approach_leads:
+                    if end - lead > start:
+                        points.append((end - lead, i, lead))
+        points.sort()
+        self._approach_times = [p[0] for p in points]
+        self._approach_info = [(p[1], p[2]) for p in points]
+
+    def _segment_for(self, elapsed: float) -> int:
+        tl = self._timeline
+        if tl is None or (self._total_s > 0 and elapsed >= self._total_s):
+            return -1
+        return tl.index_at(elapsed)
+
+    def next_deadline(self, elapsed: float) -> float:
+        """
+        Liefert den nächsten Zeitpunkt (> elapsed), an dem sich die Anzeige ändert.
+        Die Zeitanzeige rundet auf ganze Sekunden (format_mmss), daher wechselt sie
+        bei halben Sekunden – sowohl hochgezählt als auch heruntergezählt.
+        """
+        total = self._total_s
+        candidates = [math.floor(elapsed - 0.5) + 1.5]
+
+        if total > 0:
+            remaining = total - elapsed
+            candidates.append(total - (math.ceil(remaining - 0.5) - 0.5))
+            candidates.append(total)
+
+            if self._progress_steps > 0:
+                step = math.floor(elapsed / total * self._progress_steps) + 1
+                candidates.append(step * total / self._progress_steps)
+
+        i = bisect.bisect_right(self._breakpoints, elapsed)
+        if i < len(self._breakpoints):
+            candidates.append(self._breakpoints[i])
+
+        event = self._next_event_time(elapsed)
+        if event is not None:
+            candidates.append(event)
+
+        deadline = min(c for c in candidates if c > elapsed)
+        return min(deadline, total) if total > 0 else deadline
+
+    def _next_event_time(self, elapsed: float) -> Optional[float]:
+        """Nächster Segmentwechsel oder Vorwarnzeitpunkt nach elapsed."""
+        if self._timeline is None:
+            return None
+        candidates = []
+        i = bisect.bisect_right(self._approach_times, elapsed)
+        if i < len(self._approach_times):
+            candidates.append(self._approach_times[i])
+        if 0 <= self._segment < len(self._timeline):
+            candidates.append(self._timeline.end_of(self._segment))
+        later = [c for c in candidates if c > elapsed]
+        return min(later) if later else None
+
+    def wakeup_delay(self) -> Optional[float]:
+        """Sekunden bis zum nächsten fälligen `process()`; None, wenn der Timer steht."""
+        if not self._running:
+            return None
+        elapsed = self.elapsed_seconds()
+        if not self._adaptive:
+            # Festes Raster, Segment-Ereignisse trotzdem punktgenau
+            event = self._next_event_time(elapsed)
+            if event is not None and event - elapsed < self.POLL_INTERVAL_S:
+                return max(0.0, event - elapsed) + _DEADLINE_SLACK_S
+            return self.POLL_INTERVAL_S
+        return max(0.0, self.next_deadline(elapsed) - elapsed) + _DEADLINE_SLACK_S
+
+    # --- Steuerung ---
+    def state(self) -> TimerState:
+        return TimerState(self._running, self.elapsed_seconds(), self._total_s)
+
+    def set_total_seconds(self, total_s: float) -> None:
+        self._total_s = max(0.0, float(total_s))
+        self._rearm()
+        self._emit()
+
+    def reset(self) -> None:
+        self.pause()
+        self._elapsed_before = 0.0
+        self._jumped = True
+        self._emit()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._t0 = self._clock()
+        self._reschedule()
+        self._emit()
+
+    def pause(self) -> None:
+        if not self._running:
+            return
+        self._elapsed_before = self.elapsed_seconds()
+        self._running = False
+        self._reschedule()
+        self._emit()
+
+    def toggle(self) -> None:
+        if self._running:
+            self.pause()
+        else:
+            self.start()
+
+    def elapsed_seconds(self) -> float:
+        if not self._running:
+            return float(self._elapsed_before)
+        return float(self._elapsed_before + (self._clock() - self._t0))
+
+    def seek(self, seconds: float) -> None:
+        """Sets the elapsed time to a specific value."""
+        was_running = self._running
+        if was_running:
+            self.pause()
+        self._elapsed_before = clamp(seconds, 0.0, self._total_s)
+        self._jumped = True
+        if was_running:
+            self.start()
+        else:
+            self._emit()
+
+    def process(self) -> None:
+        """Vom Treiber bei Fälligkeit aufzurufen (Timer-Timeout)."""
+        if not self._running:
+            return
+        if self._total_s > 0 and self.elapsed_seconds() >= self._total_s:
+            # clamp, stop, emit finished
+            self._elapsed_before = self._total_s
+            self._running = False
+            self._reschedule()
+            self._emit()
+            for fn in list(self._finished_listeners):
+                fn()
+            return
+        self._reschedule()
+        self._emit()
+
+    def _reschedule(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler(self.wakeup_delay())
+
+    def _rearm(self) -> None:
+        # Nur im adaptiven Modus hängt die Deadline von Total/Breakpoints ab
+        if self._running and self._adaptive:
+            self._reschedule()
+
+    def _emit(self) -> None:
+        state = self.state()
+        self._update_segment(state.elapsed_s)
+        for fn in list(self._tick_listeners):
+            fn(state)
+
+    def _update_segment(self, elapsed: float) -> None:
+        previous = self._last_elapsed
+        jumped = self._jumped
+        self._last_elapsed = elapsed
+        self._jumped = False
+
+        events = []
+        if not jumped and elapsed > previous:
+            lo = bisect.bisect_right(self._approach_times, previous)
+            hi = bisect.bisect_right(self._approach_times, elapsed)
+            for index, lead in self._approach_info[lo:hi]:
+                events.append(SegmentEvent(SEGMENT_APPROACHING, index, lead))
+
+        segment = self._segment_for(elapsed)
+        if segment != self._segment:
+            if self._segment >= 0:
+                events.append(SegmentEvent(SEGMENT_LEFT, self._segment))
+            self._segment = segment
+            if segment >= 0:
+                events.append(SegmentEvent(SEGMENT_ENTERED, segment))
+            # Deadline hängt vom aktuellen Segment ab
+            if self._running:
+                self._reschedule()
+
+        for event in events:
+            for fn in list(self._segment_listeners):
+                fn(event)
+
+
+
+class TimerPoolCore:
+    """
+    Viele unabhängige TimerCores hinter einer gemeinsamen Deadline-Queue.
+
+    Jeder Timer meldet seine nächste Deadline in einen Heap; der Pool selbst
+    braucht nur einen einzigen Treiber (Scheduler-Callback wie bei TimerCore).
+    Pro Wakeup werden nur die fälligen Timer bearbeitet und deren Zustände als
+    ein Batch {timer_id: TimerState} an die Listener gegeben.
+    Überholte Heap-Einträge werden über ihre Sequenznummer erkannt und verworfen.
+    """
+
+    def __init__(self, clock: Clock = time.monotonic, adaptive: bool = True) -> None:
+        self._clock = clock
+        self._adaptive = adaptive
+        self._timers: Dict[Hashable, TimerCore] = {}
+        # timer_id -> Sequenznummer des gültigen Heap-Eintrags
+        self._live: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self._stale = 0
+        self._ids = itertools.count()
+
+        self._pending: Dict[Hashable, TimerState] = {}
+        self._pending_finished: List[Hashable] = []
+        self._processing = False
+
+        self._batch_listeners: List[BatchListener] = []
+        self._finished_listeners: List[PoolFinishedListener] = []
+        self._scheduler: Optional[Scheduler] = None
+
+    # --- Listener / Treiber ---
+    def add_batch_listener(self, fn: BatchListener) -> None:
+        self._batch_listeners.append(fn)
+
+    def add_finished_listener(self, fn: PoolFinishedListener) -> None:
+        self._finished_listeners.append(fn)
+
+    def scheduler(self) -> Optional[Scheduler]:
+        return self._scheduler
+
+    def set_scheduler(self, fn: Optional[Scheduler]) -> None:
+        self._scheduler = fn
+        self._reschedule()
+
+    # --- Timer verwalten ---
+    def add_timer(self, timer_id: Optional[Hashable] = None,
+                  timeline: Optional[SegmentTimeline] = None) -> Hashable:
+        if timer_id is None:
+            timer_id = next(self._ids)
+            while timer_id in self._timers:
+                timer_id = next(self._ids)
+        elif timer_id in self._timers:
+            raise KeyError(f"Timer {timer_id!r} existiert bereits")
+
+        core = TimerCore(self._clock, self._adaptive)
+        self._timers[timer_id] = core
+        core.add_tick_listener(lambda state, tid=timer_id: self._on_tick(tid, state))
+        core.add_finished_listener(lambda tid=timer_id: self._pending_finished.append(tid))
+        if timeline is not None:
+            core.set_timeline(timeline)
+        core.set_scheduler(lambda delay, tid=timer_id: self._on_schedule(tid, delay))
+        return timer_id
+
+    def remove_timer(self, timer_id: Hashable) -> None:
+        core = self._timers.pop(timer_id)
+        core.set_scheduler(None)
+        self._pending.pop(timer_id, None)
+        if self._live.pop(timer_id, None) is not None:
+            self._stale += 1
+
+    def timer(self, timer_id: Hashable) -> TimerCore:
+        """Zugriff auf einen Timer (start/pause/seek/set_timeline direkt am Core)."""
+        return self._timers[timer_id]
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, timer_id: Hashable) -> bool:
+        return timer_id in self._timers
+
+    # --- Treiber-Schnittstelle ---
+    def wakeup_delay(self) -> Optional[float]:
+        if self._pending or self._pending_finished:
+            return 0.0
+        self._drop_stale_head()
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def process(self) -> None:
+        """Bearbeitet alle fälligen Timer und liefert einen gemeinsamen Batch aus."""
+        self._processing = True
+        try:
+            now = self._clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, seq, timer_id = heapq.heappop(heap)
+                if self._live.get(timer_id) != seq:
+                    self._stale = max(0, self._stale - 1)
+                    continue
+                # Eintrag verbraucht; process() plant den Timer selbst neu ein
+                del self._live[timer_id]
+                self._timers[timer_id].process()
+        finally:
+            self._processing = False
+        self._flush()
+        self._reschedule()
+
+    # --- Intern ---
+    def _on_tick(self, timer_id: Hashable, state: TimerState) -> None:
+        first = not self._pending and not self._pending_finished
+        self._pending[timer_id] = state
+        # Änderungen außerhalb eines Wakeups (start/seek/...) im nächsten Durchlauf ausliefern
+        if first and not self._processing:
+            self._reschedule()
+
+    def _on_schedule(self, timer_id: Hashable, delay: Optional[float]) -> None:
+        if self._live.pop(timer_id, None) is not None:
+            self._stale += 1
+        if delay is not None:
+            seq = next(self._seq)
+            self._live[timer_id] = seq
+            heapq.heappush(self._heap, (self._clock() + delay, seq, timer_id))
+        self._maybe_compact()
+        if not self._processing:
+            self._reschedule()
+
+    def _drop_stale_head(self) -> None:
+        heap = self._heap
+        while heap and self._live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+            self._stale = max(0, self._stale - 1)
+
+    def _maybe_compact(self) -> None:
+        # Viele überholte Einträge (z. B. häufiges Seek) -> Heap neu aufbauen
+        if self._stale > 64 and self._stale * 2 > len(self._heap):
+            live = self._live
+            self._heap = [e for e in self._heap if live.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _flush(self) -> None:
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            for fn in list(self._batch_listeners):
+                fn(batch)
+        if self._pending_finished:
+            done, self._pending_finished = self._pending_finished, []
+            for fn in list(self._finished_listeners):
+                fn(done)
+
+    def _reschedule(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler(self.wakeup_delay())
+
+
+def run_simulated(core, clock: ManualClock, duration_s: float) -> int:
+    """
+    Treibt `core` (TimerCore oder TimerPoolCore) mit einer ManualClock über
+    `duration_s` Sekunden, indem die Uhr direkt zur jeweils nächsten Deadline
+    springt. Liefert die Anzahl der Wakeups.
+    """
+    pending: List[Optional[float]] = [core.wakeup_delay()]
+    previous = core.scheduler()
+    core.set_scheduler(lambda delay: pending.__setitem__(0, delay))
+
+    end = clock() + duration_s
+    wakeups = 0
+    try:
+        while pending[0] is not None and clock() + pending[0] <= end:
+            clock.advance(pending[0])
+            wakeups += 1
+            core.process()
+        clock.advance(end - clock())
+    finally:
+        core.set_scheduler(previous)
+    return wakeups
@@ -1,89 +1,129 @@
 from __future__ import annotations
-import time
-from dataclasses import dataclass
-from PySide6.QtCore import QObject, QTimer, Signal
-from .utils import clamp
+import math
+from typing import Iterable, Optional
+from PySide6.QtCore import QObject, Signal
 
-
-@dataclass
-class TimerState:
-    running: bool
-    elapsed_s: float
-    total_s: float
+from .clock import VirtualClock, get_clock
+from .timeline import SegmentTimeline
+from .timer_core import (
+    Clock, TimerCore, TimerState, SegmentEvent,
+    SEGMENT_ENTERED, SEGMENT_LEFT, SEGMENT_APPROACHING,
+)
+from .virtual_timer import VirtualTimer
 
 
 class TimerEngine(QObject):
+    """
+    Qt-Adapter um TimerCore.
+
+    Die Zeitlogik liegt im Qt-freien Core; hier werden nur dessen Callbacks auf
+    Signale abgebildet und ein einmaliger VirtualTimer (präziser QTimer bzw.
+    step-Uhr, siehe clock.py) auf die vom Core gemeldete nächste Deadline
+    gestellt (fest: 100 ms, adaptiv: nächste sichtbare Änderung).
+    """
     tick = Signal(object)      # emits TimerState
     finished = Signal()
+    # Segmentereignisse; MainWindow nutzt segmentEntered, die übrigen sind API
+    # für weitere Abnehmer (Vorwarnungen nur nach set_approach_warnings)
+    segmentEntered = Signal(int)
+    segmentLeft = Signal(int)
+    approachingBoundary = Signal(int, float)   # Segment, Sekunden bis Segmentende
+    wasReset = Signal()
+
+    POLL_INTERVAL_MS = int(TimerCore.POLL_INTERVAL_S * 1000)
 
-    def __init__(self) -> None:
+    def __init__(self, adaptive: bool = False, clock: Optional[Clock] = None) -> None:
         super().__init__()
-        self._timer = QTimer(self)
-        self._timer.setInterval(100)  # ms
-        self._timer.timeout.connect(self._on_timeout)
+        if clock is None:
+            clock = get_clock()
+        # Eigene VirtualClock -> Timer folgt ihr; sonst der anwendungsweiten Uhr
+        self._timer = VirtualTimer(self, clock if isinstance(clock, VirtualClock) else None)
+        self._timer.setSingleShot(True)
+
+        self._core = TimerCore(clock, adaptive)
+        self._core.add_tick_listener(self.tick.emit)
+        self._core.add_finished_listener(self.finished.emit)
+        self._core.add_segment_listener(self._on_segment_event)
+        self._timer.timeout.connect(self._core.process)
+        self._core.set_scheduler(self._schedule)
+
+    def core(self) -> TimerCore:
+        return self._core
+
+    # Zustand liegt im Core; die alten Attribute bleiben lesbar
+    @property
+    def _running(self) -> bool:
+        return self._core.running
+
+    @property
+    def _total_s(self) -> float:
+        return self._core.total_s
+
+    def is_running(self) -> bool:
+        return self._core.running
+
+    def total_seconds(self) -> float:
+        return self._core.total_s
+
+    # --- Scheduler Konfiguration ---
+    def is_adaptive(self) -> bool:
+        return self._core.is_adaptive()
+
+    def set_adaptive(self, enabled: bool) -> None:
+        self._core.set_adaptive(enabled)
 
-        self._running = False
-        self._t0 = 0.0
-        self._elapsed_before = 0.0
-        self._total_s = 0.0
+    def set_progress_steps(self, steps: int) -> None:
+        self._core.set_progress_steps(steps)
 
+    def set_breakpoints(self, seconds: Iterable[float]) -> None:
+        self._core.set_breakpoints(seconds)
+
+    def set_timeline(self, timeline: SegmentTimeline) -> None:
+        self._core.set_timeline(timeline)
+
+    def set_approach_warnings(self, seconds_before: Iterable[float]) -> None:
+        self._core.set_approach_warnings(seconds_before)
+
+    def current_segment(self) -> int:
+        return self._core.current_segment()
+
+    def next_deadline(self, elapsed: float) -> float:
+        return self._core.next_deadline(elapsed)
+
+    # --- Steuerung ---
     def set_total_seconds(self, total_s: float) -> None:
-        self._total_s = max(0.0, float(total_s))
-        self._emit()
+        self._core.set_total_seconds(total_s)
 
     def reset(self) -> None:
-        self.pause()
-        self._elapsed_before = 0.0
-        self._emit()
+        self._core.reset()
+        self.wasReset.emit()
 
     def start(self) -> None:
-        if self._running:
-            return
-        self._running = True
-        self._t0 = time.monotonic()
-        self._timer.start()
-        self._emit()
+        self._core.start()
 
     def pause(self) -> None:
-        if not self._running:
-            return
-        self._elapsed_before = self.elapsed_seconds()
-        self._running = False
-        self._timer.stop()
-        self._emit()
+        self._core.pause()
 
     def toggle(self) -> None:
-        if self._running:
-            self.pause()
-        else:
-            self.start()
+        self._core.toggle()
 
     def elapsed_seconds(self) -> float:
-        if not self._running:
-            return float(self._elapsed_before)
-        return float(self._elapsed_before + (time.monotonic() - self._t0))
+        return self._core.elapsed_seconds()
 
     def seek(self, seconds: float) -> None:
         """Sets the elapsed time to a specific value."""
-        was_running = self._running
-        if was_running:
-            self.pause()
-        self._elapsed_before = clamp(seconds, 0.0, self._total_s)
-        if was_running:
-            self.start()
-        else:
-            self._emit()
+        self._core.seek(seconds)
 
-    def _on_timeout(self) -> None:
-        if self._total_s > 0 and self.elapsed_seconds() >= self._total_s:
-            # clamp, stop, emit finished
-            self._elapsed_before = self._total_s
-            self._running = False
-            self._timer.stop()
-            self._emit()
-            self.finished.emit()
-            return
-        self._emit()
+    def _on_segment_event(self, event: SegmentEvent) -> None:
+        if event.kind == SEGMENT_ENTERED:
+            self.segmentEntered.emit(event.index)
+        elif event.kind == SEGMENT_LEFT:
+            self.segmentLeft.emit(event.index)
+        elif event.kind == SEGMENT_APPROACHING:
+            self.approachingBoundary.emit(event.index, event.seconds_left)
 
-    def _emit(self) -> None:
-        self.tick.emit(TimerState(self._running, self.elapsed_seconds(), self._total_s))
+    def _schedule(self, delay_s: Optional[float]) -> None:
+        if delay_s is None:
+            self._timer.stop()
+        else:
+            self._timer.start(int(math.ceil(delay_s * 1000.0)))
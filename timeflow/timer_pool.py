@@ -0,0 +1,56 @@
+from __future__ import annotations
+import math
+from typing import Hashable, Optional
+from PySide6.QtCore import QObject, Signal
+
+from .clock import VirtualClock, get_clock
+from .timeline import SegmentTimeline
+from .timer_core import Clock, TimerCore, TimerPoolCore
+from .virtual_timer import VirtualTimer
+
+
+class TimerPool(QObject):
+    """
+    Qt-Adapter um TimerPoolCore: beliebig viele Timer, ein einziger (Virtual)Timer.
+
+    Pro Wakeup wird ein Batch mit allen geänderten Zuständen gesendet, statt
+    dass jeder Timer im 100-ms-Raster eigene Signale auslöst.
+    """
+    ticks = Signal(object)      # emits {timer_id: TimerState}
+    finished = Signal(object)   # emits [timer_id, ...]
+
+    def __init__(self, adaptive: bool = True, clock: Optional[Clock] = None) -> None:
+        super().__init__()
+        if clock is None:
+            clock = get_clock()
+        # Eigene VirtualClock -> Timer folgt ihr; sonst der anwendungsweiten Uhr
+        self._timer = VirtualTimer(self, clock if isinstance(clock, VirtualClock) else None)
+        self._timer.setSingleShot(True)
+
+        self._core = TimerPoolCore(clock, adaptive)
+        self._core.add_batch_listener(self.ticks.emit)
+        self._core.add_finished_listener(self.finished.emit)
+        self._timer.timeout.connect(self._core.process)
+        self._core.set_scheduler(self._schedule)
+
+    def core(self) -> TimerPoolCore:
+        return self._core
+
+    def add_timer(self, timer_id: Optional[Hashable] = None,
+                  timeline: Optional[SegmentTimeline] = None) -> Hashable:
+        return self._core.add_timer(timer_id, timeline)
+
+    def remove_timer(self, timer_id: Hashable) -> None:
+        self._core.remove_timer(timer_id)
+
+    def timer(self, timer_id: Hashable) -> TimerCore:
+        return self._core.timer(timer_id)
+
+    def __len__(self) -> int:
+        return len(self._core)
+
+    def _schedule(self, delay_s: Optional[float]) -> None:
+        if delay_s is None:
+            self._timer.stop()
+        else:
+            self._timer.start(int(math.ceil(delay_s * 1000.0)))
@@ -0,0 +1,112 @@
+from __future__ import annotations
+import math
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Optional, Set
+
+from .i18n import Strings
+from .timeline import SegmentTimeline
+from .utils import format_mmss
+
+# Ohne bekannte Widgetgröße wird der Fortschritt in so viele Schritte gerastert
+_DEFAULT_PROGRESS_STEPS = 1000
+
+
+@dataclass(frozen=True)
+class TimerFrame:
+    """Alles, was die Timer-Ansicht in einem Frame sichtbar anzeigt."""
+    time_text: str
+    caption: str
+    current_text: str
+    next_text: str
+    progress_step: int
+    progress_steps: int
+    selected_row: int
+
+    @property
+    def progress(self) -> float:
+        return self.progress_step / self.progress_steps if self.progress_steps > 0 else 0.0
+
+
+FRAME_FIELDS = tuple(f.name for f in fields(TimerFrame))
+
+
+class TimerViewModel:
+    """
+    Berechnet den sichtbaren Zustand pro Tick und vergleicht ihn mit dem
+    letzten Frame. Nur geänderte Felder müssen an die Widgets gehen; jedes
+    Feld zählt seine Änderungen mit (`change_count`). Bewusst ohne Qt.
+    """
+
+    def __init__(self) -> None:
+        self._last: Optional[TimerFrame] = None
+        self._progress_steps = 0
+        self._counts: Dict[str, int] = dict.fromkeys(FRAME_FIELDS, 0)
+        # Felder, die beim nächsten update() als geändert gelten (nicht angewendet)
+        self._stale: Set[str] = set()
+
+    def set_progress_steps(self, steps: int) -> None:
+        self._progress_steps = max(0, int(steps))
+
+    def build(
+        self,
+        elapsed_s: float,
+        total_s: float,
+        mode: str,
+        strings: Strings,
+        timeline: SegmentTimeline,
+        segment_name: Callable[[int], str],
+    ) -> TimerFrame:
+        total = max(0.0, total_s)
+        elapsed = max(0.0, elapsed_s)
+        if total > 0: elapsed = min(elapsed, total)
+
+        steps = self._progress_steps or _DEFAULT_PROGRESS_STEPS
+        # floor wie TimerCore.next_deadline: Schritt k beginnt genau bei k/steps
+        step = math.floor(elapsed / total * steps) if total > 0 else 0
+
+        countdown = mode == "countdown"
+        text_time = format_mmss(total - elapsed if countdown else elapsed)
+        text_caption = strings.time_remaining if countdown else strings.time_elapsed
+
+        idx = timeline.index_at(elapsed)
+        text_current = ""
+        text_next = ""
+        if idx >= 0:
+            text_current = f"{strings.current_segment} {segment_name(idx)}"
+            if idx + 1 < len(timeline):
+                text_next = f"{strings.next_segment} {segment_name(idx + 1)}"
+
+        return TimerFrame(text_time, text_caption, text_current, text_next, step, steps, idx)
+
+    def update(self, frame: TimerFrame) -> List[str]:
+        """Übernimmt `frame` und liefert die Namen der geänderten Felder."""
+        last = self._last
+        if last is None:
+            changed = list(FRAME_FIELDS)
+        else:
+            stale = self._stale
+            changed = [name for name in FRAME_FIELDS
+                       if name in stale or getattr(frame, name) != getattr(last, name)]
+        self._stale = set()
+        for name in changed:
+            self._counts[name] += 1
+        self._last = frame
+        return changed
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Erzwingt beim nächsten `update()` einen vollständigen Frame bzw. nur
+        das Feld `name` (z. B. wenn die Ansicht es nicht übernehmen konnte).
+        """
+        if name is None:
+            self._last = None
+        elif name not in self._counts:
+            raise ValueError(f"Unbekanntes Feld: {name!r}")
+        else:
+            self._stale.add(name)
+
+    def last_frame(self) -> Optional[TimerFrame]:
+        return self._last
+
+    def change_count(self, name: str) -> int:
+        return self._counts[name]
@@ -245,13 +245,19 @@ class TimerView(Card):
         self.body_layout().addLayout(self.ctrl_row)
         self.body_layout().addStretch(1)
 
-    def update_display(self, text_time: str, text_caption: str, text_current: str, text_next: str):
+    # Je ein Setter pro Feld: MainWindow gibt nur geänderte Felder weiter
+    def set_time_text(self, text_time: str):
         self.time_label.setText(text_time)
+
+    def set_caption(self, text_caption: str):
         self.time_caption.setText(text_caption)
+
+    def set_current_segment(self, text_current: str):
         self.current_segment_label.setText(text_current)
+
+    def set_next_segment(self, text_next: str):
         self.next_segment_label.setText(text_next)
-        
-        # Sicherstellen, dass die Sichtbarkeit korrekt gesetzt ist
+        # Ohne nächstes Segment keine leere Zeile
         self.next_segment_label.setVisible(bool(text_next))
 
     def set_tiny_mode(self, tiny: bool, lang_code: str):
@@ -0,0 +1,98 @@
+from __future__ import annotations
+import math
+from typing import Optional
+from PySide6.QtCore import QObject, QTimer, Signal, Qt
+
+from .clock import VirtualClock, get_clock
+
+
+class VirtualTimer(QObject):
+    """
+    QTimer-Ersatz, der der anwendungsweiten VirtualClock folgt.
+
+    Intervalle sind virtuelle Millisekunden: real/scaled laufen über einen
+    präzisen QTimer (Intervall durch die Rate geteilt), im step-Modus wird
+    der Timeout bei der Uhr eingeplant und beim `advance()` ausgelöst.
+    """
+    timeout = Signal()
+
+    def __init__(self, parent: Optional[QObject] = None, clock: Optional[VirtualClock] = None) -> None:
+        super().__init__(parent)
+        self._clock = clock
+        self._single_shot = False
+        self._interval_ms = 0
+        self._call = None
+
+        self._qtimer = QTimer(self)
+        self._qtimer.setTimerType(Qt.PreciseTimer)
+        self._qtimer.timeout.connect(self.timeout.emit)
+
+    def clock(self) -> VirtualClock:
+        return self._clock if self._clock is not None else get_clock()
+
+    def setSingleShot(self, single_shot: bool) -> None:
+        self._single_shot = bool(single_shot)
+
+    def isSingleShot(self) -> bool:
+        return self._single_shot
+
+    def setInterval(self, msec: int) -> None:
+        self._interval_ms = max(0, int(msec))
+
+    def interval(self) -> int:
+        return self._interval_ms
+
+    def isActive(self) -> bool:
+        return self._qtimer.isActive() or self._call is not None
+
+    def start(self, msec: Optional[int] = None) -> None:
+        if msec is not None:
+            self.setInterval(msec)
+        self.stop()
+        clock = self.clock()
+        if clock.is_stepped():
+            self._schedule_step(clock)
+            return
+        real_ms = math.ceil(clock.to_real_seconds(self._interval_ms / 1000.0) * 1000.0)
+        self._qtimer.setSingleShot(self._single_shot)
+        self._qtimer.start(int(real_ms))
+
+    def stop(self) -> None:
+        self._qtimer.stop()
+        if self._call is not None:
+            self._call.cancel()
+            self._call = None
+
+    def _schedule_step(self, clock: VirtualClock) -> None:
+        interval = self._interval_ms
+        if not self._single_shot:
+            # Wiederholung mit 0 ms würde advance() nie verlassen
+            interval = max(1, interval)
+        self._call = clock.call_later(interval / 1000.0, self._on_step_due)
+
+    def _on_step_due(self) -> None:
+        self._call = None
+        if not self._single_shot:
+            self._schedule_step(self.clock())
+        self.timeout.emit()
+
+
+class ClockStepper(QObject):
+    """Schiebt eine step-Uhr in jeder Event-Loop-Runde um `auto_step` weiter."""
+
+    def __init__(self, clock: VirtualClock, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._clock = clock
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._step)
+
+    def start(self) -> None:
+        if self._clock.is_stepped() and self._clock.auto_step > 0:
+            self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def _step(self) -> None:
+        self._clock.advance(self._clock.auto_step)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+import array
+import math
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # ohne NumPy läuft der (langsame) Referenzfilter
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Pole der analogen A-Bewertung (IEC 61672) in Hz
+A_WEIGHTING_POLES_HZ = (20.598997, 107.65265, 737.86223, 12194.217)
+
+# Ohne Vorverzerrung staucht die bilineare Transformation die Kurve zur
+# Nyquist-Frequenz hin: bei 8 kHz liegt 3 kHz schon 1.4 dB zu tief. Ab 16 kHz
+# bleibt der Fehler bis 4 kHz unter 0.5 dB, darunter wird nicht bewertet.
+MIN_SAMPLE_RATE = 16000
+
+# Unterste Grenze für dB-Werte (Stille)
+DB_FLOOR = -120.0
+
+Biquad = Tuple[float, float, float, float, float]   # b0, b1, b2, a1, a2 (a0 = 1)
+
+
+def dbfs(rms: float) -> float:
+    """RMS relativ zur Vollaussteuerung -> dBFS (nach unten bei DB_FLOOR begrenzt)."""
+    if rms <= 0.0:
+        return DB_FLOOR
+    return max(DB_FLOOR, 20.0 * math.log10(rms))
+
+
+def _biquad_response(sos: Sequence[Biquad], freq: float, sample_rate: float) -> float:
+    w = 2.0 * math.pi * freq / sample_rate
+    z1 = complex(math.cos(w), -math.sin(w))
+    z2 = z1 * z1
+    h = 1.0 + 0j
+    for b0, b1, b2, a1, a2 in sos:
+        h *= (b0 + b1 * z1 + b2 * z2) / (1.0 + a1 * z1 + a2 * z2)
+    return abs(h)
+
+
+def a_weighting_sos(sample_rate: float) -> List[Biquad]:
+    """
+    Digitale A-Bewertung als drei Biquads (bilineare Transformation der
+    analogen Pole/Nullstellen), normiert auf 0 dB bei 1 kHz.
+    """
+    if sample_rate < MIN_SAMPLE_RATE:
+        raise ValueError(f"A-Bewertung braucht mindestens {MIN_SAMPLE_RATE} Hz")
+    fs2 = 2.0 * sample_rate
+    f1, f2, f3, f4 = A_WEIGHTING_POLES_HZ
+
+    def pole(f: float) -> float:
+        p = -2.0 * math.pi * f
+        return (fs2 + p) / (fs2 - p)
+
+    def section(z1: float, z2: float, p1: float, p2: float) -> Biquad:
+        return (1.0, -(z1 + z2), z1 * z2, -(p1 + p2), p1 * p2)
+
+    # 4 Nullstellen bei s = 0 -> z = 1; die zwei überzähligen Pole bekommen Nullstellen bei z = -1
+    sos = [
+        section(1.0, 1.0, pole(f1), pole(f1)),
+        section(1.0, 1.0, pole(f2), pole(f3)),
+        section(-1.0, -1.0, pole(f4), pole(f4)),
+    ]
+    gain = 1.0 / _biquad_response(sos, 1000.0, sample_rate)
+    b0, b1, b2, a1, a2 = sos[0]
+    sos[0] = (b0 * gain, b1 * gain, b2 * gain, a1, a2)
+    return sos
+
+
+def lfilter_sos_reference(sos: Sequence[Biquad], x: Sequence[float], state: List[List[float]]) -> List[float]:
+    """Biquad-Kaskade Sample für Sample (Transposed Direct Form II). Fallback und Referenz."""
+    y = list(x)
+    for (b0, b1, b2, a1, a2), s in zip(sos, state):
+        s1, s2 = s
+        for i, u in enumerate(y):
+            out = b0 * u + s1
+            s1 = b1 * u - a1 * out + s2
+            s2 = b2 * u - a2 * out
+            y[i] = out
+        s[0], s[1] = s1, s2
+    return y
+
+
+class BiquadCascade:
+    """
+    Biquad-Kaskade mit Zustand über Puffergrenzen, blockweise vektorisiert.
+
+    Die Kaskade wird als ein Zustandsraummodell (2 Zustände je Biquad)
+    geschrieben. Für Blöcke der Länge `block` ist die Antwort
+    y = T·u + O·x0 und der neue Zustand x = A^L·x0 + R·u; T, O, R und A^L
+    werden einmal vorberechnet. Alle Blöcke eines Puffers laufen so als
+    wenige Matrixprodukte, in Python bleibt nur die Zustandsfortschreibung
+    von Block zu Block (6 Werte). Mehrere verschachtelte Kanäle haben je
+    einen eigenen Zustand.
+    """
+
+    def __init__(self, sos: Sequence[Biquad], channels: int = 1, block: int = 256,
+                 use_numpy: bool = HAS_NUMPY) -> None:
+        self.sos = [tuple(float(c) for c in s) for s in sos]
+        self.channels = max(1, int(channels))
+        self.block = max(1, int(block))
+        self._use_numpy = use_numpy and np is not None
+        if self._use_numpy:
+            self._build_matrices()
+        self.reset()
+
+    def reset(self) -> None:
+        if self._use_numpy:
+            self._states = [np.zeros(self._order) for _ in range(self.channels)]
+        else:
+            self._states = [[[0.0, 0.0] for _ in self.sos] for _ in range(self.channels)]
+
+    def _build_matrices(self) -> None:
+        # Kaskade -> (A, B, C, D), Abschnitte in Transposed Direct Form II
+        A = np.zeros((0, 0)); B = np.zeros(0); C = np.zeros(0); D = 1.0
+        for b0, b1, b2, a1, a2 in self.sos:
+            a = np.array([[-a1, 1.0], [-a2, 0.0]])
+            b = np.array([b1 - a1 * b0, b2 - a2 * b0])
+            c = np.array([1.0, 0.0])
+            n = A.shape[0]
+            A_new = np.zeros((n + 2, n + 2))
+            A_new[:n, :n] = A
+            A_new[n:, :n] = np.outer(b, C)
+            A_new[n:, n:] = a
+            A, B = A_new, np.concatenate([B, b * D])
+            C, D = np.concatenate([b0 * C, c]), b0 * D
+        self._order = A.shape[0]
+
+        L = self.block
+        powers = [np.eye(self._order)]
+        for _ in range(L):
+            powers.append(A @ powers[-1])
+        self._A_pow = powers                                          # A^0 .. A^L
+        self._O = np.array([C @ powers[k] for k in range(L)])         # (L, S)
+        h = np.empty(L)
+        h[0] = D
+        for k in range(1, L):
+            h[k] = C @ powers[k - 1] @ B
+        idx = np.arange(L)
+        lag = idx[:, None] - idx[None, :]
+        self._T = np.where(lag >= 0, h[np.clip(lag, 0, L - 1)], 0.0)  # (L, L), untere Dreiecksmatrix
+        self._R = np.array([powers[L - 1 - k] @ B for k in range(L)]).T  # (S, L)
+
+    def process(self, x, out, first_channel: int = 0) -> None:
+        """
+        Filtert die verschachtelten Samples `x` nach `out` (gleiche Länge;
+        ohne NumPy ein array("d")). `first_channel` ist der Kanal des ersten
+        Samples (Puffer dürfen mitten im Frame beginnen).
+        """
+        ch = self.channels
+        for c in range(ch):
+            start = (c - first_channel) % ch
+            if self._use_numpy:
+                u = np.ascontiguousarray(x[start::ch], dtype=np.float64)
+                if len(u):
+                    out[start::ch] = self._filter(u, c)
+            else:
+                u = list(x[start::ch])
+                if u:
+                    out[start::ch] = array.array("d", lfilter_sos_reference(self.sos, u, self._states[c]))
+
+    def _filter(self, u, channel: int):
+        L = self.block
+        n = len(u)
+        nb, r = divmod(n, L)
+        x = self._states[channel]
+        y = np.empty(n)
+        if nb:
+            U = u[: nb * L].reshape(nb, L)
+            Y = U @ self._T.T                      # Nullzustandsantwort aller Blöcke
+            Z = U @ self._R.T                      # Eingangsanteil am Endzustand je Block
+            X = np.empty((nb, self._order))
+            A_L = self._A_pow[L]
+            for k in range(nb):
+                X[k] = x
+                x = A_L @ x + Z[k]
+            Y += X @ self._O.T                     # Anfangszustände
+            y[: nb * L] = Y.ravel()
+        if r:
+            ur = u[nb * L:]
+            y[nb * L:] = self._T[:r, :r] @ ur + self._O[:r] @ x
+            x = self._A_pow[r] @ x + self._R[:, L - r:] @ ur
+        self._states[channel] = x
+        return y